@@ -50,6 +50,13 @@ app.use(
   }),
 );
 
+// Builder message batches are larger than the default 100kb limit; parsed here
+// first, the general parser below skips them. Both inflate gzip request bodies.
+app.use(
+  "/api/builder/record-builder-messages",
+  express.json({ limit: process.env.MESSAGE_BATCH_BODY_LIMIT || "10mb", inflate: true }),
+);
+
 // Add body-parser middleware
 app.use(express.json());
 
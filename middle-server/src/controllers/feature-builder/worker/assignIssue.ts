@@ -44,9 +44,11 @@ export const assignIssueLogic = async () => {
   }
 
   // Find all issues in initialized status, sorted by creation date
+  // Issues the planner is still writing todos for are not assignable yet
   const issues = await IssueModel.find({
     status: IssueStatus.INITIALIZED,
     bountyType: SwarmBountyType.BUILD_FEATURE,
+    planningComplete: { $ne: false },
   }).sort({ createdAt: 1 });
 
   if (!issues || issues.length === 0) {
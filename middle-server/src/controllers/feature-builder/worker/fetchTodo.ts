@@ -8,6 +8,7 @@ import { IssueModel, IssueStatus } from "../../../models/Issue";
 import { verifySignature } from "../../../utils/sign";
 import { SystemPromptModel } from "../../../models/SystemPrompt";
 import { updateSwarmBountyStatus } from "../../../services/swarmBounty/updateStatus";
+import { renderPhasesData } from "../../../utils/promptTemplates";
 
 // Get PR URLs for dependencies
 async function getDependencies(dependencyUuids: string[]): Promise<string[]> {
@@ -420,9 +421,23 @@ export const fetchTodoLogic = async (
       };
     }
 
+    let phasesData;
+    try {
+      phasesData = await renderPhasesData(updatedTodo.phasesData);
+    } catch (error) {
+      console.error("Error rendering todo phasesData:", error);
+      return {
+        statuscode: 500,
+        data: {
+          success: false,
+          message: "Failed to render todo phases",
+        },
+      };
+    }
+
     const data = {
       _id: updatedTodo._id,
-      phasesData: updatedTodo.phasesData,
+      phasesData,
       todo_uuid: updatedTodo.uuid,
       issue_uuid: updatedTodo.issueUuid,
       acceptance_criteria: updatedTodo.acceptanceCriteria,
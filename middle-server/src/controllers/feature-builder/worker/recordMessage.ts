@@ -50,3 +50,50 @@ export const recordBuilderMessage = async (req: Request, res: Response): Promise
     });
   }
 };
+
+// Batched version of recordBuilderMessage used by the agents' message shippers;
+// the body arrives gzip-compressed and is inflated by the JSON parser (see app.ts)
+export const recordBuilderMessages = async (req: Request, res: Response): Promise<void> => {
+  try {
+    const { messages } = req.body as { messages?: RecordMessageRequest[] };
+
+    if (!Array.isArray(messages) || messages.length === 0) {
+      res.status(400).json({
+        success: false,
+        message: "messages must be a non-empty array",
+      });
+      return;
+    }
+
+    const documents = messages
+      .filter((message) => message && message.bounty_id)
+      .map(({ bounty_id, content, tool, githubUsername, uuid, taskType, taskStage, prUrl, todoUUID }) => ({
+        bounty_id,
+        content,
+        tools: tool || [],
+        githubUsername,
+        uuid,
+        taskType,
+        taskStage,
+        prUrl,
+        todoUUID,
+      }));
+
+    // Unordered: one invalid message does not stop the rest of the batch
+    const recorded = documents.length ? await BuilderConversationModel.insertMany(documents, { ordered: false }) : [];
+
+    res.status(200).json({
+      success: true,
+      data: {
+        recorded: recorded.length,
+        rejected: messages.length - recorded.length,
+      },
+    });
+  } catch (error) {
+    console.error("Error recording builder messages:", error);
+    res.status(500).json({
+      success: false,
+      message: error instanceof Error ? error.message : "Unknown error",
+    });
+  }
+};
@@ -277,7 +277,7 @@ async function updateTestEnvironmentStatus(round: number): Promise<void> {
   console.log(`[TEST MODE] Updated ${inReviewTodos.length} todos from IN_REVIEW to APPROVED for round ${round}`);
 
   // 2. Find all IN_PROGRESS issues (these are issues that have been audited by the leader)
-  const inProgressIssues = await IssueModel.find({ status: IssueStatus.IN_PROGRESS });
+  const inProgressIssues = await IssueModel.find({ status: IssueStatus.IN_PROGRESS, planningComplete: { $ne: false } });
 
   console.log(`[TEST MODE] Found ${inProgressIssues.length} issues in IN_PROGRESS status`);
 
@@ -516,8 +516,8 @@ export const triggerFetchAuditResultLogic = async (positiveKeys: string[], negat
     await todo.save();
   }
 
-  // Check all in progress issues
-  const issues = await IssueModel.find({ status: IssueStatus.IN_PROGRESS });
+  // Check all in progress issues whose todos have all been planned
+  const issues = await IssueModel.find({ status: IssueStatus.IN_PROGRESS, planningComplete: { $ne: false } });
   console.log(`Found ${issues.length} issues related to updated todos`);
 
   for (const issue of issues) {
@@ -8,6 +8,7 @@ import { BugFinderModel, BugFinderStatus } from "../../../models/BugFinder";
 import { SpecModel, SpecStatus } from "../../../models/Spec";
 import { IssueModel, IssueStatus } from "../../../models/Issue";
 import { Todo, TodoModel, TodoStatus } from "../../../models/Todo";
+import { renderPhasesData } from "../../../utils/promptTemplates";
 
 interface ResponseInfo {
   success: boolean;
@@ -285,13 +286,17 @@ export const getTodoInfo = async (issueUuid: string): Promise<TodoInfo[]> => {
       todos.map(async (todo) => {
         console.log(todo);
         console.log("Todo phasesData:", JSON.stringify(todo.phasesData, null, 2));
+        const phasesData = await renderPhasesData(todo.phasesData).catch((error) => {
+          console.log("error rendering phasesData", error);
+          return [];
+        });
         const { githubUsername, prUrl } = await getLastAvailableAssigneeInfo(todo.assignees || []);
         return {
           uuid: todo.uuid || "",
-          title: todo.title || todo?.phasesData?.[0]?.prompt.slice(0, 5) || "",
-          description: todo.description || todo?.phasesData?.[0]?.prompt || "",
+          title: todo.title || phasesData[0]?.prompt.slice(0, 5) || "",
+          description: todo.description || phasesData[0]?.prompt || "",
           acceptanceCriteria: todo.acceptanceCriteria || [],
-          phasesData: todo.phasesData || [],
+          phasesData,
           taskName: todo.repoName + " - " + "Todo",
           swarmType: SwarmBountyType.BUILD_FEATURE,
           nodes: todo.assignees?.length || 0,
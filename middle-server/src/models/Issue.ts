@@ -94,6 +94,9 @@ class Issue {
 
   @prop({ required: false })
   public predecessorUuid?: string; // UUID of the immediately previous issue in the chain
+
+  @prop({ required: false })
+  public planningComplete?: boolean; // false while the planner is still writing this issue's todos
 }
 
 const IssueModel = getModelForClass(Issue);
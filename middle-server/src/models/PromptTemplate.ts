@@ -0,0 +1,37 @@
+import { prop, getModelForClass, modelOptions } from "@typegoose/typegoose";
+import { builder247DB } from "../services/database/database";
+
+// Written by the planner (planner-agent src/utils/prompt_templates.py); read-only here
+class TemplatePhase {
+  @prop({ required: true })
+  public name!: string;
+
+  @prop({ required: true })
+  public prompt!: string;
+
+  @prop({ required: true, type: () => [String] })
+  public tools!: string[];
+}
+
+@modelOptions({
+  schemaOptions: {
+    collection: "prompttemplates",
+  },
+  existingConnection: builder247DB,
+})
+class PromptTemplate {
+  @prop({ required: true })
+  public templateId!: string;
+
+  @prop({ required: true })
+  public version!: string;
+
+  @prop({ required: true, type: () => [TemplatePhase] })
+  public phases!: TemplatePhase[];
+
+  @prop({ required: false })
+  public createdAt?: Date;
+}
+
+const PromptTemplateModel = getModelForClass(PromptTemplate);
+export { PromptTemplate, PromptTemplateModel };
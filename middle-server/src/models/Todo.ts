@@ -1,6 +1,8 @@
 import { prop, getModelForClass, modelOptions, Severity } from "@typegoose/typegoose";
 import { builder247DB } from "../services/database/database";
 import { SwarmBountyType } from "../config/constant";
+import type { PhasesTemplateRef } from "../utils/promptTemplates";
+import mongoose from "mongoose";
 
 export enum DocumentationStatus {
   INITIALIZED = "initialized",
@@ -101,8 +103,10 @@ class Todo {
   @prop({ required: false })
   public assignees?: AssignedInfo[];
 
-  @prop({ required: true, type: () => [PhaseData] })
-  public phasesData?: PhaseData[];
+  // Rendered phases, or a prompttemplates reference the planner stores instead
+  // (see utils/promptTemplates.ts); read it through renderPhasesData
+  @prop({ required: true, type: mongoose.Schema.Types.Mixed })
+  public phasesData?: PhaseData[] | PhasesTemplateRef;
 
   @prop({
     type: String,
@@ -14,7 +14,7 @@ import { checkIssue } from "../controllers/feature-builder/worker/checkIssue";
 import { getSourceRepo } from "../controllers/feature-builder/worker/getSourceRepo";
 import { addErrorLogToDB, addLogToDB } from "../controllers/feature-builder/worker/addLog";
 import { recordPlannerMessage } from "../controllers/feature-builder/planner/recordMessage";
-import { recordBuilderMessage } from "../controllers/feature-builder/worker/recordMessage";
+import { recordBuilderMessage, recordBuilderMessages } from "../controllers/feature-builder/worker/recordMessage";
 /******** Planner ***********/
 import { fetchRequest as fetchPlannerRequest } from "../controllers/feature-builder/planner/fetchRequest";
 import { addRequest as addPlannerRequest } from "../controllers/feature-builder/planner/addRequest";
@@ -48,6 +48,7 @@ router.post("/builder/record-error-log", addErrorLogToDB as RequestHandler);
 router.get("/builder/get-source-repo/:nodeType/:uuid", getSourceRepo as RequestHandler);
 router.post("/builder/record-message", recordPlannerMessage as RequestHandler);
 router.post("/builder/record-builder-message", recordBuilderMessage as RequestHandler);
+router.post("/builder/record-builder-messages", recordBuilderMessages as RequestHandler);
 
 /********** Planner ***********/
 router.post("/planner/fetch-planner-todo", fetchPlannerRequest as RequestHandler);
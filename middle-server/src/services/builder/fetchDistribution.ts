@@ -196,8 +196,8 @@ export const updateSubtaskStatus = async (positiveKeys: string[], negativeKeys:
     await todo.save();
   }
 
-  // Check all in progress issues
-  const issues = await IssueModel.find({ status: IssueStatus.IN_PROGRESS });
+  // Check all in progress issues whose todos have all been planned
+  const issues = await IssueModel.find({ status: IssueStatus.IN_PROGRESS, planningComplete: { $ne: false } });
   console.log(`Found ${issues.length} issues related to updated todos`);
 
   for (const issue of issues) {
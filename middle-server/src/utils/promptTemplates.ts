@@ -0,0 +1,61 @@
+import { PromptTemplateModel } from "../models/PromptTemplate";
+
+export interface RenderedPhase {
+  prompt: string;
+  tools: string[];
+}
+
+export interface PhasesTemplateRef {
+  templateId: string;
+  version: string;
+  params: Record<string, string>;
+}
+
+// A template version never changes, so a loaded one is kept for the life of the process
+const templateCache = new Map<string, { prompt: string; tools: string[] }[]>();
+
+export function isTemplateRef(phasesData: unknown): phasesData is PhasesTemplateRef {
+  return typeof phasesData === "object" && phasesData !== null && !Array.isArray(phasesData) && "templateId" in phasesData;
+}
+
+// Same result as Python's prompt.format(**params) for the plain {name} fields templates use
+export function renderPrompt(prompt: string, params: Record<string, string>): string {
+  return prompt.replace(/\{\{|\}\}|\{([^{}]*)\}|[{}]/g, (match, field: string | undefined) => {
+    if (match === "{{") return "{";
+    if (match === "}}") return "}";
+    if (field === undefined) {
+      throw new Error(`Unmatched "${match}" in prompt template`);
+    }
+    const value = params[field];
+    if (typeof value !== "string") {
+      throw new Error(`Prompt template parameter "${field}" is missing`);
+    }
+    return value;
+  });
+}
+
+async function loadTemplate(templateId: string, version: string) {
+  const key = `${templateId}:${version}`;
+  let phases = templateCache.get(key);
+  if (!phases) {
+    const template = await PromptTemplateModel.findOne({ templateId, version }).lean();
+    if (!template) {
+      throw new Error(`Unknown prompt template ${templateId} version ${version}`);
+    }
+    phases = template.phases.map((phase) => ({ prompt: phase.prompt, tools: phase.tools }));
+    templateCache.set(key, phases);
+  }
+  return phases;
+}
+
+// Rendered phases for a todo's phasesData; inline phase lists are returned as they are
+export async function renderPhasesData(phasesData: unknown): Promise<RenderedPhase[]> {
+  if (!isTemplateRef(phasesData)) {
+    return (phasesData as RenderedPhase[] | undefined) || [];
+  }
+  const phases = await loadTemplate(phasesData.templateId, phasesData.version);
+  return phases.map((phase) => ({
+    prompt: renderPrompt(phase.prompt, phasesData.params || {}),
+    tools: [...phase.tools],
+  }));
+}
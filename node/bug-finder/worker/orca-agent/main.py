@@ -2,7 +2,7 @@ from src.server import create_app
 import os
 
 from prometheus_swarm.utils.logging import set_error_post_hook, set_logs_post_hook
-import requests
+from src.utils.task_callbacks import callbacks
 
 
 def post_logs_to_server(
@@ -11,10 +11,11 @@ def post_logs_to_server(
     task_id: str = None,
     swarm_bounty_id: str = None,
     signature: str = None,
+    todo_uuid: str = None,
 ):
-    response = requests.post(
-        f"http://host.docker.internal:30017/task/{task_id}/send-logs",
-        json={
+    response = callbacks.post(
+        f"/task/{task_id}/send-logs",
+        {
             "signature": signature,
             "swarmBountyId": swarm_bounty_id,
             "logLevel": logLevel,
@@ -31,10 +32,11 @@ def post_error_logs_to_server(
     task_id: str = None,
     swarm_bounty_id: str = None,
     signature: str = None,
+    todo_uuid: str = None,
 ):
-    response = requests.post(
-        f"http://host.docker.internal:30017/task/{task_id}/send-error-logs",
-        json={
+    response = callbacks.post(
+        f"/task/{task_id}/send-error-logs",
+        {
             "signature": signature,
             "swarmBountyId": swarm_bounty_id,
             "error": context + str(error) + stack_trace,
@@ -1,5 +1,6 @@
 """Database models."""
 
+from datetime import datetime, timezone
 from typing import Optional
 from sqlmodel import SQLModel, Field
 from sqlalchemy import JSON
@@ -18,3 +19,36 @@ class Submission(SQLModel, table=True):
         default=None, sa_column=Column(JSON)
     )  # Store as JSON type
     repo_url: Optional[str] = None
+
+
+class Job(SQLModel, table=True):
+    """Queued or running /worker-task request (see src.server.services.job_queue)."""
+
+    swarmBountyId: str = Field(primary_key=True)
+    task_id: str
+    repo_url: str
+    podcall_signature: Optional[str] = None
+    request_id: Optional[str] = None  # /worker-task request that queued the job
+    status: str = Field(default="queued", index=True)  # queued/running/succeeded/failed
+    attempts: int = 0
+    worker_id: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class Callback(SQLModel, table=True):
+    """Undelivered PR update for the task server (see src.utils.task_callbacks)."""
+
+    swarmBountyId: str = Field(primary_key=True)
+    kind: str  # draft/final
+    path: str
+    payload: dict = Field(sa_column=Column(JSON))
+    version: int = 1
+    status: str = Field(default="pending", index=True)  # pending/failed
+    attempts: int = 0
+    next_attempt_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -1,46 +1,58 @@
 import os
-import requests
 from flask import Blueprint, jsonify, request
 from src.server.services import repo_bug_finder_service
-from concurrent.futures import ThreadPoolExecutor
 from prometheus_swarm.database import get_db
 from src.server.services.repo_bug_finder_service import logger
+from src.server.services.job_queue import JobQueue
+from src.utils.task_callbacks import callbacks
 from prometheus_swarm.utils.logging import task_id_var, swarm_bounty_id_var, signature_var
-import contextvars
 
 bp = Blueprint("task", __name__)
-executor = ThreadPoolExecutor(max_workers=2)
-
-# Track in-progress tasks
-in_progress_tasks = set()
 
 
 def post_pr_url(agent_result, task_id, signature, swarmBountyId):
-    try:
-        result = agent_result.result()  # Get the result from the future
-        logger.info(f"Result: {result}")
-        result_data = result.get("result", {})
-        logger.info(f"Result data: {result_data}")
-        # Make a POST request with the result
-        response = requests.post(
-            f"http://host.docker.internal:30017/task/{task_id}/add-todo-pr",
-            json={
-                "prUrl": result_data.get("data", {}).get("pr_url"),
-                "signature": signature,
-                "swarmBountyId": swarmBountyId,
-                "success": result.get("success", False),
-                "message": result_data.get("error", ""),
-            },
-        )
-        response.raise_for_status()  # Raise an error for bad responses
-    except Exception as e:
-        # Handle exceptions (e.g., log the error)
-        logger.error(f"Failed to send result: {e}")
-        logger.error(f"Exception type: {type(e)}")
-        if hasattr(e, "__traceback__"):
-            import traceback
-
-            logger.error(f"Traceback: {''.join(traceback.format_tb(e.__traceback__))}")
+    """Report a finished job to the task server through the callback outbox."""
+    if agent_result.exception() is not None:
+        result = {"success": False, "result": {"error": str(agent_result.exception())}}
+    else:
+        result = agent_result.result() or {}
+    logger.info(f"Result: {result}")
+    result_data = result.get("result") or {}
+    if not isinstance(result_data, dict):
+        # Failed tasks carry the error message itself
+        result_data = {"error": str(result_data)}
+    logger.info(f"Result data: {result_data}")
+    callbacks.submit_pr(
+        task_id,
+        swarmBountyId,
+        {
+            "prUrl": (result_data.get("data") or {}).get("pr_url"),
+            "signature": signature,
+            "swarmBountyId": swarmBountyId,
+            "success": result.get("success", False),
+            "message": result_data.get("error", ""),
+        },
+    )
+
+
+def run_job(job):
+    # Set context variables for this job's thread
+    task_id_var.set(job["task_id"])
+    swarm_bounty_id_var.set(job["swarmBountyId"])
+    signature_var.set(job["podcall_signature"])
+    return repo_bug_finder_service.handle_task_creation(
+        task_id=job["task_id"],
+        swarmBountyId=job["swarmBountyId"],
+        repo_url=job["repo_url"],
+        signature=job["podcall_signature"],
+    )
+
+
+def report_job(job, future):
+    post_pr_url(future, job["task_id"], job["podcall_signature"], job["swarmBountyId"])
+
+
+job_queue = JobQueue(run_job, on_done=report_job)
 
 
 @bp.post("/worker-task")
@@ -58,19 +70,14 @@ def start_task():
     if any(data.get(field) is None for field in required_fields):
         return jsonify({"error": "Missing data"}), 401
 
-    # Check if this swarm bounty is already being processed
-    if swarmBountyId in in_progress_tasks:
-        return jsonify({"status": "Task is already being processed"}), 200
-    
-    # Set context variables for this request/thread
-    task_id_var.set(task_id)
-    swarm_bounty_id_var.set(swarmBountyId)
-    signature_var.set(podcall_signature)
-
-    # Get db instance in the main thread where we have app context
-    db = get_db()
-
     if os.getenv("TEST_MODE") == "true":
+        # Set context variables for this request/thread
+        task_id_var.set(task_id)
+        swarm_bounty_id_var.set(swarmBountyId)
+        signature_var.set(podcall_signature)
+
+        # Get db instance in the main thread where we have app context
+        db = get_db()
         result = repo_bug_finder_service.handle_task_creation(
             task_id=task_id,
             swarmBountyId=swarmBountyId,
@@ -79,29 +86,13 @@ def start_task():
             db=db,  # Pass db instance
         )
         return jsonify(result)
-    else:
-        # Mark this swarm bounty as in progress
-        in_progress_tasks.add(swarmBountyId)
-        
-        def cleanup_callback(future):
-            # Remove from in-progress tasks when done
-            in_progress_tasks.discard(swarmBountyId)
-            # Call the original callback
-            post_pr_url(future, task_id, podcall_signature, swarmBountyId)
-
-        
-        ctx = contextvars.copy_context()
-        agent_result = executor.submit(
-            ctx.run,
-            repo_bug_finder_service.handle_task_creation,
-            task_id=task_id,
-            swarmBountyId=swarmBountyId,
-            repo_url=repo_url,
-            signature=podcall_signature,
-            db=db,  # Pass db instance
-        )
-        agent_result.add_done_callback(cleanup_callback)
-        return jsonify({"status": "Task is being processed"}), 200
+
+    # Jobs are persisted, so dedupe holds across restarts and processes
+    if not job_queue.enqueue(
+        swarmBountyId, task_id, repo_url, podcall_signature, request_id=request.id
+    ):
+        return jsonify({"status": "Task is already being processed"}), 200
+    return jsonify({"status": "Task is being processed"}), 200
 
 
 if __name__ == "__main__":
@@ -0,0 +1,365 @@
+"""Durable job queue for /worker-task requests.
+
+Jobs are rows of the ``Job`` table in the worker's database, so queued and
+running bounties survive a container restart and a bounty is never processed
+twice at the same time, even across processes sharing the database:
+
+- ``enqueue`` inserts a ``queued`` job, or re-queues a finished one. A bounty
+  that is already queued or running is rejected.
+- A dispatcher thread claims queued jobs with a conditional ``UPDATE`` and runs
+  them on a pool of ``JOB_POOL_SIZE`` threads. A claimed job is ``running``
+  under a lease of ``JOB_LEASE_SECONDS`` that a heartbeat keeps extending.
+- A job whose lease expired belongs to a process that died. It is re-queued,
+  or marked failed after ``JOB_MAX_ATTEMPTS`` attempts.
+- On SIGTERM the queue stops claiming jobs, waits up to ``JOB_DRAIN_TIMEOUT``
+  seconds for running ones, and hands any still running back to the queue for
+  the next start.
+"""
+
+import os
+import signal
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+from sqlalchemy import func, inspect, select, text, update
+from sqlalchemy.exc import IntegrityError
+from prometheus_swarm.database import get_session
+from prometheus_swarm.utils.logging import log_key_value, log_error
+from src.database.models import Job
+from src.utils import metrics
+from src.utils.tracing import set_trace_attributes
+
+POOL_SIZE = int(os.getenv("JOB_POOL_SIZE", "2"))
+LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "120"))
+MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+DRAIN_TIMEOUT = float(os.getenv("JOB_DRAIN_TIMEOUT", "25"))
+POLL_INTERVAL = 2.0
+
+ACTIVE_STATES = ("queued", "running")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _add_missing_columns() -> None:
+    """Add nullable ``Job`` columns newer than an existing table.
+
+    ``initialize_database`` only creates missing tables, so a database from
+    before a column was added would otherwise reject every insert.
+    """
+    with get_session() as session:
+        bind = session.get_bind()
+        existing = {column["name"] for column in inspect(bind).get_columns(Job.__tablename__)}
+        for column in Job.__table__.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=bind.dialect)
+            session.execute(
+                text(f'ALTER TABLE "{Job.__tablename__}" ADD COLUMN "{column.name}" {column_type}')
+            )
+            log_key_value("Added job column", column.name)
+
+
+class JobQueue:
+    """Runs ``handler(job)`` for every queued job on a fixed-size thread pool.
+
+    ``handler`` receives the job as a dict and returns the service result
+    (``{"success": ..., ...}``). ``on_done(job, future)`` is called with the
+    job and its finished future once the handler returns or raises.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[dict], dict],
+        on_done: Optional[Callable] = None,
+        pool_size: int = POOL_SIZE,
+        lease_seconds: int = LEASE_SECONDS,
+        max_attempts: int = MAX_ATTEMPTS,
+    ):
+        self.handler = handler
+        self.on_done = on_done
+        self.pool_size = pool_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="job"
+        )
+        self._running = {}  # swarmBountyId -> Future
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._draining = threading.Event()
+        self._dispatcher = None
+        self._last_heartbeat = datetime.min.replace(tzinfo=timezone.utc)
+
+    def start(self) -> None:
+        """Start the dispatcher thread; safe to call more than once."""
+        with self._lock:
+            if self._dispatcher and self._dispatcher.is_alive():
+                return
+            _add_missing_columns()
+            self._dispatcher = threading.Thread(
+                target=self._dispatch, name="job-dispatcher", daemon=True
+            )
+            self._dispatcher.start()
+        metrics.track_executor(
+            "worker-task", self.pool_size, depth=self.depth, busy=self._busy
+        )
+        log_key_value("Job pool size", self.pool_size)
+
+    def enqueue(
+        self,
+        swarmBountyId: str,
+        task_id: str,
+        repo_url: str,
+        podcall_signature: str = None,
+        request_id: str = None,
+    ) -> bool:
+        """Queue a job for a bounty.
+
+        ``request_id`` is the enqueuing request's id; the job's spans carry it.
+
+        Returns:
+            bool: False if the bounty is already queued or running
+        """
+        swarmBountyId = str(swarmBountyId)
+        try:
+            with get_session() as session:
+                job = session.get(Job, swarmBountyId)
+                if job and job.status in ACTIVE_STATES:
+                    return False
+                if job is None:
+                    job = Job(swarmBountyId=swarmBountyId)
+                    session.add(job)
+                job.task_id = task_id
+                job.repo_url = repo_url
+                job.podcall_signature = podcall_signature
+                job.request_id = request_id
+                job.status = "queued"
+                job.attempts = 0
+                job.worker_id = None
+                job.lease_expires_at = None
+                job.error = None
+                job.updated_at = _now()
+        except IntegrityError:
+            # Another request inserted the same bounty first
+            return False
+        self._wakeup.set()
+        return True
+
+    def depth(self) -> int:
+        """Number of jobs waiting to be claimed."""
+        with get_session() as session:
+            return session.execute(
+                select(func.count()).select_from(Job).where(Job.status == "queued")
+            ).scalar()
+
+    def _busy(self) -> int:
+        with self._lock:
+            return len(self._running)
+
+    def drain(self, timeout: float = DRAIN_TIMEOUT) -> None:
+        """Stop claiming jobs, wait for running ones, re-queue what is left."""
+        self._draining.set()
+        self._wakeup.set()
+        with self._lock:
+            futures = list(self._running.values())
+        log_key_value("Draining jobs", len(futures))
+        wait(futures, timeout=timeout)
+        with self._lock:
+            unfinished = list(self._running)
+        if unfinished:
+            self._release(unfinished)
+            log_key_value("Re-queued unfinished jobs", ", ".join(unfinished))
+
+    def install_signal_handlers(self) -> None:
+        """Drain the queue on SIGTERM before handing over to the previous handler."""
+        if threading.current_thread() is not threading.main_thread():
+            return
+        previous = signal.getsignal(signal.SIGTERM)
+
+        def handle_sigterm(signum, frame):
+            self.drain()
+            if callable(previous):
+                previous(signum, frame)
+            else:
+                signal.signal(signum, signal.SIG_DFL)
+                os.kill(os.getpid(), signum)
+
+        signal.signal(signal.SIGTERM, handle_sigterm)
+
+    def _dispatch(self) -> None:
+        while not self._draining.is_set():
+            try:
+                self._heartbeat()
+                self._requeue_expired()
+                while not self._draining.is_set():
+                    with self._lock:
+                        if len(self._running) >= self.pool_size:
+                            break
+                    job = self._claim()
+                    if job is None:
+                        break
+                    self._submit(job)
+            except Exception as e:
+                log_error(e, "Job dispatcher error")
+            self._wakeup.wait(POLL_INTERVAL)
+            self._wakeup.clear()
+
+    def _lease(self) -> datetime:
+        return _now() + timedelta(seconds=self.lease_seconds)
+
+    def _claim(self) -> Optional[dict]:
+        """Atomically move the oldest queued job to running under our lease."""
+        with get_session() as session:
+            while True:
+                swarm_bounty_id = session.execute(
+                    select(Job.swarmBountyId)
+                    .where(Job.status == "queued")
+                    .order_by(Job.created_at)
+                    .limit(1)
+                ).scalar()
+                if swarm_bounty_id is None:
+                    return None
+                claimed = session.execute(
+                    update(Job)
+                    .where(
+                        Job.swarmBountyId == swarm_bounty_id, Job.status == "queued"
+                    )
+                    .values(
+                        status="running",
+                        worker_id=self.worker_id,
+                        lease_expires_at=self._lease(),
+                        attempts=Job.attempts + 1,
+                        updated_at=_now(),
+                    )
+                )
+                session.commit()
+                if claimed.rowcount == 1:
+                    job = session.get(Job, swarm_bounty_id)
+                    session.refresh(job)
+                    return job.model_dump()
+                # Claimed by another process in the meantime; try the next one
+
+    def _submit(self, job: dict) -> None:
+        swarm_bounty_id = job["swarmBountyId"]
+        log_key_value("Starting job", f"{swarm_bounty_id} (attempt {job['attempts']})")
+        # Registered under the lock so a fast job cannot finish before it is tracked
+        with self._lock:
+            try:
+                future = self._executor.submit(self._run, job)
+            except RuntimeError:
+                # The pool is shutting down
+                self._release([swarm_bounty_id])
+                raise
+            self._running[swarm_bounty_id] = future
+        future.add_done_callback(lambda f: self._on_finished(job, f))
+
+    def _run(self, job: dict) -> dict:
+        # Pool threads do not inherit the request's context; restore its ids
+        set_trace_attributes(request_id=job.get("request_id"), task_id=job["task_id"])
+        try:
+            result = self.handler(job)
+        except Exception as e:
+            self._finish(job["swarmBountyId"], "failed", str(e))
+            raise
+        success = bool(result and result.get("success"))
+        error = None if success else str((result or {}).get("result", "No result"))
+        self._finish(job["swarmBountyId"], "succeeded" if success else "failed", error)
+        return result
+
+    def _release(self, swarm_bounty_ids: list[str]) -> None:
+        """Hand jobs we hold back to the queue."""
+        with get_session() as session:
+            session.execute(
+                update(Job)
+                .where(
+                    Job.swarmBountyId.in_(swarm_bounty_ids),
+                    Job.worker_id == self.worker_id,
+                )
+                .values(
+                    status="queued",
+                    worker_id=None,
+                    lease_expires_at=None,
+                    updated_at=_now(),
+                )
+            )
+
+    def _finish(self, swarm_bounty_id: str, status: str, error: str = None) -> None:
+        # Only the lease holder may finish a job; a re-queued job is left alone
+        with get_session() as session:
+            session.execute(
+                update(Job)
+                .where(
+                    Job.swarmBountyId == swarm_bounty_id,
+                    Job.worker_id == self.worker_id,
+                )
+                .values(
+                    status=status,
+                    worker_id=None,
+                    lease_expires_at=None,
+                    error=error,
+                    updated_at=_now(),
+                )
+            )
+
+    def _on_finished(self, job: dict, future) -> None:
+        with self._lock:
+            self._running.pop(job["swarmBountyId"], None)
+        self._wakeup.set()
+        if self.on_done:
+            try:
+                self.on_done(job, future)
+            except Exception as e:
+                log_error(e, "Job completion callback failed")
+
+    def _heartbeat(self) -> None:
+        """Extend the leases of our running jobs every third of a lease period."""
+        now = _now()
+        if now - self._last_heartbeat < timedelta(seconds=self.lease_seconds / 3):
+            return
+        with self._lock:
+            running = list(self._running)
+        if running:
+            with get_session() as session:
+                session.execute(
+                    update(Job)
+                    .where(
+                        Job.swarmBountyId.in_(running),
+                        Job.worker_id == self.worker_id,
+                    )
+                    .values(lease_expires_at=self._lease())
+                )
+        self._last_heartbeat = now
+
+    def _requeue_expired(self) -> None:
+        """Re-queue jobs whose worker stopped renewing the lease."""
+        now = _now()
+        expired = (Job.status == "running", Job.lease_expires_at < now)
+        with get_session() as session:
+            requeued = session.execute(
+                update(Job)
+                .where(*expired, Job.attempts < self.max_attempts)
+                .values(
+                    status="queued",
+                    worker_id=None,
+                    lease_expires_at=None,
+                    updated_at=now,
+                )
+            ).rowcount
+            failed = session.execute(
+                update(Job)
+                .where(*expired)
+                .values(
+                    status="failed",
+                    worker_id=None,
+                    lease_expires_at=None,
+                    error="Worker lease expired",
+                    updated_at=now,
+                )
+            ).rowcount
+        if requeued or failed:
+            log_key_value("Expired job leases", f"{requeued} re-queued, {failed} failed")
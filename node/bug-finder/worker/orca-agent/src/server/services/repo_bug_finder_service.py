@@ -7,6 +7,8 @@ from prometheus_swarm.utils.logging import logger
 from dotenv import load_dotenv
 from src.workflows.repoBugFinder.prompts import PROMPTS
 from src.database.models import Submission
+from src.utils.budget import budget_scope
+from src.utils.tracing import trace_run
 
 load_dotenv()
 
@@ -27,7 +29,11 @@ def handle_task_creation(task_id, swarmBountyId, repo_url, signature, db=None):
             swarmBountyId=swarmBountyId,
         )
 
-        result = workflow.run()
+        with (
+            trace_run("repo_bug_finder", swarmBountyId=swarmBountyId, task_id=task_id),
+            budget_scope("repo_bug_finder"),
+        ):
+            result = workflow.run()
         if result.get("success"):
             # Convert swarmBountyId to integer
             submission = Submission(
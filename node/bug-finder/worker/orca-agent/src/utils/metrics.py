@@ -0,0 +1,236 @@
+"""Prometheus metrics for the agent's Flask app and its workflows.
+
+``init_app`` times every request on a monotonic clock into a per-route
+latency histogram and serves the registry at ``GET /metrics``. ``instrument``
+adds the signals we autoscale on from code we do not own: phase durations
+(``WorkflowPhase.execute``), LLM token counts (the prometheus_swarm clients)
+and the GitHub rate limit left (response headers seen by ``requests``, which
+PyGithub uses). Queue depth and executor saturation are registered by the
+code that owns the queue (``track_executor``), and in-flight workflows are
+counted by ``src.utils.tracing.trace_run``.
+
+Every app runs a single gunicorn worker, so the default registry is enough.
+"""
+
+import functools
+import time
+from typing import Callable, Dict
+from flask import Blueprint, Response, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from urllib.parse import urlsplit
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Flask request latency",
+    ["method", "route", "status"],
+)
+WORKFLOWS_IN_FLIGHT = Gauge(
+    "workflows_in_flight", "Workflow runs currently executing", ["workflow"]
+)
+WORKFLOW_DURATION = Histogram(
+    "workflow_duration_seconds",
+    "Duration of complete workflow runs",
+    ["workflow", "status"],
+    buckets=(10, 30, 60, 120, 300, 600, 900, 1200, 1800, 3600, float("inf")),
+)
+PHASE_DURATION = Histogram(
+    "workflow_phase_duration_seconds",
+    "Duration of workflow phases",
+    ["phase"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, float("inf")),
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total", "Tokens used by LLM calls", ["model", "kind"]
+)
+GITHUB_RATE_LIMIT_REMAINING = Gauge(
+    "github_rate_limit_remaining",
+    "Requests left in the current GitHub rate limit window",
+    ["resource"],
+)
+QUEUE_DEPTH = Gauge("queue_depth", "Jobs waiting to start", ["queue"])
+EXECUTOR_BUSY = Gauge("executor_busy_workers", "Workers running a job", ["executor"])
+EXECUTOR_SIZE = Gauge("executor_max_workers", "Size of the worker pool", ["executor"])
+
+bp = Blueprint("metrics", __name__)
+_instrumented = False
+
+
+@bp.get("/metrics")
+def metrics():
+    return Response(generate_latest(), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_app(app) -> None:
+    """Time requests and serve ``/metrics``."""
+
+    @app.before_request
+    def start_timer():
+        request.start_time = time.perf_counter()
+
+    @app.after_request
+    def observe_latency(response):
+        started = getattr(request, "start_time", None)
+        if started is not None:
+            # The rule, not the path, keeps the label set bounded
+            route = request.url_rule.rule if request.url_rule else "unmatched"
+            REQUEST_LATENCY.labels(
+                request.method, route, str(response.status_code)
+            ).observe(time.perf_counter() - started)
+        return response
+
+    app.register_blueprint(bp)
+
+
+def request_duration_ms() -> float:
+    """Milliseconds since the current request started."""
+    started = getattr(request, "start_time", None)
+    return 0.0 if started is None else (time.perf_counter() - started) * 1000
+
+
+def track_executor(
+    name: str,
+    size: int,
+    depth: Callable[[], int] = None,
+    busy: Callable[[], int] = None,
+) -> None:
+    """Publish the size of a worker pool and, if given, its backlog and busy workers.
+
+    Pools that cannot report their backlog or busy workers can wrap their jobs
+    in ``count_queued`` and ``count_busy``.
+    """
+    EXECUTOR_SIZE.labels(name).set(size)
+    if depth is not None:
+        QUEUE_DEPTH.labels(name).set_function(depth)
+    if busy is not None:
+        EXECUTOR_BUSY.labels(name).set_function(busy)
+
+
+def count_queued(name: str, func: Callable) -> Callable:
+    """Count a job in the ``name`` queue until it starts; wrap it as it is submitted."""
+    QUEUE_DEPTH.labels(name).inc()
+    started = False
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal started
+        if not started:
+            started = True
+            QUEUE_DEPTH.labels(name).dec()
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def count_busy(name: str, func: Callable) -> Callable:
+    """Wrap ``func`` so the ``name`` pool counts it as a busy worker while it runs."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        EXECUTOR_BUSY.labels(name).inc()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            EXECUTOR_BUSY.labels(name).dec()
+
+    return wrapper
+
+
+def token_usage(response) -> Dict[str, int]:
+    """Input and output tokens reported by an LLM API response."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return {}
+    counts = {}
+    # Anthropic reports input/output tokens, OpenAI-style APIs prompt/completion
+    for kind, fields in (
+        ("input", ("input_tokens", "prompt_tokens")),
+        ("output", ("output_tokens", "completion_tokens")),
+    ):
+        for field in fields:
+            count = getattr(usage, field, None)
+            if isinstance(count, int):
+                counts[kind] = count
+                break
+    return counts
+
+
+def _count_tokens(model: str, response) -> None:
+    for kind, count in token_usage(response).items():
+        LLM_TOKENS.labels(model, kind).inc(count)
+
+
+def _record_rate_limit(response) -> None:
+    if urlsplit(response.url).hostname != "api.github.com":
+        return
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    if remaining is not None and remaining.isdigit():
+        resource = response.headers.get("X-RateLimit-Resource", "core")
+        GITHUB_RATE_LIMIT_REMAINING.labels(resource).set(int(remaining))
+
+
+def instrument() -> None:
+    """Collect phase, token and rate-limit metrics; safe to call more than once."""
+    global _instrumented
+    if _instrumented:
+        return
+    _instrumented = True
+
+    from prometheus_swarm.workflows.base import WorkflowPhase
+
+    execute = WorkflowPhase.execute
+
+    @functools.wraps(execute)
+    def timed_execute(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return execute(self, *args, **kwargs)
+        finally:
+            PHASE_DURATION.labels(type(self).__name__).observe(
+                time.perf_counter() - started
+            )
+
+    WorkflowPhase.execute = timed_execute
+
+    import importlib
+
+    # OpenRouter, xAI and LocalAI inherit the OpenAI call
+    for module_name, class_name in (
+        ("anthropic_client", "AnthropicClient"),
+        ("openai_client", "OpenAIClient"),
+    ):
+        try:
+            module = importlib.import_module(f"prometheus_swarm.clients.{module_name}")
+            client_class = getattr(module, class_name)
+        except (ImportError, AttributeError):
+            continue
+        _wrap_api_call(client_class)
+
+    import requests
+
+    request_method = requests.Session.request
+
+    @functools.wraps(request_method)
+    def recording_request(self, *args, **kwargs):
+        response = request_method(self, *args, **kwargs)
+        _record_rate_limit(response)
+        return response
+
+    requests.Session.request = recording_request
+
+
+def _wrap_api_call(client_class) -> None:
+    api_call = client_class._make_api_call
+
+    @functools.wraps(api_call)
+    def counted_api_call(self, *args, **kwargs):
+        response = api_call(self, *args, **kwargs)
+        _count_tokens(str(getattr(self, "model", "unknown")), response)
+        return response
+
+    client_class._make_api_call = counted_api_call
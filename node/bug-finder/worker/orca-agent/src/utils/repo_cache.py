@@ -0,0 +1,340 @@
+"""Local bare-mirror cache for repository checkouts.
+
+``setup_repository`` and ``cleanup_repository`` are drop-in replacements for the
+helpers of the same name in ``prometheus_swarm.workflows.utils``. Instead of a
+fresh network clone per run, every clone URL gets one bare mirror under
+``REPO_CACHE_DIR``. A run only fetches the objects that are new upstream and then
+takes a local ``git clone --shared`` of the mirror, which borrows the mirror's
+object store and finishes in seconds.
+
+Mirrors are evicted least-recently-used first once their total size exceeds
+``REPO_CACHE_MAX_BYTES``. A mirror is never evicted while a checkout made from
+it is still alive (tracked with a shared ``flock`` held until cleanup), so this
+is also safe when several processes share the cache directory.
+
+Read-only workflows can pass ``read_only=True`` to get a blobless partial clone
+instead (see ``src.utils.partial_clone``); those bypass the mirror cache because
+they only download the few files they actually read.
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from git import Repo
+from prometheus_swarm.utils.logging import log_key_value, log_error
+from prometheus_swarm.workflows.utils import _fork_repository, _setup_git_user_config
+from src.utils.file_tree import release_index
+from src.utils.partial_clone import clone_partial, release_workspace
+from src.utils.tracing import span, traced
+
+# Directory the service was started from, reported as ``original_dir`` for
+# callers of the prometheus_swarm API. Workflows never change directory.
+ORIGINAL_DIR = os.getcwd()
+REPOS_DIR = os.path.abspath(os.getenv("REPO_WORKSPACE_DIR", "repos"))
+CACHE_DIR = os.path.abspath(
+    os.getenv("REPO_CACHE_DIR", os.path.join(REPOS_DIR, ".mirrors"))
+)
+CACHE_MAX_BYTES = int(os.getenv("REPO_CACHE_MAX_BYTES", str(10 * 1024**3)))
+CACHE_ENABLED = os.getenv("REPO_CACHE_ENABLED", "true").lower() != "false"
+
+# Only branches and tags are mirrored; GitHub's refs/pull/* would otherwise make
+# the mirror of a popular repository many times larger than the repository itself.
+_FETCH_REFSPECS = ["+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*"]
+_SIZE_FILE = "CACHE_SIZE"
+
+# Checkout path -> lease lock file held open for as long as the checkout exists
+_leases = {}
+_leases_lock = threading.Lock()
+
+
+def _run_git(args: list[str], cwd: str = None, secret: str = None) -> str:
+    """Run a git command and return its stdout, hiding ``secret`` in errors."""
+    with span("git", command=args[0]):
+        result = subprocess.run(
+            ["git", *args], cwd=cwd, capture_output=True, text=True
+        )
+    if result.returncode != 0:
+        message = result.stderr.strip()
+        if secret:
+            message = message.replace(secret, "***")
+        raise RuntimeError(f"git {args[0]} failed: {message}")
+    return result.stdout
+
+
+@contextlib.contextmanager
+def _flock(path: str, mode: int):
+    """Hold an flock on ``path`` for the duration of the block."""
+    with open(path, "a+") as lock_file:
+        fcntl.flock(lock_file, mode)
+        try:
+            yield lock_file
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _mirror_path(clone_url: str) -> str:
+    """Return the cache directory used for a clone URL."""
+    normalized = clone_url.strip().rstrip("/").lower()
+    if normalized.endswith(".git"):
+        normalized = normalized[: -len(".git")]
+    owner, name = normalized.split("/")[-2:]
+    digest = hashlib.sha256(normalized.encode()).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"{owner}__{name}-{digest}.git")
+
+
+def _lock_path(mirror_path: str, kind: str) -> str:
+    return f"{mirror_path[: -len('.git')]}.{kind}"
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.path.getsize(os.path.join(root, filename))
+            except OSError:
+                pass
+    return total
+
+
+def _record_usage(mirror_path: str) -> None:
+    """Store the mirror size and mark it as most recently used."""
+    size = _dir_size(mirror_path)
+    with open(os.path.join(mirror_path, _SIZE_FILE), "w") as f:
+        f.write(str(size))
+
+
+def _update_mirror(mirror_path: str, auth_url: str, secret: str = None) -> None:
+    """Create the mirror if needed and fetch only what is new upstream."""
+    created = not os.path.exists(os.path.join(mirror_path, "HEAD"))
+    if created:
+        shutil.rmtree(mirror_path, ignore_errors=True)
+        _run_git(["init", "--bare", "--quiet", mirror_path])
+        # Checkouts borrow objects from the mirror, so it must never prune them
+        _run_git(["config", "gc.auto", "0"], cwd=mirror_path)
+
+    try:
+        _run_git(
+            ["fetch", "--prune", "--quiet", auth_url, *_FETCH_REFSPECS],
+            cwd=mirror_path,
+            secret=secret,
+        )
+        # Follow the upstream default branch so plain clones check it out
+        head = _run_git(
+            ["ls-remote", "--symref", auth_url, "HEAD"], cwd=mirror_path, secret=secret
+        )
+        for line in head.splitlines():
+            if line.startswith("ref:"):
+                _run_git(["symbolic-ref", "HEAD", line.split()[1]], cwd=mirror_path)
+                break
+    except Exception:
+        if created:
+            shutil.rmtree(mirror_path, ignore_errors=True)
+        raise
+
+    _record_usage(mirror_path)
+
+
+def _evict_mirrors(keep: str) -> None:
+    """Evict least recently used mirrors until the cache fits its quota."""
+    mirrors = []
+    for entry in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, entry)
+        if not entry.endswith(".git") or not os.path.isdir(path):
+            continue
+        size_file = os.path.join(path, _SIZE_FILE)
+        try:
+            with open(size_file) as f:
+                size = int(f.read().strip() or 0)
+            last_used = os.path.getmtime(size_file)
+        except (OSError, ValueError):
+            size, last_used = _dir_size(path), 0
+        mirrors.append((last_used, path, size))
+
+    total = sum(size for _, _, size in mirrors)
+    for _, path, size in sorted(mirrors):
+        if total <= CACHE_MAX_BYTES:
+            break
+        if path == keep:
+            continue
+        update_lock = open(_lock_path(path, "lock"), "a+")
+        lease_lock = open(_lock_path(path, "lease"), "a+")
+        try:
+            # Skip mirrors that are being updated or still back a checkout
+            fcntl.flock(update_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            fcntl.flock(lease_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            log_key_value("Evicted repository mirror", os.path.basename(path))
+        except BlockingIOError:
+            continue
+        finally:
+            update_lock.close()
+            lease_lock.close()
+
+
+def _checkout_from_cache(
+    clone_url: str, auth_url: str, repo_path: str, branch: str = None, secret: str = None
+) -> Repo:
+    """Refresh the mirror for ``clone_url`` and make a shared clone of it."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    mirror_path = _mirror_path(clone_url)
+
+    lease = open(_lock_path(mirror_path, "lease"), "a+")
+    fcntl.flock(lease, fcntl.LOCK_SH)
+    with _leases_lock:
+        _leases[repo_path] = lease
+
+    with _flock(_lock_path(mirror_path, "lock"), fcntl.LOCK_EX):
+        _update_mirror(mirror_path, auth_url, secret)
+        clone_args = ["clone", "--shared", "--quiet"]
+        if branch:
+            clone_args += ["--branch", branch]
+        _run_git([*clone_args, mirror_path, repo_path])
+
+    # The checkout pushes and fetches against the real remote, not the mirror
+    _run_git(["remote", "set-url", "origin", auth_url], cwd=repo_path, secret=secret)
+    _evict_mirrors(keep=mirror_path)
+    return Repo(repo_path)
+
+
+def _release_lease(repo_path: str) -> None:
+    with _leases_lock:
+        lease = _leases.pop(repo_path, None)
+    if lease:
+        fcntl.flock(lease, fcntl.LOCK_UN)
+        lease.close()
+
+
+@traced("repository.setup")
+def setup_repository(
+    repo_url: str,
+    github_token: str = None,
+    github_username: str = None,
+    skip_fork: bool = False,
+    branch: str = None,
+    read_only: bool = False,
+) -> dict:
+    """Set up a repository checkout backed by the local mirror cache.
+
+    Takes the same arguments and returns the same result shape as
+    ``prometheus_swarm.workflows.utils.setup_repository``. Falls back to a plain
+    clone if the cache cannot be used. With ``read_only`` the checkout is a
+    partial clone whose files are downloaded when first read.
+
+    Args:
+        repo_url: URL of the repository (e.g., https://github.com/owner/repo)
+        github_token: Optional GitHub token for authentication
+        github_username: Optional GitHub username for Git config
+        skip_fork: Optional flag to skip forking and clone directly
+        branch: Optional branch to clone (defaults to repository's default branch)
+        read_only: Optional flag to make a blobless partial clone for workflows
+            that never modify the checkout
+
+    Returns:
+        dict: Result with success status, repository details, and paths
+    """
+    try:
+        parts = repo_url.strip("/").split("/")
+        repo_owner, repo_name = parts[-2:]
+        repo_full_name = f"{repo_owner}/{repo_name}"
+
+        if not skip_fork:
+            fork_result = _fork_repository(repo_full_name, github_token)
+            if not fork_result["success"]:
+                raise Exception(fork_result.get("error", "Failed to fork repository"))
+            clone_url = fork_result["data"]["fork_url"]
+            fork_owner = fork_result["data"]["owner"]
+            fork_name = fork_result["data"]["repo"]
+        else:
+            clone_url = repo_url
+            fork_owner = repo_owner
+            fork_name = repo_name
+
+        os.makedirs(REPOS_DIR, exist_ok=True)
+        repo_path = tempfile.mkdtemp(prefix="repo_", dir=REPOS_DIR)
+        original_dir = ORIGINAL_DIR
+
+        if github_token and "github.com" in clone_url:
+            auth_url = clone_url.replace("https://", f"https://{github_token}@")
+        else:
+            auth_url = clone_url
+
+        log_key_value("Cloning repository", clone_url)
+        log_key_value("Clone path", repo_path)
+        started = time.monotonic()
+
+        repo = None
+        if read_only:
+            try:
+                repo = clone_partial(auth_url, repo_path, branch, secret=github_token)
+            except Exception as e:
+                log_error(e, "Partial clone failed, falling back to a full checkout")
+                shutil.rmtree(repo_path, ignore_errors=True)
+        if repo is None and CACHE_ENABLED:
+            try:
+                repo = _checkout_from_cache(
+                    clone_url, auth_url, repo_path, branch, secret=github_token
+                )
+            except Exception as e:
+                log_error(e, "Repository cache unavailable, falling back to a full clone")
+                _release_lease(repo_path)
+                shutil.rmtree(repo_path, ignore_errors=True)
+        if repo is None:
+            if branch:
+                repo = Repo.clone_from(auth_url, repo_path, branch=branch)
+            else:
+                repo = Repo.clone_from(auth_url, repo_path)
+        log_key_value("Checkout time", f"{time.monotonic() - started:.1f}s")
+
+        if github_username:
+            _setup_git_user_config(repo, github_username)
+
+        if not skip_fork:
+            repo.create_remote("upstream", repo_url)
+
+        return {
+            "success": True,
+            "message": "Successfully set up repository",
+            "data": {
+                "clone_path": repo_path,
+                "original_dir": original_dir,
+                "repo": repo,
+                "fork_url": clone_url,
+                "fork_owner": fork_owner,
+                "fork_name": fork_name,
+            },
+        }
+
+    except Exception as e:
+        log_error(e, "Repository setup failed")
+        return {
+            "success": False,
+            "message": "Failed to set up repository",
+            "data": None,
+            "error": str(e),
+        }
+
+
+@traced("repository.cleanup")
+def cleanup_repository(original_dir: str, repo_path: str):
+    """Clean up a checkout and release its mirror lease.
+
+    The working directory is left alone: workflows address their checkout by
+    path, so several of them can run in one process.
+
+    Args:
+        original_dir: Unused; kept for compatibility with prometheus_swarm
+        repo_path: Repository path to clean up
+    """
+    release_workspace(repo_path)
+    release_index(repo_path)
+    if repo_path and os.path.exists(repo_path):
+        shutil.rmtree(repo_path)
+    _release_lease(repo_path)
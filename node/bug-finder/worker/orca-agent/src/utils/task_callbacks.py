@@ -0,0 +1,252 @@
+"""Outbound calls from the worker to its task server.
+
+The task server (``TASK_CALLBACK_URL``, the Koii task node on
+``host.docker.internal:30017`` by default) relays PR results to the middle
+server. A result that never arrives means the bounty is run again from
+scratch, so PR updates are not fire-and-forget:
+
+- Every update is first written to the ``Callback`` outbox table, keyed on the
+  bounty, and then delivered by a background sender thread. Updates still in
+  the outbox are replayed when the worker starts again.
+- Failed deliveries are retried with exponential backoff and jitter, up to
+  ``TASK_CALLBACK_MAX_ATTEMPTS`` times, after which the row is kept as
+  ``failed`` for inspection.
+- A bounty has at most one pending update. A final PR update replaces a draft
+  update that has not been delivered yet, and a draft update arriving after
+  the final one is dropped.
+- All requests share one keep-alive session with connect and read timeouts.
+"""
+
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from sqlalchemy import delete, func, select, update
+from prometheus_swarm.database import get_session
+from prometheus_swarm.utils.logging import log_key_value, log_error
+from src.database.models import Callback
+
+BASE_URL = os.getenv("TASK_CALLBACK_URL", "http://host.docker.internal:30017")
+CONNECT_TIMEOUT = float(os.getenv("TASK_CALLBACK_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("TASK_CALLBACK_READ_TIMEOUT", "30"))
+MAX_ATTEMPTS = int(os.getenv("TASK_CALLBACK_MAX_ATTEMPTS", "8"))
+BACKOFF_BASE = float(os.getenv("TASK_CALLBACK_BACKOFF_BASE", "2"))
+BACKOFF_MAX = float(os.getenv("TASK_CALLBACK_BACKOFF_MAX", "300"))
+POOL_SIZE = 4
+POLL_INTERVAL = 5.0
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class CallbackClient:
+    """Pooled, retrying client for the task server's PR endpoints."""
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        max_attempts: int = MAX_ATTEMPTS,
+        backoff_base: float = BACKOFF_BASE,
+        backoff_max: float = BACKOFF_MAX,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = requests.Session()
+        # Retries are ours (with backoff and the outbox), not urllib3's
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._sender = None
+
+    def post(self, path: str, payload: dict) -> requests.Response:
+        """POST ``payload`` to the task server once, raising on HTTP errors."""
+        response = self.session.post(
+            f"{self.base_url}{path}", json=payload, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response
+
+    def submit_pr(
+        self,
+        task_id: str,
+        swarmBountyId: str,
+        payload: dict,
+        draft: bool = False,
+    ) -> None:
+        """Queue a draft or final PR update for delivery."""
+        kind = "draft" if draft else "final"
+        endpoint = "add-todo-draft-pr" if draft else "add-todo-pr"
+        path = f"/task/{task_id}/{endpoint}"
+        if swarmBountyId is None:
+            # Outbox rows are keyed on the bounty; without one, deliver inline
+            self._send_with_retries(path, payload)
+            return
+        try:
+            queued = self._store(str(swarmBountyId), kind, path, payload)
+        except Exception as e:
+            # No outbox (e.g. the database is not initialized); deliver inline
+            log_error(e, "Callback outbox unavailable, sending directly")
+            self._send_with_retries(path, payload)
+            return
+        if queued:
+            self.start()
+            self._wakeup.set()
+        else:
+            log_key_value("Dropped draft PR update superseded by final", swarmBountyId)
+
+    def start(self) -> None:
+        """Start the sender thread, replaying pending updates; idempotent."""
+        with self._lock:
+            if self._sender and self._sender.is_alive():
+                return
+            self._sender = threading.Thread(
+                target=self._send_loop, name="task-callbacks", daemon=True
+            )
+            self._sender.start()
+
+    def _store(self, swarm_bounty_id: str, kind: str, path: str, payload: dict) -> bool:
+        with get_session() as session:
+            callback = session.get(Callback, swarm_bounty_id)
+            if callback is None:
+                session.add(
+                    Callback(
+                        swarmBountyId=swarm_bounty_id,
+                        kind=kind,
+                        path=path,
+                        payload=payload,
+                    )
+                )
+                return True
+            if (
+                callback.status == "pending"
+                and callback.kind == "final"
+                and kind == "draft"
+            ):
+                return False
+            callback.kind = kind
+            callback.path = path
+            callback.payload = payload
+            # Bumped so an in-flight delivery of the old update cannot delete this one
+            callback.version += 1
+            callback.status = "pending"
+            callback.attempts = 0
+            callback.next_attempt_at = _now()
+            callback.error = None
+            callback.updated_at = _now()
+            return True
+
+    def _send_loop(self) -> None:
+        while True:
+            try:
+                while self._deliver_next():
+                    pass
+            except Exception as e:
+                log_error(e, "Callback sender error")
+            self._wakeup.wait(self._until_next_due())
+            self._wakeup.clear()
+
+    def _until_next_due(self) -> float:
+        """Seconds until the next pending retry, capped at the poll interval."""
+        try:
+            with get_session() as session:
+                next_due = session.execute(
+                    select(func.min(Callback.next_attempt_at)).where(
+                        Callback.status == "pending"
+                    )
+                ).scalar()
+        except Exception:
+            return POLL_INTERVAL
+        if next_due is None:
+            return POLL_INTERVAL
+        if next_due.tzinfo is None:
+            # SQLite hands datetimes back without their zone
+            next_due = next_due.replace(tzinfo=timezone.utc)
+        return min(POLL_INTERVAL, max(0.0, (next_due - _now()).total_seconds()))
+
+    def _deliver_next(self) -> bool:
+        """Try the oldest due update; return False when none is due."""
+        with get_session() as session:
+            callback = session.execute(
+                select(Callback)
+                .where(Callback.status == "pending", Callback.next_attempt_at <= _now())
+                .order_by(Callback.next_attempt_at)
+                .limit(1)
+            ).scalar()
+            if callback is None:
+                return False
+            swarm_bounty_id = callback.swarmBountyId
+            version = callback.version
+            attempts = callback.attempts + 1
+            path, payload = callback.path, dict(callback.payload)
+
+        error = None
+        try:
+            self.post(path, payload)
+        except requests.RequestException as e:
+            error = str(e)
+
+        current = (Callback.swarmBountyId == swarm_bounty_id, Callback.version == version)
+        with get_session() as session:
+            if error is None:
+                session.execute(delete(Callback).where(*current))
+            elif attempts >= self.max_attempts:
+                session.execute(
+                    update(Callback)
+                    .where(*current)
+                    .values(
+                        status="failed", attempts=attempts, error=error, updated_at=_now()
+                    )
+                )
+            else:
+                session.execute(
+                    update(Callback)
+                    .where(*current)
+                    .values(
+                        attempts=attempts,
+                        next_attempt_at=_now() + timedelta(seconds=self._backoff(attempts)),
+                        error=error,
+                        updated_at=_now(),
+                    )
+                )
+
+        if error is None:
+            log_key_value("Delivered PR update", f"{swarm_bounty_id} {path}")
+        elif attempts >= self.max_attempts:
+            log_error(
+                Exception(error),
+                f"Giving up on PR update for {swarm_bounty_id} after {attempts} attempts",
+            )
+        else:
+            log_key_value(
+                "PR update failed, will retry", f"{swarm_bounty_id} (attempt {attempts})"
+            )
+        return True
+
+    def _send_with_retries(self, path: str, payload: dict) -> Optional[requests.Response]:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return self.post(path, payload)
+            except requests.RequestException as e:
+                if attempt == self.max_attempts:
+                    log_error(e, f"Failed to send {path}")
+                    return None
+                time.sleep(self._backoff(attempt))
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+
+callbacks = CallbackClient()
@@ -7,15 +7,16 @@ from prometheus_swarm.utils.logging import log_section, log_key_value, log_error
 from src.workflows.repoBugFinder import phases
 from prometheus_swarm.workflows.utils import (
     check_required_env_vars,
-    cleanup_repository,
     validate_github_auth,
-    setup_repository,
 )
+from src.utils.repo_cache import setup_repository, cleanup_repository
+from src.tools.workspace_operations import register_workspace_tools
 from src.workflows.repoBugFinder.prompts import PROMPTS
 from kno_sdk import agent_query, index_repo
 from pathlib import Path
 import time
 from datetime import datetime
+from src.utils.tracing import span, traced
 
 class Task:
     def __init__(self, title: str, description: str, acceptance_criteria: list[str]):
@@ -67,7 +68,9 @@ class RepoBugFinderWorkflow(Workflow):
             repo_owner=repo_owner,
             repo_name=repo_name,
         )
+        register_workspace_tools(client)
 
+    @traced("workflow.setup")
     def setup(self):
         """Set up repository and workspace."""
         check_required_env_vars(["GITHUB_TOKEN", "GITHUB_USERNAME"])
@@ -105,9 +108,6 @@ class RepoBugFinderWorkflow(Workflow):
         self.context["fork_owner"] = setup_result["data"]["fork_owner"]
         self.context["fork_name"] = setup_result["data"]["fork_name"]
 
-        # Enter repo directory
-        os.chdir(self.context["repo_path"])
-
         # Configure Git user info
         # setup_git_user_config(self.context["repo_path"])
 
@@ -115,10 +115,6 @@ class RepoBugFinderWorkflow(Workflow):
 
     def cleanup(self):
         """Cleanup workspace."""
-        # Make sure we're not in the repo directory before cleaning up
-        if os.getcwd() == self.context.get("repo_path", ""):
-            os.chdir(self.original_dir)
-
         # Clean up the repository directory
         cleanup_repository(self.original_dir, self.context.get("repo_path", ""))
         # Clean up the MongoDB
@@ -142,7 +138,8 @@ class RepoBugFinderWorkflow(Workflow):
         # Store branch name in context
         self.context["head"] = branch_result["data"]["branch_name"]
         log_key_value("Branch created", self.context["head"])
-        index = index_repo(Path(self.context["repo_path"]))
+        with span("kno.index_repo"):
+            index = index_repo(Path(self.context["repo_path"]))
 
         bug_finder_file_result = self.generate_bug_finder_file(index)
         if not bug_finder_file_result or not bug_finder_file_result.get("success"):
@@ -229,55 +226,59 @@ class RepoBugFinderWorkflow(Workflow):
         """Generate the README file."""
 
         try:            
-            identified_repo_type = agent_query(
-                repo_index=index,
-                llm_system_prompt=PROMPTS[
-                    "system_prompt"
-                ],
-                prompt=PROMPTS[
-                    "identity_repo_type"
-                ],
-                MODEL_API_KEY=os.environ.get("ANTHROPIC_API_KEY"),
-            )
+            with span("kno.agent_query"):
+                identified_repo_type = agent_query(
+                    repo_index=index,
+                    llm_system_prompt=PROMPTS[
+                        "system_prompt"
+                    ],
+                    prompt=PROMPTS[
+                        "identity_repo_type"
+                    ],
+                    MODEL_API_KEY=os.environ.get("ANTHROPIC_API_KEY"),
+                )
             
             print("identified_repo_type",identified_repo_type)
-            identified_common_vulnerabilities = agent_query(
-                repo_index=index,
-                llm_system_prompt=PROMPTS[
-                    "system_prompt"
-                ],
-                prompt=PROMPTS[
-                    "generate_common_vulnerabilities"
-                ].format(identified_repo_type=identified_repo_type.replace("#Final-Answer:","")),
-                MODEL_API_KEY=os.environ.get("ANTHROPIC_API_KEY"),
-            )
+            with span("kno.agent_query"):
+                identified_common_vulnerabilities = agent_query(
+                    repo_index=index,
+                    llm_system_prompt=PROMPTS[
+                        "system_prompt"
+                    ],
+                    prompt=PROMPTS[
+                        "generate_common_vulnerabilities"
+                    ].format(identified_repo_type=identified_repo_type.replace("#Final-Answer:","")),
+                    MODEL_API_KEY=os.environ.get("ANTHROPIC_API_KEY"),
+                )
             print("identified_common_vulnerabilities",identified_common_vulnerabilities)
 
-            identified_issues = agent_query(
-                repo_index=index,
-                max_iterations=60,
-                llm_system_prompt=PROMPTS[
-                    "system_prompt"
-                ],
-                prompt=PROMPTS[
-                    "scan_codebase_for_identified_issues"
-                ].format(identified_common_vulnerabilities=identified_common_vulnerabilities.replace("#Final-Answer:","")),
-                MODEL_API_KEY=os.environ.get("ANTHROPIC_API_KEY"),
-            )
+            with span("kno.agent_query"):
+                identified_issues = agent_query(
+                    repo_index=index,
+                    max_iterations=60,
+                    llm_system_prompt=PROMPTS[
+                        "system_prompt"
+                    ],
+                    prompt=PROMPTS[
+                        "scan_codebase_for_identified_issues"
+                    ].format(identified_common_vulnerabilities=identified_common_vulnerabilities.replace("#Final-Answer:","")),
+                    MODEL_API_KEY=os.environ.get("ANTHROPIC_API_KEY"),
+                )
             # Getting rate limited from anthropic after above call
             time.sleep(60)
             print("identified_issues",identified_issues)
 
-            identified_issues_formatted_markdown = agent_query(
-                repo_index=index,
-                llm_system_prompt=PROMPTS[
-                    "system_prompt"
-                ],
-                prompt=PROMPTS[
-                    "format_identified_issues_into_markdown"
-                ].format(identified_code_issues=identified_issues.replace("#Final-Answer:","")),
-                MODEL_API_KEY=os.environ.get("ANTHROPIC_API_KEY"),
-            )
+            with span("kno.agent_query"):
+                identified_issues_formatted_markdown = agent_query(
+                    repo_index=index,
+                    llm_system_prompt=PROMPTS[
+                        "system_prompt"
+                    ],
+                    prompt=PROMPTS[
+                        "format_identified_issues_into_markdown"
+                    ].format(identified_code_issues=identified_issues.replace("#Final-Answer:","")),
+                    MODEL_API_KEY=os.environ.get("ANTHROPIC_API_KEY"),
+                )
             print("identified_issues_formatted_markdown",identified_issues_formatted_markdown)
             
             marker = "#Final-Answer:"
@@ -0,0 +1,247 @@
+"""Stress test: several workflows sharing one process must not share a directory.
+
+Runs eight ``repoSummarizerAuditWorkflow`` instances at once against local
+repositories. Each workflow does its real setup (a partial clone of the
+repository plus a fetch of the pull request's branch) and runs its phase
+through a client whose LLM replies are scripted: the tool calls go through
+``handle_tool_response`` and the registered tools exactly as they would with a
+real model. Every workflow must only ever see its own checkout, and the process
+working directory must never change.
+
+GitHub is replaced by local bare repositories: ``https://github.com/`` URLs are
+rewritten to them with git's ``insteadOf``, and the GitHub API calls made by the
+workflow (forking, the pull request lookup and posting the review) are stubbed.
+
+Run from the agent directory so that ``src`` is importable:
+
+    python -m pytest tests/test_concurrent_workspaces.py
+"""
+
+import json
+import os
+import subprocess
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import prometheus_swarm
+from prometheus_swarm.clients.base_client import Client
+from src.utils import repo_cache
+from src.workflows.repoSummarizerAudit import workflow as audit_workflow
+from src.workflows.repoSummarizerAudit.prompts import PROMPTS
+
+WORKFLOWS = 8
+PR_BRANCH = "security-audit"
+REPORT = "SECURITY_AUDIT_Prometheus-beta.md"
+
+
+def _git(*args, cwd=None) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=cwd, capture_output=True, text=True, check=True
+    ).stdout
+
+
+def _make_origin(root: Path, index: int) -> None:
+    """Create ``owner<index>/repo<index>`` with the audited report on a PR branch."""
+    origin = root / "origins" / f"owner{index}" / f"repo{index}"
+    seed = root / "seed" / str(index)
+    _git("init", "--bare", "--quiet", "-b", "main", str(origin))
+    # Partial clones fetch blobs by id on demand
+    _git("config", "uploadpack.allowFilter", "true", cwd=origin)
+    _git("config", "uploadpack.allowAnySHA1InWant", "true", cwd=origin)
+    _git("init", "--quiet", "-b", "main", str(seed))
+    commit = ["-c", "user.name=seed", "-c", "user.email=seed@example.com", "commit"]
+    (seed / "src").mkdir()
+    (seed / "src" / f"module{index}.py").write_text(f"VALUE = {index}\n")
+    _git("add", "-A", cwd=seed)
+    _git(*commit, "--quiet", "-m", "initial", cwd=seed)
+    _git("checkout", "--quiet", "-b", PR_BRANCH, cwd=seed)
+    (seed / REPORT).write_text(f"# repo {index}\n")
+    _git("add", "-A", cwd=seed)
+    _git(*commit, "--quiet", "-m", "Add security audit", cwd=seed)
+    _git("push", "--quiet", str(origin), "main", PR_BRANCH, cwd=seed)
+
+
+class ScriptedClient(Client):
+    """A client whose model replies with a fixed list of tool calls.
+
+    Everything else is the real client: tool registration, context merging and
+    tool execution. The results of every tool call are kept in ``results``.
+    """
+
+    def __init__(self, tool_calls: list[tuple[str, dict]]):
+        super().__init__(model="scripted")
+        self.register_tools(Path(prometheus_swarm.__file__).parent / "tools")
+        self.tool_calls = list(tool_calls)
+        self.results = []
+        self.reviews = []
+        # Posting the review is the only GitHub call the phase makes
+        self.tools["review_pull_request_legacy"] = {
+            **self.tools["review_pull_request_legacy"],
+            "function": self._record_review,
+        }
+
+    def _record_review(self, recommendation: str, **kwargs) -> dict:
+        self.reviews.append(recommendation)
+        return {
+            "success": True,
+            "message": "Review recorded",
+            "data": {"recommendation": recommendation},
+        }
+
+    def _get_default_model(self) -> str:
+        return "scripted"
+
+    def _get_api_name(self) -> str:
+        return "scripted"
+
+    def _convert_tool_to_api_format(self, tool):
+        return tool
+
+    def _convert_message_to_api_format(self, message):
+        return message
+
+    def _convert_api_response_to_message(self, response):
+        return response
+
+    def _make_api_call(self, *args, **kwargs):
+        raise AssertionError("ScriptedClient never calls an API")
+
+    def _format_tool_response(self, response):
+        return response
+
+    def create_conversation(self, system_prompt=None, available_tools=None) -> str:
+        return str(uuid.uuid4())
+
+    def send_message(self, prompt=None, conversation_id=None, tool_response=None, **kwargs):
+        if tool_response:
+            self.results.extend(
+                json.loads(result["response"]) for result in json.loads(tool_response)
+            )
+        content = []
+        if self.tool_calls:
+            name, arguments = self.tool_calls.pop(0)
+            content.append(
+                {
+                    "type": "tool_call",
+                    "tool_call": {
+                        "id": str(uuid.uuid4()),
+                        "name": name,
+                        "arguments": dict(arguments),
+                    },
+                }
+            )
+        return {"conversation_id": conversation_id, "role": "assistant", "content": content}
+
+
+def _fake_github(index_by_repo: dict):
+    """Stand-in for ``github.Github`` that knows each repository's pull request."""
+
+    def get_repo(full_name: str):
+        index = index_by_repo[full_name]
+        head = SimpleNamespace(
+            ref=PR_BRANCH, repo=SimpleNamespace(full_name=f"owner{index}/repo{index}")
+        )
+        return SimpleNamespace(get_pull=lambda number: SimpleNamespace(head=head))
+
+    return lambda token=None: SimpleNamespace(get_repo=get_repo)
+
+
+@pytest.fixture
+def github(tmp_path, monkeypatch):
+    for index in range(WORKFLOWS):
+        _make_origin(tmp_path, index)
+    # Every https://github.com/<owner>/<repo> clone and fetch goes to the local origin
+    monkeypatch.setenv("GIT_CONFIG_COUNT", "1")
+    monkeypatch.setenv("GIT_CONFIG_KEY_0", f"url.file://{tmp_path}/origins/.insteadOf")
+    monkeypatch.setenv("GIT_CONFIG_VALUE_0", "https://github.com/")
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.setenv("GITHUB_USERNAME", "stress")
+
+    monkeypatch.setattr(repo_cache, "REPOS_DIR", str(tmp_path / "repos"))
+    monkeypatch.setattr(repo_cache, "CACHE_DIR", str(tmp_path / "mirrors"))
+    monkeypatch.setattr(
+        repo_cache,
+        "_fork_repository",
+        lambda full_name, token=None: {
+            "success": True,
+            "data": {
+                "fork_url": f"https://github.com/{full_name}",
+                "owner": full_name.split("/")[0],
+                "repo": full_name.split("/")[1],
+            },
+        },
+    )
+    monkeypatch.setattr(audit_workflow, "check_required_env_vars", lambda names: None)
+    monkeypatch.setattr(audit_workflow, "validate_github_auth", lambda token, user: None)
+    monkeypatch.setattr(
+        audit_workflow,
+        "Github",
+        _fake_github({f"owner{i}/repo{i}": i for i in range(WORKFLOWS)}),
+    )
+
+
+def test_concurrent_workflows_stay_in_their_own_checkout(github, monkeypatch):
+    start_dir = os.getcwd()
+    tool_calls = [
+        ("list_files", {"directory": "."}),
+        ("read_file", {"file_path": REPORT}),
+        (
+            "review_pull_request_legacy",
+            {
+                "title": "Security audit review",
+                "description": "Scripted review",
+                "recommendation": "APPROVE",
+                "recommendation_reason": ["Matches the repository"],
+            },
+        ),
+    ]
+    # Clients and workflows are built up front, as the server does per request
+    workflows = []
+    for index in range(WORKFLOWS):
+        client = ScriptedClient(tool_calls)
+        workflows.append(
+            audit_workflow.repoSummarizerAuditWorkflow(
+                client=client,
+                prompts=dict(PROMPTS),
+                pr_url=f"https://github.com/owner{index}/repo{index}/pull/{index + 1}",
+            )
+        )
+
+    barrier = threading.Barrier(WORKFLOWS, timeout=60)
+    original_setup = audit_workflow.repoSummarizerAuditWorkflow.setup
+
+    def setup_then_wait(workflow):
+        original_setup(workflow)
+        # Make every workflow run its phase while all the others are checked out
+        barrier.wait()
+
+    def run_workflow(index: int) -> tuple[dict, str, list]:
+        workflow = workflows[index]
+        try:
+            result = workflow.run()
+            assert os.getcwd() == start_dir
+            return result, workflow.context["repo_path"], workflow.client.results
+        finally:
+            workflow.cleanup()
+
+    monkeypatch.setattr(audit_workflow.repoSummarizerAuditWorkflow, "setup", setup_then_wait)
+    with ThreadPoolExecutor(max_workers=WORKFLOWS) as pool:
+        runs = list(pool.map(run_workflow, range(WORKFLOWS)))
+
+    assert os.getcwd() == start_dir
+    repo_paths = [repo_path for _, repo_path, _ in runs]
+    assert len(set(repo_paths)) == WORKFLOWS
+    assert not any(os.path.exists(path) for path in repo_paths)
+
+    for index, (result, _, results) in enumerate(runs):
+        assert result["success"], result["message"]
+        assert result["data"]["recommendation"]
+        listed, report = results[0], results[1]
+        assert sorted(listed["data"]["files"]) == [REPORT, f"src/module{index}.py"]
+        assert report["data"]["content"] == f"# repo {index}\n"
+        assert workflows[index].client.reviews == ["APPROVE"]
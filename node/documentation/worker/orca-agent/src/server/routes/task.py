@@ -1,44 +1,53 @@
 import os
-import requests
 from flask import Blueprint, jsonify, request
 from src.server.services import repo_summary_service
-from concurrent.futures import ThreadPoolExecutor
 from prometheus_swarm.database import get_db
 from src.server.services.repo_summary_service import logger
 from src.server.services.aggregator_service import create_aggregator_repo
+from src.server.services.job_queue import JobQueue
+from src.utils.task_callbacks import callbacks
 bp = Blueprint("task", __name__)
-executor = ThreadPoolExecutor(max_workers=2)
-
-# Track in-progress tasks
-in_progress_tasks = set()
 
 
 def post_pr_url(agent_result, task_id, signature, swarmBountyId):
-    try:
-        result = agent_result.result()  # Get the result from the future
-        logger.info(f"Result: {result}")
-        result_data = result.get("result", {})
-        logger.info(f"Result data: {result_data}")
-        # Make a POST request with the result
-        response = requests.post(
-            f"http://host.docker.internal:30017/task/{task_id}/add-todo-pr",
-            json={
-                "prUrl": result_data.get("data", {}).get("pr_url"),
-                "signature": signature,
-                "swarmBountyId": swarmBountyId,
-                "success": result.get("success", False),
-                "message": result_data.get("error", ""),
-            },
-        )
-        response.raise_for_status()  # Raise an error for bad responses
-    except Exception as e:
-        # Handle exceptions (e.g., log the error)
-        logger.error(f"Failed to send result: {e}")
-        logger.error(f"Exception type: {type(e)}")
-        if hasattr(e, "__traceback__"):
-            import traceback
-
-            logger.error(f"Traceback: {''.join(traceback.format_tb(e.__traceback__))}")
+    """Report a finished job to the task server through the callback outbox."""
+    if agent_result.exception() is not None:
+        result = {"success": False, "result": {"error": str(agent_result.exception())}}
+    else:
+        result = agent_result.result() or {}
+    logger.info(f"Result: {result}")
+    result_data = result.get("result") or {}
+    if not isinstance(result_data, dict):
+        # Failed tasks carry the error message itself
+        result_data = {"error": str(result_data)}
+    logger.info(f"Result data: {result_data}")
+    callbacks.submit_pr(
+        task_id,
+        swarmBountyId,
+        {
+            "prUrl": (result_data.get("data") or {}).get("pr_url"),
+            "signature": signature,
+            "swarmBountyId": swarmBountyId,
+            "success": result.get("success", False),
+            "message": result_data.get("error", ""),
+        },
+    )
+
+
+def run_job(job):
+    return repo_summary_service.handle_task_creation(
+        task_id=job["task_id"],
+        swarmBountyId=job["swarmBountyId"],
+        repo_url=job["repo_url"],
+        podcall_signature=job["podcall_signature"],
+    )
+
+
+def report_job(job, future):
+    post_pr_url(future, job["task_id"], job["podcall_signature"], job["swarmBountyId"])
+
+
+job_queue = JobQueue(run_job, on_done=report_job)
 
 
 @bp.post("/worker-task")
@@ -56,14 +65,9 @@ def start_task():
     if any(data.get(field) is None for field in required_fields):
         return jsonify({"error": "Missing data"}), 401
 
-    # Check if this swarm bounty is already being processed
-    if swarmBountyId in in_progress_tasks:
-        return jsonify({"status": "Task is already being processed"}), 200
-
-    # Get db instance in the main thread where we have app context
-    db = get_db()
-
     if os.getenv("TEST_MODE") == "true":
+        # Get db instance in the main thread where we have app context
+        db = get_db()
         result = repo_summary_service.handle_task_creation(
             task_id=task_id,
             swarmBountyId=swarmBountyId,
@@ -72,25 +76,13 @@ def start_task():
             podcall_signature=podcall_signature,
         )
         return jsonify(result)
-    else:
-        # Mark this swarm bounty as in progress
-        in_progress_tasks.add(swarmBountyId)
-        
-        def cleanup_callback(future):
-            # Remove from in-progress tasks when done
-            in_progress_tasks.discard(swarmBountyId)
-            # Call the original callback
-            post_pr_url(future, task_id, podcall_signature, swarmBountyId)
-
-        agent_result = executor.submit(
-            repo_summary_service.handle_task_creation,
-            task_id=task_id,
-            swarmBountyId=swarmBountyId,
-            repo_url=repo_url,
-            db=db,  # Pass db instance
-        )
-        agent_result.add_done_callback(cleanup_callback)
-        return jsonify({"status": "Task is being processed"}), 200
+
+    # Jobs are persisted, so dedupe holds across restarts and processes
+    if not job_queue.enqueue(
+        swarmBountyId, task_id, repo_url, podcall_signature, request_id=request.id
+    ):
+        return jsonify({"status": "Task is already being processed"}), 200
+    return jsonify({"status": "Task is being processed"}), 200
 
 
 @bp.post("/consolidate-prs")
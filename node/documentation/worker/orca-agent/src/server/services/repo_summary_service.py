@@ -7,6 +7,8 @@ from prometheus_swarm.utils.logging import logger
 from dotenv import load_dotenv
 from src.workflows.repoSummarizer.prompts import PROMPTS
 from src.database.models import Submission
+from src.utils.budget import budget_scope
+from src.utils.tracing import trace_run
 
 load_dotenv()
 
@@ -24,9 +26,14 @@ def handle_task_creation(task_id, swarmBountyId, repo_url, db=None, podcall_sign
             repo_url=repo_url,
             podcall_signature=podcall_signature,
             task_id=task_id,
+            swarmBountyId=swarmBountyId,
         )
 
-        result = workflow.run()
+        with (
+            trace_run("repo_summarizer", swarmBountyId=swarmBountyId, task_id=task_id),
+            budget_scope("repo_summarizer"),
+        ):
+            result = workflow.run()
         if result.get("success"):
             # Convert swarmBountyId to integer
             submission = Submission(
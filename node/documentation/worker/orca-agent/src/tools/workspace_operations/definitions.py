@@ -0,0 +1,494 @@
+from src.tools.workspace_operations.implementations import (
+    read_file,
+    list_files,
+    list_directory_contents,
+    write_file,
+    delete_file,
+    create_readme_file_with_name,
+    resolve_conflict,
+    execute_command,
+    run_tests,
+    install_dependency,
+    create_directory,
+    copy_file,
+    move_file,
+    rename_file,
+    init_repository,
+    clone_repository,
+    checkout_branch,
+    commit_changes,
+    get_current_branch,
+    list_branches,
+    add_remote,
+    pull_remote,
+    can_access_repository,
+    check_for_conflicts,
+    get_conflict_info,
+    create_merge_commit,
+)
+
+DEFINITIONS = {
+    "read_file": {
+        "name": "read_file",
+        "description": "Read the contents of a file.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "Path to the file to read",
+                },
+            },
+            "required": ["file_path"],
+        },
+        "function": read_file,
+        "override": True,
+    },
+    "list_files": {
+        "name": "list_files",
+        "description": "List all files in a directory and its subdirectories.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "directory": {
+                    "type": "string",
+                    "description": "Directory to list files from",
+                },
+            },
+            "required": ["directory"],
+        },
+        "function": list_files,
+        "override": True,
+    },
+    "list_directory_contents": {
+        "name": "list_directory_contents",
+        "description": "List all files and directories in the current layer.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "directory": {
+                    "type": "string",
+                    "description": "Directory to list files from",
+                },
+            },
+            "required": ["directory"],
+        },
+        "function": list_directory_contents,
+        "override": True,
+    },
+    "write_file": {
+        "name": "write_file",
+        "description": "Write content to a file and commit the change.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "Path to the file to write",
+                },
+                "content": {
+                    "type": "string",
+                    "description": "Content to write to the file",
+                },
+                "commit_message": {
+                    "type": "string",
+                    "description": "Commit message describing the change",
+                },
+            },
+            "required": ["file_path", "content", "commit_message"],
+        },
+        "function": write_file,
+        "override": True,
+    },
+    "delete_file": {
+        "name": "delete_file",
+        "description": "Delete a file and commit the change.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "Path to the file to delete",
+                },
+                "commit_message": {
+                    "type": "string",
+                    "description": "Commit message describing the change",
+                },
+            },
+            "required": ["file_path", "commit_message"],
+        },
+        "function": delete_file,
+        "override": True,
+    },
+    "create_readme_file_with_name": {
+        "name": "create_readme_file_with_name",
+        "description": "Create a README file.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "title": {
+                    "type": "string",
+                    "description": "The title of the README file",
+                },
+            },
+            "required": ["title"],
+        },
+        "function": create_readme_file_with_name,
+        "final_tool": True,
+        "override": True,
+    },
+    "resolve_conflict": {
+        "name": "resolve_conflict",
+        "description": "Resolve a conflict in a specific file.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "Path to the file with conflicts",
+                },
+                "resolution": {
+                    "type": "string",
+                    "description": "Content to resolve the conflict with",
+                },
+            },
+            "required": ["file_path", "resolution"],
+        },
+        "function": resolve_conflict,
+        "override": True,
+    },
+    "execute_command": {
+        "name": "execute_command",
+        "description": "Execute a shell command in the repository",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "command": {
+                    "type": "string",
+                    "description": "The command to execute",
+                },
+            },
+            "required": ["command"],
+        },
+        "function": execute_command,
+        "override": True,
+    },
+    "run_tests": {
+        "name": "run_tests",
+        "description": "Run tests using a specified framework.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Path to test file or directory.",
+                },
+                "framework": {
+                    "type": "string",
+                    "description": "Test framework to use.",
+                    "enum": ["pytest", "jest", "vitest"],
+                },
+            },
+            "required": ["framework", "path"],
+        },
+        "function": run_tests,
+        "override": True,
+    },
+    "install_dependency": {
+        "name": "install_dependency",
+        "description": (
+            "Install a dependency using the specified package manager with "
+            "appropriate flags"
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "package_name": {
+                    "type": "string",
+                    "description": "Name of the package to install",
+                },
+                "package_manager": {
+                    "type": "string",
+                    "description": "Package manager to use",
+                    "enum": ["npm", "pip", "yarn", "pnpm"],
+                },
+                "is_dev_dependency": {
+                    "type": "boolean",
+                    "description": "Whether to install as a dev dependency (where applicable)",
+                    "default": False,
+                },
+                "version": {
+                    "type": "string",
+                    "description": "Specific version to install (optional)",
+                },
+            },
+            "required": ["package_name", "package_manager"],
+        },
+        "function": install_dependency,
+        "override": True,
+    },
+    "create_directory": {
+        "name": "create_directory",
+        "description": "Create a directory and any necessary parent directories.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Path to the directory to create",
+                },
+            },
+            "required": ["path"],
+        },
+        "function": create_directory,
+        "override": True,
+    },
+    "copy_file": {
+        "name": "copy_file",
+        "description": "Copy a file and commit the change.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "source": {"type": "string", "description": "Path to the source file"},
+                "destination": {
+                    "type": "string",
+                    "description": "Path to the destination file",
+                },
+                "commit_message": {
+                    "type": "string",
+                    "description": "Commit message describing the change",
+                },
+            },
+            "required": ["source", "destination", "commit_message"],
+        },
+        "function": copy_file,
+        "override": True,
+    },
+    "move_file": {
+        "name": "move_file",
+        "description": "Move a file and commit the change.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "source": {"type": "string", "description": "Path to the source file"},
+                "destination": {
+                    "type": "string",
+                    "description": "Path to the destination file",
+                },
+                "commit_message": {
+                    "type": "string",
+                    "description": "Commit message describing the change",
+                },
+            },
+            "required": ["source", "destination", "commit_message"],
+        },
+        "function": move_file,
+        "override": True,
+    },
+    "rename_file": {
+        "name": "rename_file",
+        "description": "Rename a file and commit the change.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "source": {"type": "string", "description": "Current file path"},
+                "destination": {
+                    "type": "string",
+                    "description": "New file path",
+                },
+                "commit_message": {
+                    "type": "string",
+                    "description": "Commit message describing the change",
+                },
+            },
+            "required": ["source", "destination", "commit_message"],
+        },
+        "function": rename_file,
+        "override": True,
+    },
+    "init_repository": {
+        "name": "init_repository",
+        "description": "Initialize a new Git repository with optional user configuration.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Path where to initialize the repository",
+                },
+                "user_name": {
+                    "type": "string",
+                    "description": "Git user name to configure",
+                },
+                "user_email": {
+                    "type": "string",
+                    "description": "Git user email to configure",
+                },
+            },
+            "required": ["path"],
+        },
+        "function": init_repository,
+        "override": True,
+    },
+    "clone_repository": {
+        "name": "clone_repository",
+        "description": "Clone a Git repository with proper path handling and cleanup.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "url": {
+                    "type": "string",
+                    "description": "URL of the repository to clone",
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Path where to clone the repository",
+                },
+                "user_name": {
+                    "type": "string",
+                    "description": "Git user name to configure",
+                },
+                "user_email": {
+                    "type": "string",
+                    "description": "Git user email to configure",
+                },
+            },
+            "required": ["url", "path"],
+        },
+        "function": clone_repository,
+        "override": True,
+    },
+    "checkout_branch": {
+        "name": "checkout_branch",
+        "description": "Check out an existing branch in the current repository.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "branch_name": {
+                    "type": "string",
+                    "description": "Name of the branch to checkout",
+                },
+            },
+            "required": ["branch_name"],
+        },
+        "function": checkout_branch,
+        "override": True,
+    },
+    "commit_and_push": {
+        "name": "commit_and_push",
+        "description": "Commit all changes and push to remote.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "message": {"type": "string", "description": "Commit message"},
+                "allow_empty": {
+                    "type": "boolean",
+                    "description": "Whether to allow creating an empty commit",
+                    "default": False,
+                },
+            },
+            "required": ["message"],
+        },
+        "function": commit_changes,
+        "override": True,
+    },
+    "get_current_branch": {
+        "name": "get_current_branch",
+        "description": "Get the current branch name in the working directory.",
+        "parameters": {
+            "type": "object",
+            "properties": {},
+        },
+        "function": get_current_branch,
+        "override": True,
+    },
+    "list_branches": {
+        "name": "list_branches",
+        "description": "List all branches in the current repository.",
+        "parameters": {
+            "type": "object",
+            "properties": {},
+        },
+        "function": list_branches,
+        "override": True,
+    },
+    "add_remote": {
+        "name": "add_remote",
+        "description": "Add a remote to the current repository.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string", "description": "Name of the remote"},
+                "url": {"type": "string", "description": "URL of the remote"},
+            },
+            "required": ["name", "url"],
+        },
+        "function": add_remote,
+        "override": True,
+    },
+    "pull_remote": {
+        "name": "pull_remote",
+        "description": "Pull changes from a remote branch.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "remote_name": {"type": "string", "description": "Name of the remote"},
+                "branch": {"type": "string", "description": "Branch to pull from"},
+            },
+        },
+        "function": pull_remote,
+        "override": True,
+    },
+    "can_access_repository": {
+        "name": "can_access_repository",
+        "description": "Check if a git repository is accessible.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "repo_url": {
+                    "type": "string",
+                    "description": "URL of the repository to check",
+                },
+            },
+            "required": ["repo_url"],
+        },
+        "function": can_access_repository,
+        "override": True,
+    },
+    "check_for_conflicts": {
+        "name": "check_for_conflicts",
+        "description": "Check for merge conflicts in the current repository.",
+        "parameters": {
+            "type": "object",
+            "properties": {},
+        },
+        "function": check_for_conflicts,
+        "override": True,
+    },
+    "get_conflict_info": {
+        "name": "get_conflict_info",
+        "description": "Get details about current conflicts from Git's index.",
+        "parameters": {
+            "type": "object",
+            "properties": {},
+        },
+        "function": get_conflict_info,
+        "override": True,
+    },
+    "create_merge_commit": {
+        "name": "create_merge_commit",
+        "description": "Create a merge commit after resolving conflicts.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "message": {
+                    "type": "string",
+                    "description": "Commit message for the merge",
+                },
+            },
+            "required": ["message"],
+        },
+        "function": create_merge_commit,
+        "override": True,
+    },
+}
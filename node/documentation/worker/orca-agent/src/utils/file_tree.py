@@ -0,0 +1,267 @@
+"""Incrementally maintained index of the files in a checkout.
+
+``prometheus_swarm.workflows.utils.get_current_files`` asks git for every
+tracked and untracked file each time it is called, and workflows call it in
+every setup and again before most phases. ``FileTreeIndex`` is seeded once per
+checkout from ``git ls-files`` into a trie of path components, so shared
+directory prefixes are stored once, and is then kept up to date instead of
+rebuilt:
+
+- the workspace ``write_file``/``delete_file`` tools report the paths they touch
+- ``sync`` picks up checkouts, merges and commits by diffing the worktree against
+  the commit seen at the previous sync. It is skipped entirely while the mtimes
+  of ``.git/index`` and ``.git/HEAD`` are unchanged.
+
+The sorted file list used for the ``current_files`` context is maintained
+alongside the trie, so producing it costs O(changes) rather than a tree walk.
+"""
+
+import bisect
+import os
+import subprocess
+import threading
+from prometheus_swarm.utils.logging import log_key_value, log_error
+from src.utils.partial_clone import get_workspace
+from src.utils.tracing import span
+
+# Checkout path -> FileTreeIndex
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _normalize(path: str) -> str:
+    path = os.path.normpath(path.strip().lstrip("/"))
+    return "" if path == "." else path
+
+
+def _excluded(path: str) -> bool:
+    parts = path.split("/")
+    return parts[0] == ".git" or "node_modules" in parts
+
+
+def walk_files(directory: str) -> list[str]:
+    """List files under a directory that is not a git checkout, relative to it."""
+    files = []
+    for current, dirnames, filenames in os.walk(directory):
+        dirnames[:] = [d for d in dirnames if d not in (".git", "node_modules")]
+        rel_root = os.path.relpath(current, directory)
+        for filename in filenames:
+            files.append(
+                filename if rel_root == "." else os.path.join(rel_root, filename)
+            )
+    return sorted(files)
+
+
+class FileTreeIndex:
+    """Files of one checkout, stored as a trie of path components."""
+
+    def __init__(self, repo_path: str):
+        self.repo_path = repo_path
+        self._root = {}
+        self._files = []
+        self._lock = threading.Lock()
+        self._git_dir = os.path.join(
+            repo_path, self._git(["rev-parse", "--git-dir"]).strip()
+        )
+
+        tracked = self._git(["ls-files", "-z"]).split("\0")
+        untracked = self._git(
+            ["ls-files", "-z", "--others", "--exclude-standard"]
+        ).split("\0")
+        for path in set(tracked) | set(untracked):
+            if path and not _excluded(path):
+                self._insert(path)
+        self._files = sorted(self._iter_files(self._root, ""))
+        self._base = self._head()
+        self._stamp = self._git_stamp()
+        log_key_value("Indexed files", len(self._files))
+
+    def _git(self, args: list[str]) -> str:
+        with span("git", command=args[0]):
+            result = subprocess.run(
+                ["git", *args], cwd=self.repo_path, capture_output=True, text=True
+            )
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+        return result.stdout
+
+    def _head(self) -> str:
+        try:
+            return self._git(["rev-parse", "--verify", "--quiet", "HEAD"]).strip()
+        except RuntimeError:
+            # Repository without commits yet
+            return None
+
+    def _git_stamp(self) -> tuple:
+        stamp = []
+        for name in ("index", "HEAD"):
+            try:
+                stamp.append(os.stat(os.path.join(self._git_dir, name)).st_mtime_ns)
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _iter_files(self, node: dict, prefix: str):
+        for name, child in node.items():
+            path = f"{prefix}{name}"
+            if child is None:
+                yield path
+            else:
+                yield from self._iter_files(child, f"{path}/")
+
+    def _insert(self, path: str) -> bool:
+        """Add a file to the trie; returns False if it was already present."""
+        *dirs, name = path.split("/")
+        node = self._root
+        for depth, part in enumerate(dirs):
+            child = node.get(part)
+            if child is None:
+                # A file being replaced by a directory of the same name
+                if part in node:
+                    self._drop_rendered("/".join(dirs[: depth + 1]))
+                child = node[part] = {}
+            node = child
+        if name in node and node[name] is None:
+            return False
+        if isinstance(node.get(name), dict):
+            for removed in self._iter_files(node[name], f"{path}/"):
+                self._drop_rendered(removed)
+        node[name] = None
+        return True
+
+    def _delete(self, path: str) -> list[str]:
+        """Remove a file, or every file under a directory; returns removed paths."""
+        *dirs, name = path.split("/")
+        trail = []
+        node = self._root
+        for part in dirs:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                return []
+            trail.append((node, part))
+            node = child
+        if name not in node:
+            return []
+        child = node.pop(name)
+        if child is None:
+            removed = [path]
+        else:
+            removed = list(self._iter_files(child, f"{path}/"))
+        # Prune directories left empty
+        for parent, part in reversed(trail):
+            if parent[part]:
+                break
+            del parent[part]
+        return removed
+
+    def _drop_rendered(self, path: str) -> None:
+        i = bisect.bisect_left(self._files, path)
+        if i < len(self._files) and self._files[i] == path:
+            del self._files[i]
+
+    def _reconcile(self, path: str) -> None:
+        """Make the entry for ``path`` match what is on disk."""
+        full_path = os.path.join(self.repo_path, path)
+        if os.path.isfile(full_path) or os.path.islink(full_path):
+            if self._insert(path):
+                bisect.insort(self._files, path)
+        else:
+            for removed in self._delete(path):
+                self._drop_rendered(removed)
+
+    def refresh(self, paths: list[str]) -> None:
+        """Update the index for paths a tool has just written or deleted."""
+        with self._lock:
+            for path in paths:
+                path = _normalize(path)
+                if path and not _excluded(path):
+                    self._reconcile(path)
+
+    def sync(self) -> None:
+        """Apply changes made by git operations since the last sync."""
+        with self._lock:
+            stamp = self._git_stamp()
+            if stamp == self._stamp:
+                return
+            head = self._head()
+            changed = set()
+            if self._base:
+                output = self._git(
+                    ["diff", "--name-only", "-z", "--no-renames", self._base]
+                )
+                changed.update(output.split("\0"))
+            elif head:
+                changed.update(self._git(["ls-files", "-z"]).split("\0"))
+            for path in changed:
+                if path and not _excluded(path):
+                    self._reconcile(path)
+            self._base = head
+            self._stamp = stamp
+
+    def files(self) -> list[str]:
+        """Sorted repository-relative file paths. Do not modify the returned list."""
+        return self._files
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+
+def get_index(path: str = None, create: bool = True) -> FileTreeIndex:
+    """Return the index of the checkout containing ``path`` (default: cwd)."""
+    path = os.path.realpath(path or os.getcwd())
+    with _indexes_lock:
+        for root, index in _indexes.items():
+            if path == root or path.startswith(root + os.sep):
+                return index
+        if not create:
+            return None
+        toplevel = subprocess.run(
+            ["git", "rev-parse", "--show-toplevel"],
+            cwd=path,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        index = FileTreeIndex(toplevel)
+        _indexes[os.path.realpath(toplevel)] = index
+        return index
+
+
+def release_index(repo_path: str) -> None:
+    """Drop the index of a checkout that is being removed."""
+    if repo_path:
+        with _indexes_lock:
+            _indexes.pop(os.path.realpath(repo_path), None)
+
+
+def refresh_paths(paths: list[str], cwd: str = None) -> None:
+    """Report files changed under ``cwd`` to its checkout's index, if it has one."""
+    cwd = os.path.realpath(cwd or os.getcwd())
+    index = get_index(cwd, create=False)
+    if index:
+        root = os.path.realpath(index.repo_path)
+        index.refresh(
+            [
+                os.path.relpath(os.path.join(cwd, _normalize(path)), root)
+                for path in paths
+            ]
+        )
+
+
+def get_current_files(repo_path: str = None) -> list[str]:
+    """List a checkout's files from its index, syncing git changes first.
+
+    The returned list is the index's own sorted list and must not be modified.
+    Partial checkouts are listed from their git tree instead. Falls back to
+    walking the directory if it cannot be indexed.
+    """
+    workspace = get_workspace(repo_path)
+    if workspace:
+        return workspace.list_files()
+    try:
+        index = get_index(repo_path)
+        index.sync()
+        return index.files()
+    except Exception as e:
+        log_error(e, "File index unavailable, listing files directly")
+        return walk_files(repo_path or os.getcwd())
@@ -0,0 +1,303 @@
+"""Lightweight tracing of workflow runs.
+
+A run (``trace_run``) is a tree of timed spans: workflow setup, each phase,
+repository setup and cleanup, indexing, agent queries, git commands, shell
+commands and outbound HTTP calls. Spans are appended as JSON lines to
+``TRACE_FILE`` using OpenTelemetry's span field names, and when a run ends
+its slowest span names are summarized in the log. Once the file reaches
+``TRACE_MAX_BYTES`` it is rolled over to ``TRACE_FILE.1``, keeping
+``TRACE_BACKUPS`` older files.
+
+The current span and the run attributes (``swarmBountyId``, ``task_id``,
+``request_id``) live in context variables. Work handed to another thread
+keeps them only if it is submitted through ``bind``.
+
+``instrument`` patches the code we do not own (``WorkflowPhase.execute``,
+GitPython, ``requests`` and ``httpx``) and is safe to call more than once.
+Spans are only recorded inside a run; outside one they cost nothing.
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+from prometheus_swarm.utils.logging import log_section, log_key_value, log_error
+from src.utils import metrics
+
+ENABLED = os.getenv("TRACE_ENABLED", "true").lower() != "false"
+TRACE_FILE = os.getenv(
+    "TRACE_FILE",
+    os.path.join(os.path.dirname(os.getenv("DATABASE_PATH", "")) or ".", "traces.jsonl"),
+)
+TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(100 * 1024 * 1024)))
+TRACE_BACKUPS = int(os.getenv("TRACE_BACKUPS", "3"))
+SUMMARY_SIZE = 10
+
+_current_span = contextvars.ContextVar("trace_span", default=None)
+_current_run = contextvars.ContextVar("trace_run", default=None)
+_attributes = contextvars.ContextVar("trace_attributes", default={})
+
+_export_lock = threading.Lock()
+_instrumented = False
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    def __init__(self, name: str, trace_id: str, parent_id: str, attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = "OK"
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self._started = time.perf_counter()
+        self.duration = 0.0
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def end(self) -> None:
+        self.duration = time.perf_counter() - self._started
+        self.end_ns = self.start_ns + int(self.duration * 1e9)
+
+    def to_dict(self) -> dict:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "status": self.status,
+        }
+
+
+class _Run:
+    """Per-run totals used for the summary."""
+
+    def __init__(self, name: str, trace_id: str):
+        self.name = name
+        self.trace_id = trace_id
+        self.totals = {}  # span name -> [count, seconds]
+        self._lock = threading.Lock()
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            total = self.totals.setdefault(span.name, [0, 0.0])
+            total[0] += 1
+            total[1] += span.duration
+
+
+def _rotate() -> None:
+    """Move ``TRACE_FILE`` to ``.1`` and each older file up one, dropping the oldest."""
+    for index in range(TRACE_BACKUPS - 1, 0, -1):
+        if os.path.exists(f"{TRACE_FILE}.{index}"):
+            os.replace(f"{TRACE_FILE}.{index}", f"{TRACE_FILE}.{index + 1}")
+    if TRACE_BACKUPS > 0:
+        os.replace(TRACE_FILE, f"{TRACE_FILE}.1")
+    else:
+        os.remove(TRACE_FILE)
+
+
+def _export(span: Span) -> None:
+    try:
+        line = json.dumps(span.to_dict(), default=str)
+        with _export_lock:
+            with open(TRACE_FILE, "a") as f:
+                f.write(line + "\n")
+                size = f.tell()
+            if TRACE_MAX_BYTES and size >= TRACE_MAX_BYTES:
+                _rotate()
+    except Exception as e:
+        log_error(e, "Failed to export trace span", logToServer=False)
+
+
+def set_trace_attributes(**attributes) -> None:
+    """Attach attributes (e.g. ``request_id``) to every later span in this context."""
+    _attributes.set({**_attributes.get(), **attributes})
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes):
+    """Time the enclosed block as a span of the current run, if any."""
+    parent = _current_span.get()
+    run = _current_run.get()
+    if not ENABLED or run is None:
+        yield None
+        return
+    current = Span(
+        name,
+        run.trace_id,
+        parent.span_id if parent else None,
+        {**_attributes.get(), **attributes},
+    )
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "ERROR"
+        # Only the type: messages can contain tokenized clone URLs
+        current.set_attribute("error", type(e).__name__)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+        _export(current)
+        run.record(current)
+
+
+def traced(name: str) -> Callable:
+    """Decorator form of ``span``."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextlib.contextmanager
+def trace_run(name: str, **attributes):
+    """Trace a whole workflow run and log where its time went.
+
+    The run is also counted in the ``workflows_in_flight`` and
+    ``workflow_duration_seconds`` metrics, with or without tracing.
+    """
+    metrics.WORKFLOWS_IN_FLIGHT.labels(name).inc()
+    started = time.perf_counter()
+    status = "error"
+    try:
+        if not ENABLED:
+            yield None
+        else:
+            with _run_span(name, attributes) as root:
+                yield root
+        status = "ok"
+    finally:
+        metrics.WORKFLOWS_IN_FLIGHT.labels(name).dec()
+        metrics.WORKFLOW_DURATION.labels(name, status).observe(
+            time.perf_counter() - started
+        )
+
+
+@contextlib.contextmanager
+def _run_span(name: str, attributes: dict):
+    attributes_token = _attributes.set({**_attributes.get(), **attributes})
+    run = _Run(name, uuid.uuid4().hex)
+    run_token = _current_run.set(run)
+    try:
+        with span(name) as root:
+            yield root
+    finally:
+        _current_run.reset(run_token)
+        _attributes.reset(attributes_token)
+        _log_summary(run, root)
+
+
+def _log_summary(run: _Run, root: Span) -> None:
+    log_section(f"TRACE SUMMARY: {run.name}")
+    log_key_value("Trace", run.trace_id)
+    log_key_value("Total", f"{root.duration:.1f}s ({root.status})")
+    slowest = sorted(
+        ((name, total) for name, total in run.totals.items() if name != run.name),
+        key=lambda item: item[1][1],
+        reverse=True,
+    )
+    for name, (count, seconds) in slowest[:SUMMARY_SIZE]:
+        log_key_value(name, f"{seconds:.1f}s in {count} span(s)")
+
+
+def bind(func: Callable) -> Callable:
+    """Wrap ``func`` to run in a copy of the current context (for executors)."""
+    return functools.partial(contextvars.copy_context().run, func)
+
+
+def _url_attributes(url) -> dict:
+    parts = urlsplit(str(url))
+    # Never record credentials or query strings
+    return {"host": parts.hostname, "path": parts.path}
+
+
+def instrument() -> None:
+    """Add spans to third-party code used by the workflows."""
+    global _instrumented
+    if _instrumented or not ENABLED:
+        return
+    _instrumented = True
+
+    from prometheus_swarm.workflows.base import WorkflowPhase
+
+    execute = WorkflowPhase.execute
+
+    @functools.wraps(execute)
+    def traced_execute(self, *args, **kwargs):
+        with span(
+            f"phase {type(self).__name__}",
+            prompt=getattr(self, "prompt_name", None),
+        ):
+            return execute(self, *args, **kwargs)
+
+    WorkflowPhase.execute = traced_execute
+
+    from git.cmd import Git
+
+    git_execute = Git.execute
+
+    @functools.wraps(git_execute)
+    def traced_git_execute(self, command, *args, **kwargs):
+        subcommand = None
+        if isinstance(command, (list, tuple)) and len(command) > 1:
+            subcommand = command[1]
+        with span("git", command=subcommand):
+            return git_execute(self, command, *args, **kwargs)
+
+    Git.execute = traced_git_execute
+
+    import requests
+
+    request = requests.Session.request
+
+    @functools.wraps(request)
+    def traced_request(self, method, url, *args, **kwargs):
+        with span("http", method=method, **_url_attributes(url)) as current:
+            response = request(self, method, url, *args, **kwargs)
+            if current:
+                current.set_attribute("status_code", response.status_code)
+            return response
+
+    requests.Session.request = traced_request
+
+    try:
+        import httpx
+    except ImportError:
+        return
+
+    send = httpx.Client.send
+
+    @functools.wraps(send)
+    def traced_send(self, request, *args, **kwargs):
+        with span("http", method=request.method, **_url_attributes(request.url)) as current:
+            response = send(self, request, *args, **kwargs)
+            if current:
+                current.set_attribute("status_code", response.status_code)
+            return response
+
+    httpx.Client.send = traced_send
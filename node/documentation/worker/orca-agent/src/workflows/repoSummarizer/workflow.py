@@ -2,19 +2,19 @@
 
 import os
 from github import Github
-import requests
 from prometheus_swarm.workflows.base import Workflow
 from prometheus_swarm.utils.logging import log_section, log_key_value, log_error
 from src.workflows.repoSummarizer import phases
 from prometheus_swarm.workflows.utils import (
     check_required_env_vars,
-    cleanup_repository,
     validate_github_auth,
-    setup_repository,
 )
+from src.utils.repo_cache import setup_repository, cleanup_repository
+from src.utils.task_callbacks import callbacks
 from kno_sdk import index_repo
 from prometheus_swarm.tools.kno_sdk_wrapper.implementations import build_tools_wrapper
-from prometheus_swarm.tools.git_operations.implementations import commit_and_push
+from src.tools.workspace_operations import register_workspace_tools
+from src.tools.workspace_operations.implementations import commit_and_push
 from src.workflows.repoSummarizer.prompts import PROMPTS
 from src.workflows.repoSummarizer.docs_sections import (
     DOCS_SECTIONS,
@@ -22,6 +22,7 @@ from src.workflows.repoSummarizer.docs_sections import (
     FINAL_SECTIONS,
 )
 from pathlib import Path
+from src.utils.tracing import span, traced
 
 
 class Task:
@@ -58,6 +59,7 @@ class RepoSummarizerWorkflow(Workflow):
         podcall_signature=None,
         task_id=None,
         tools=None,
+        swarmBountyId=None,
     ):
         # Extract owner and repo name from URL
         # URL format: https://github.com/owner/repo
@@ -76,28 +78,24 @@ class RepoSummarizerWorkflow(Workflow):
         )
         self.phasesData = phasesData
         self.tools = tools
+        self.swarmBountyId = swarmBountyId
+        register_workspace_tools(client)
         self._phase_data_setup()
 
     def submit_draft_pr(self, pr_url):
-        """Submit the draft PR."""
-        try:
-            response = requests.post(
-                f"http://host.docker.internal:30017/task/{self.task_id}/add-todo-draft-pr",
-                json={
+        """Submit the draft PR; delivery is retried in the background."""
+        callbacks.submit_pr(
+            self.task_id,
+            self.swarmBountyId,
+            {
                 "prUrl": pr_url,
                 "signature": self.podcall_signature,
                 "swarmBountyId": self.swarmBountyId,
                 "success": True,
                 "message": "",
-                },
-            )
-        except Exception as e:
-            log_error(e, "Failed to submit draft PR")
-            return {
-                "success": False,
-                "message": "Failed to submit draft PR",
-                "data": None,
-            }
+            },
+            draft=True,
+        )
 
     def _token_check(self):
         check_required_env_vars(["GITHUB_TOKEN", "GITHUB_USERNAME"])
@@ -133,8 +131,6 @@ class RepoSummarizerWorkflow(Workflow):
         self.context["fork_owner"] = setup_result["data"]["fork_owner"]
         self.context["fork_name"] = setup_result["data"]["fork_name"]
 
-        # Enter repo directory
-        os.chdir(self.context["repo_path"])
         tools_build_result = self.build_tools_setup()
         if not tools_build_result:
             log_error(Exception("Failed to build tools setup"), "Failed to build tools setup")
@@ -153,22 +149,20 @@ class RepoSummarizerWorkflow(Workflow):
         self.create_pull_request_phase = phases.CreatePullRequestPhase(workflow=self, tools=self.phasesData[1]["tools"])
         self.consolidated_phase = phases.ConsolidatedPhase(workflow=self, tools=self.phasesData[2]["tools"])
 
+    @traced("workflow.setup")
     def setup(self):
         self._token_check()
         self._repository_setup()
         self._phase_data_setup()
 
     def build_tools_setup(self):
-        index = index_repo(Path(self.context["repo_path"]))
+        with span("kno.index_repo"):
+            index = index_repo(Path(self.context["repo_path"]))
         tools = build_tools_wrapper(index)
         return tools
 
     def cleanup(self):
         """Cleanup workspace."""
-        # Make sure we're not in the repo directory before cleaning up
-        if os.getcwd() == self.context.get("repo_path", ""):
-            os.chdir(self.original_dir)
-
         # Clean up the repository directory
         cleanup_repository(self.original_dir, self.context.get("repo_path", ""))
 
@@ -187,7 +181,9 @@ class RepoSummarizerWorkflow(Workflow):
 
         try:
             log_section("#2 Commit and Push")
-            commit_and_push(message="empty commit", allow_empty=True)
+            commit_and_push(
+                self.context["repo_path"], message="empty commit", allow_empty=True
+            )
             log_section("#3 Create Draft Pull Request")
             draft_pr_result = self.create_pull_request()
             if draft_pr_result.get("success"):
@@ -1,6 +1,7 @@
 """Task decomposition workflow implementation."""
 
 import os
+import subprocess
 from github import Github
 from prometheus_swarm.workflows.base import Workflow
 from prometheus_swarm.utils.logging import log_section, log_key_value, log_error
@@ -8,10 +9,12 @@ from src.workflows.repoSummarizerAudit import phases
 from prometheus_swarm.workflows.utils import (
     check_required_env_vars,
     validate_github_auth,
-    setup_repository,
-    cleanup_repository,
-    get_current_files,
 )
+from src.utils.repo_cache import setup_repository, cleanup_repository
+from src.utils.file_tree import get_current_files
+from src.utils.partial_clone import get_workspace
+from src.tools.workspace_operations import register_workspace_tools
+from src.utils.tracing import span, traced
 
 
 class Task:
@@ -58,12 +61,14 @@ class repoSummarizerAuditWorkflow(Workflow):
             repo_name=repo_name,
             pr_number=pr_number,
         )
+        register_workspace_tools(client)
         self.context["pr_number"] = pr_number
         self.context["pr_url"] = pr_url
         self.context["repo_owner"] = repo_owner
         self.context["repo_name"] = repo_name
         self.context["repo_full_name"] = f"{repo_owner}/{repo_name}"
 
+    @traced("workflow.setup")
     def setup(self):
         """Set up repository and workspace."""
         # Check required environment variables and validate GitHub auth
@@ -77,6 +82,7 @@ class repoSummarizerAuditWorkflow(Workflow):
             self.context["repo_url"],
             github_token=os.getenv("GITHUB_TOKEN"),
             github_username=os.getenv("GITHUB_USERNAME"),
+            read_only=True,
         )
         if not setup_result["success"]:
             raise Exception(f"Failed to set up repository: {setup_result['message']}")
@@ -87,28 +93,36 @@ class repoSummarizerAuditWorkflow(Workflow):
         self.context["fork_owner"] = setup_result["data"]["fork_owner"]
         self.context["fork_name"] = setup_result["data"]["fork_name"]
         self.context["github_token"] = os.getenv("GITHUB_TOKEN")
-        # Enter repo directory
-        os.chdir(self.context["repo_path"])
         gh = Github(self.context["github_token"])
         repo = gh.get_repo(f"{self.context['repo_owner']}/{self.context['repo_name']}")
         pr = repo.get_pull(self.context["pr_number"])
         self.context["pr"] = pr
         # Add remote for PR's repository and fetch the branch
-        os.system(
-            f"git remote add pr_source https://github.com/{pr.head.repo.full_name}"
+        repo_path = self.context["repo_path"]
+        subprocess.run(
+            [
+                "git",
+                "remote",
+                "add",
+                "pr_source",
+                f"https://github.com/{pr.head.repo.full_name}",
+            ],
+            cwd=repo_path,
         )
-        os.system(f"git fetch pr_source {pr.head.ref}")
-        os.system("git checkout FETCH_HEAD")
+        workspace = get_workspace(repo_path)
+        if workspace:
+            # Switch to the PR head without downloading its files
+            workspace.fetch_revision("pr_source", pr.head.ref)
+        else:
+            with span("git", command="fetch"):
+                subprocess.run(["git", "fetch", "pr_source", pr.head.ref], cwd=repo_path)
+            subprocess.run(["git", "checkout", "FETCH_HEAD"], cwd=repo_path)
 
         # Get current files for context
-        self.context["current_files"] = get_current_files()
+        self.context["current_files"] = get_current_files(self.context["repo_path"])
 
     def cleanup(self):
         """Cleanup workspace."""
-        # Make sure we're not in the repo directory before cleaning up
-        if os.getcwd() == self.context.get("repo_path", ""):
-            os.chdir(self.original_dir)
-
         # Clean up the repository directory
         cleanup_repository(self.original_dir, self.context.get("repo_path", ""))
         # Clean up the MongoDB
@@ -0,0 +1,96 @@
+"""Benchmark: log throughput of one commit per record vs. the buffered sink.
+
+Writes the same records to a scratch SQLite database twice, first with the
+old ``save_log`` body (``db.add(log); db.commit()`` per record), then through
+``src/server/models/Log.py``, and reports records per second for each.
+
+Run from the agent directory:
+
+    python tests/benchmark_save_log.py [--records 5000]
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+AGENT_DIR = Path(__file__).resolve().parents[1]
+
+
+def _load_log_module():
+    # Loaded by path: importing src.server would start the whole app
+    spec = importlib.util.spec_from_file_location(
+        "log_model", AGENT_DIR / "src" / "server" / "models" / "Log.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _save_log_per_commit(session, log_class, **fields) -> None:
+    """The previous save_log: one INSERT and one COMMIT per record."""
+    session.add(log_class(timestamp=datetime.now(timezone.utc), **fields))
+    session.commit()
+
+
+def _record(index: int) -> dict:
+    return {
+        "level": "DEBUG" if index % 4 else "INFO",
+        "message": f"tool call {index} finished",
+        "module": "benchmark",
+        "function": "run",
+        "line_no": index,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        os.environ["DATABASE_PATH"] = os.path.join(scratch, "bench.db")
+        from prometheus_swarm.database import Log, get_db, initialize_database
+        from sqlalchemy import func, select
+
+        initialize_database()
+        log_module = _load_log_module()
+        session = get_db()
+
+        def count() -> int:
+            return session.execute(select(func.count()).select_from(Log)).scalar()
+
+        started = time.perf_counter()
+        for index in range(args.records):
+            _save_log_per_commit(session, Log, **_record(index))
+        before = time.perf_counter() - started
+
+        sink = log_module.LogSink(queue_size=max(args.records, 1))
+        started = time.perf_counter()
+        for index in range(args.records):
+            sink.put({"timestamp": datetime.now(timezone.utc), **_record(index)})
+        enqueued = time.perf_counter() - started
+        sink.close()
+        after = time.perf_counter() - started
+
+        assert count() == 2 * args.records, "not every record was written"
+        session.close()
+
+    print(f"records:                 {args.records}")
+    print(f"commit per record:       {before:.2f}s ({args.records / before:,.0f}/s)")
+    print(
+        f"buffered sink (written): {after:.2f}s ({args.records / after:,.0f}/s), "
+        f"{before / after:.1f}x faster"
+    )
+    print(
+        f"buffered sink (caller):  {enqueued:.3f}s "
+        f"({args.records / enqueued:,.0f}/s) spent in save_log itself"
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
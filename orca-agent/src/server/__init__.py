@@ -9,6 +9,8 @@ from prometheus_swarm.database import initialize_database
 from colorama import Fore, Style
 import uuid
 import os
+from src.utils import budget, metrics
+from src.utils.tracing import instrument, set_trace_attributes
 
 
 def create_app():
@@ -19,15 +21,11 @@ def create_app():
     @app.before_request
     def before_request():
         request.id = str(uuid.uuid4())
-        # Store request start time for duration calculation
-        request.start_time = request.environ.get("REQUEST_TIME", 0)
+        set_trace_attributes(request_id=request.id)
 
     @app.after_request
     def after_request(response):
-        # Calculate request duration
-        duration = (
-            request.environ.get("REQUEST_TIME", 0) - request.start_time
-        ) * 1000
+        duration = metrics.request_duration_ms()
 
         # Get error message if this is an error response
         error_msg = ""
@@ -48,11 +46,14 @@ def create_app():
         log_value(
             f"[{color}REQ{Style.RESET_ALL}] {request.method} {request.path} "
             f"{color}{response.status_code}{Style.RESET_ALL} "
-            f"{error_msg} {duration}ms"
+            f"{error_msg} {duration:.0f}ms"
         )
 
         return response
 
+    # Request latency histograms and GET /metrics
+    metrics.init_app(app)
+
     # Register blueprints
     app.register_blueprint(healthz.bp)
     app.register_blueprint(repo_classify.bp)
@@ -64,6 +65,11 @@ def create_app():
         configure_logging()
         # Initialize database
         initialize_database()
+        # Time workflow phases, git commands and HTTP calls
+        instrument()
+        metrics.instrument()
+        # Phase and LLM call budgets of runs started with budget_scope
+        budget.instrument()
         # Disable Flask's default logging
         app.logger.disabled = True
 
@@ -1,7 +1,31 @@
-"""Database model for logging."""
+"""Database model for logging.
 
-from datetime import datetime
-from prometheus_swarm.database import get_db
+``save_log`` does not write to the database itself. Records go to a bounded
+in-memory queue and a background thread bulk-inserts them, one transaction
+per ``LOG_BATCH_SIZE`` records or every ``LOG_FLUSH_INTERVAL_MS``
+milliseconds, whichever comes first. When the queue is full, the oldest
+record of the least severe level goes first: DEBUG is dropped before INFO,
+INFO before WARNING, and so on. ERROR and CRITICAL records are only dropped
+when the queue holds nothing less severe. Whatever is still queued is
+flushed when the process exits.
+"""
+
+import atexit
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from sqlalchemy import insert
+from prometheus_swarm.database import get_session
+
+QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "500"))
+FLUSH_INTERVAL_MS = int(os.getenv("LOG_FLUSH_INTERVAL_MS", "200"))
+SHUTDOWN_TIMEOUT = 5.0
 
 
 def init_logs_table():
@@ -10,6 +34,144 @@ def init_logs_table():
     pass
 
 
+def _severity(level: str) -> int:
+    severity = logging.getLevelName(str(level).upper())
+    return severity if isinstance(severity, int) else logging.INFO
+
+
+class LogSink:
+    """Bounded queue of log records written to the database in batches."""
+
+    def __init__(
+        self,
+        queue_size: int = QUEUE_SIZE,
+        batch_size: int = BATCH_SIZE,
+        flush_interval_ms: int = FLUSH_INTERVAL_MS,
+    ):
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        # Severity -> records in arrival order, so the least severe are evicted first
+        self._queues = {}
+        self._size = 0
+        self._sequence = 0
+        self._condition = threading.Condition()
+        self._writer = None
+        self._closed = False
+        self.dropped = {}  # level name -> records dropped by backpressure
+        self.written = 0
+
+    def put(self, record: dict) -> bool:
+        """Queue a record; returns False if it was dropped."""
+        severity = _severity(record["level"])
+        with self._condition:
+            if self._closed:
+                return False
+            if self._size >= self.queue_size and not self._evict(severity):
+                self._count_drop(severity)
+                return False
+            self._sequence += 1
+            self._queues.setdefault(severity, deque()).append((self._sequence, record))
+            self._size += 1
+            if self._size >= self.batch_size:
+                self._condition.notify()
+        self._start()
+        return True
+
+    def flush(self) -> None:
+        """Write everything queued so far."""
+        while self._write_batch(self._take()):
+            pass
+
+    def close(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Stop accepting records, then flush what is queued."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._writer:
+            self._writer.join(timeout)
+        self.flush()
+
+    def _evict(self, severity: int) -> bool:
+        """Make room by dropping the oldest record less severe than ``severity``.
+
+        Records at ERROR or above may also evict the oldest record of their own
+        level, so the newest errors are kept.
+        """
+        for level in sorted(self._queues):
+            if level > severity or (level == severity and severity < logging.ERROR):
+                break
+            queue = self._queues[level]
+            if queue:
+                queue.popleft()
+                self._size -= 1
+                self._count_drop(level)
+                return True
+        return False
+
+    def _count_drop(self, severity: int) -> None:
+        name = logging.getLevelName(severity)
+        self.dropped[name] = self.dropped.get(name, 0) + 1
+
+    def _start(self) -> None:
+        if self._writer and self._writer.is_alive():
+            return
+        with self._condition:
+            if self._closed or (self._writer and self._writer.is_alive()):
+                return
+            self._writer = threading.Thread(
+                target=self._write_loop, name="log-writer", daemon=True
+            )
+            self._writer.start()
+
+    def _take(self) -> list[dict]:
+        """Remove up to ``batch_size`` of the oldest records from the queue."""
+        with self._condition:
+            if not self._size:
+                return []
+            # Each queue is already in arrival order
+            merged = list(
+                itertools.islice(heapq.merge(*self._queues.values()), self.batch_size)
+            )
+            last = merged[-1][0]
+            for queue in self._queues.values():
+                while queue and queue[0][0] <= last:
+                    queue.popleft()
+            self._size -= len(merged)
+            return [record for _, record in merged]
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self.flush_interval
+                while self._size < self.batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                closed = self._closed
+            self._write_batch(self._take())
+            if closed:
+                return
+
+    def _write_batch(self, records: list[dict]) -> bool:
+        if not records:
+            return False
+        try:
+            from prometheus_swarm.database import Log
+
+            with get_session() as session:
+                session.execute(insert(Log), records)
+            self.written += len(records)
+        except Exception as e:
+            print(f"Failed to save {len(records)} logs to database: {e}")  # Fallback logging
+        return True
+
+
+_sink = LogSink()
+atexit.register(_sink.close)
+
+
 def save_log(
     level: str,
     message: str,
@@ -23,7 +185,7 @@ def save_log(
     additional_data: str = None,
 ) -> bool:
     """
-    Save a log entry to the database.
+    Queue a log entry for the database.
 
     Args:
         level: Log level (ERROR, WARNING, INFO, etc)
@@ -38,28 +200,25 @@ def save_log(
         additional_data: Any additional JSON-serializable data
 
     Returns:
-        bool: True if log was saved successfully
+        bool: True if the log was queued, False if backpressure dropped it
     """
-    try:
-        db = get_db()
-        from prometheus_swarm.database import Log
-
-        log = Log(
-            timestamp=datetime.utcnow(),
-            level=level,
-            message=message,
-            module=module,
-            function=function,
-            path=path,
-            line_no=line_no,
-            exception=exception,
-            stack_trace=stack_trace,
-            request_id=request_id,
-            additional_data=additional_data,
-        )
-        db.add(log)
-        db.commit()
-        return True
-    except Exception as e:
-        print(f"Failed to save log to database: {e}")  # Fallback logging
-        return False
+    return _sink.put(
+        {
+            "timestamp": datetime.now(timezone.utc),
+            "level": level,
+            "message": message,
+            "module": module,
+            "function": function,
+            "path": path,
+            "line_no": line_no,
+            "exception": exception,
+            "stack_trace": stack_trace,
+            "request_id": request_id,
+            "additional_data": additional_data,
+        }
+    )
+
+
+def flush_logs() -> None:
+    """Write all queued log entries now."""
+    _sink.flush()
@@ -6,6 +6,8 @@ from src.workflows.repoSummarizerAudit.workflow import repoSummarizerAuditWorkfl
 from src.workflows.repoSummarizerAudit.prompts import (
     PROMPTS as REPO_SUMMARIZER_AUDIT_PROMPTS,
 )
+from src.utils.budget import budget_scope
+from src.utils.tracing import trace_run
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +35,11 @@ def audit_repo(pr_url):
         )
 
         # Run workflow and get result
-        result = repo_summerizer_audit_workflow.run()
+        with (
+            trace_run("repo_summarizer_audit", pr_url=pr_url),
+            budget_scope("repo_summarizer_audit"),
+        ):
+            result = repo_summerizer_audit_workflow.run()
         recommendation = result["data"]["recommendation"]
         return recommendation
     except Exception as e:
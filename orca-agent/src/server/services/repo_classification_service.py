@@ -6,6 +6,8 @@ from src.workflows.repoClassifier.workflow import RepoClassifierWorkflow
 from prometheus_swarm.utils.logging import logger
 from dotenv import load_dotenv
 from src.workflows.repoClassifier.prompts import PROMPTS
+from src.utils.budget import budget_scope
+from src.utils.tracing import trace_run
 
 load_dotenv()
 
@@ -20,7 +22,11 @@ def handle_task_creation(repo_url):
             prompts=PROMPTS,
             repo_url=repo_url,
         )
-        result = workflow.run()
+        with (
+            trace_run("repo_classifier", repo_url=repo_url),
+            budget_scope("repo_classifier"),
+        ):
+            result = workflow.run()
         if result.get("success"):
             return result
         else:
@@ -0,0 +1,13 @@
+"""Tool that classifies a repository's type, language and test framework in one call."""
+
+import os
+from src.tools.repo_classification.implementations import classify_repository_all
+
+REPO_CLASSIFICATION_TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def register_classification_tools(client) -> None:
+    """Add ``classify_repository_all`` to the client's tools."""
+    if client.tools.get("classify_repository_all", {}).get("function") is classify_repository_all:
+        return
+    client.register_tools(REPO_CLASSIFICATION_TOOLS_DIR)
@@ -0,0 +1,37 @@
+from prometheus_swarm.tools.repo_operations.Types import (
+    RepoType,
+    Language,
+    TestFramework,
+)
+from src.tools.repo_classification.implementations import classify_repository_all
+
+DEFINITIONS = {
+    "classify_repository_all": {
+        "name": "classify_repository_all",
+        "description": "Classify a repository's type, primary language and test framework",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "repo_type": {
+                    "type": "string",
+                    "description": f"The repository type, must be one of: {', '.join(RepoType.to_string_list())}",
+                    "enum": RepoType.to_string_list(),
+                },
+                "language": {
+                    "type": "string",
+                    "description": f"The primary language, must be one of: {', '.join(Language.to_string_list())}",
+                    "enum": Language.to_string_list(),
+                },
+                "test_framework": {
+                    "type": "string",
+                    "description": f"The test framework, must be one of: {', '.join(TestFramework.to_string_list())}",
+                    "enum": TestFramework.to_string_list(),
+                },
+            },
+            "required": ["repo_type", "language", "test_framework"],
+            "additionalProperties": False,
+        },
+        "final_tool": True,
+        "function": classify_repository_all,
+    },
+}
@@ -0,0 +1,70 @@
+"""Combined repository classification.
+
+``classify_repository_all`` reports the repository type, language and test
+framework of the ``classify_repository``, ``classify_language`` and
+``classify_test_framework`` tools in one structured result, so a single
+conversation explores the repository for all three. A field the model omits
+or gets wrong is left out of the result; the workflow classifies those
+fields with their own phase.
+"""
+
+from typing import Any, Dict, Optional
+from prometheus_swarm.tools.repo_operations.Types import (
+    RepoType,
+    Language,
+    TestFramework,
+)
+
+CLASSIFICATION_TYPES = {
+    "repo_type": RepoType,
+    "language": Language,
+    "test_framework": TestFramework,
+}
+
+
+def classify_repository_all(
+    repo_type: Optional[str] = None,
+    language: Optional[str] = None,
+    test_framework: Optional[str] = None,
+    **kwargs,
+) -> Dict[str, Any]:
+    """Classify a repository's type, language and test framework together.
+
+    Args:
+        repo_type: The repository type (one of the RepoType enum values)
+        language: The language (one of the Language enum values)
+        test_framework: The test framework (one of the TestFramework enum values)
+
+    Returns:
+        A dictionary with the tool execution result; ``data`` holds the valid
+        fields and ``missing`` lists the ones that were omitted or invalid
+    """
+    values = {
+        "repo_type": repo_type,
+        "language": language,
+        "test_framework": test_framework,
+    }
+    data = {}
+    problems = []
+    for field, value in values.items():
+        valid_values = CLASSIFICATION_TYPES[field].to_string_list()
+        if value is None:
+            problems.append(f"{field} missing")
+        elif value not in valid_values:
+            problems.append(f"invalid {field}: {value}")
+        else:
+            data[field] = value
+
+    if not data:
+        return {
+            "success": False,
+            "message": f"Failed to classify repository: {', '.join(problems)}",
+            "data": None,
+        }
+    message = "Classified repository: " + ", ".join(
+        f"{field}={value}" for field, value in data.items()
+    )
+    if problems:
+        message += f" ({', '.join(problems)})"
+    data["missing"] = [field for field in values if field not in data]
+    return {"success": True, "message": message, "data": data}
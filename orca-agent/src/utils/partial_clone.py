@@ -0,0 +1,241 @@
+"""Read-only partial checkouts that download file contents on demand.
+
+Workflows that only inspect a repository (classification, audits, planning)
+read a handful of files, yet a normal clone downloads every blob including LFS
+pointers and vendored assets. A partial checkout is a ``git clone
+--filter=blob:none --no-checkout``: only commits and trees are transferred, the
+file list is read from the tree objects, and a file's contents are fetched and
+checked out the first time a tool reads it. Missing blobs for one request are
+fetched from the promisor remote in a single batched round trip.
+
+Workflows that opt in call ``register_workspace_tools`` from
+``src.tools.workspace_operations`` so that ``read_file``, ``list_files`` and
+``list_directory_contents`` look up the partial checkout for the repository and
+fall back to the regular prometheus_swarm tools otherwise.
+"""
+
+import os
+import subprocess
+import threading
+from git import Repo
+from prometheus_swarm.utils.logging import log_key_value, log_error
+from src.utils.tracing import span
+
+# Paths passed to a single git invocation, to stay well below ARG_MAX
+_BATCH_SIZE = 500
+
+# Checkout path -> PartialWorkspace
+_workspaces = {}
+_workspaces_lock = threading.Lock()
+
+
+def _git(args: list[str], cwd: str, input: str = None, secret: str = None) -> str:
+    """Run a git command in ``cwd`` and return its stdout, hiding ``secret`` in errors."""
+    with span("git", command=args[0]):
+        result = subprocess.run(
+            ["git", *args], cwd=cwd, input=input, capture_output=True, text=True
+        )
+    if result.returncode != 0:
+        message = result.stderr.strip()
+        if secret:
+            message = message.replace(secret, "***")
+        raise RuntimeError(f"git {args[0]} failed: {message}")
+    return result.stdout
+
+
+def _normalize(path: str) -> str:
+    path = os.path.normpath(path.strip().lstrip("/"))
+    return "" if path == "." else path
+
+
+class PartialWorkspace:
+    """Working tree of a blobless clone whose files are checked out on first read."""
+
+    def __init__(self, repo_path: str, remote: str = "origin", secret: str = None):
+        self.repo_path = repo_path
+        self.remote = remote
+        self.secret = secret
+        self.rev = _git(["rev-parse", "HEAD"], repo_path).strip()
+        self._tree = None
+        self._materialized = set()
+        self._fetched = set()
+        self._lock = threading.Lock()
+
+    def _load_tree(self) -> dict:
+        """Return ``{path: blob_sha}`` for the current revision, read from git objects."""
+        if self._tree is None:
+            output = _git(["ls-tree", "-r", "-z", self.rev], self.repo_path)
+            tree = {}
+            for entry in output.split("\0"):
+                if not entry:
+                    continue
+                meta, path = entry.split("\t", 1)
+                _, object_type, sha = meta.split()
+                # Submodules (commit entries) have no contents to read
+                if object_type == "blob":
+                    tree[path] = sha
+            self._tree = tree
+        return self._tree
+
+    def fetch_revision(self, remote: str, ref: str) -> None:
+        """Fetch ``ref`` from ``remote`` without blobs and switch the workspace to it."""
+        _git(["config", f"remote.{remote}.promisor", "true"], self.repo_path)
+        _git(
+            ["config", f"remote.{remote}.partialclonefilter", "blob:none"],
+            self.repo_path,
+        )
+        _git(
+            ["fetch", "--quiet", "--filter=blob:none", remote, ref],
+            self.repo_path,
+            secret=self.secret,
+        )
+        self.set_revision("FETCH_HEAD", remote=remote)
+
+    def set_revision(self, rev: str, remote: str = None) -> None:
+        """Point the workspace at another commit; files are re-read on next access."""
+        with self._lock:
+            self.rev = _git(
+                ["rev-parse", f"{rev}^{{commit}}"], self.repo_path
+            ).strip()
+            if remote:
+                self.remote = remote
+            self._tree = None
+            self._materialized = set()
+
+    def list_files(self, directory: str = ".") -> list[str]:
+        """List files under ``directory``, relative to it, without fetching any blobs."""
+        prefix = _normalize(directory)
+        with self._lock:
+            paths = self._load_tree()
+        files = []
+        for path in paths:
+            if "node_modules" in path.split("/"):
+                continue
+            if not prefix:
+                files.append(path)
+            elif path.startswith(prefix + "/"):
+                files.append(path[len(prefix) + 1 :])
+        return sorted(files)
+
+    def list_directory(self, directory: str = ".") -> tuple[list[str], list[str]]:
+        """Return the immediate ``(files, directories)`` of ``directory``."""
+        files, directories = set(), set()
+        for path in self.list_files(directory):
+            head, _, rest = path.partition("/")
+            if rest:
+                directories.add(head)
+            else:
+                files.add(head)
+        return sorted(files), sorted(directories)
+
+    def is_materialized(self, path: str) -> bool:
+        return _normalize(path) in self._materialized
+
+    def materialize(self, paths: list[str]) -> list[str]:
+        """Fetch and check out the given files if they are not on disk yet.
+
+        All missing blobs are requested from the promisor remote in one fetch,
+        rather than one lazy fetch per object, before the files are written.
+        Paths that are not in the tree are ignored so the caller's normal "file
+        not found" handling still applies.
+
+        Returns:
+            list[str]: The paths that were newly checked out
+        """
+        with self._lock:
+            tree = self._load_tree()
+            missing = []
+            for path in paths:
+                path = _normalize(path)
+                if path in tree and path not in self._materialized:
+                    missing.append(path)
+            missing = list(dict.fromkeys(missing))
+            if not missing:
+                return []
+
+            # A blobless clone starts with no blobs, so anything not fetched yet is missing
+            to_fetch = list(
+                dict.fromkeys(
+                    tree[path] for path in missing if tree[path] not in self._fetched
+                )
+            )
+            if to_fetch:
+                _git(
+                    [
+                        "-c",
+                        "fetch.negotiationAlgorithm=noop",
+                        "fetch",
+                        "--quiet",
+                        "--no-tags",
+                        "--no-write-fetch-head",
+                        "--recurse-submodules=no",
+                        "--filter=blob:none",
+                        "--stdin",
+                        self.remote,
+                    ],
+                    self.repo_path,
+                    input="\n".join(to_fetch) + "\n",
+                    secret=self.secret,
+                )
+                self._fetched.update(to_fetch)
+
+            for start in range(0, len(missing), _BATCH_SIZE):
+                batch = missing[start : start + _BATCH_SIZE]
+                _git(["checkout", "--quiet", self.rev, "--", *batch], self.repo_path)
+            self._materialized.update(missing)
+            log_key_value(
+                "Materialized files", f"{len(missing)} ({len(to_fetch)} blobs fetched)"
+            )
+            return missing
+
+    def bytes_transferred(self) -> int:
+        """Size of the object database, i.e. everything downloaded so far."""
+        stats = {}
+        for line in _git(["count-objects", "-v"], self.repo_path).splitlines():
+            key, _, value = line.partition(":")
+            stats[key.strip()] = value.strip()
+        kib = int(stats.get("size", 0)) + int(stats.get("size-pack", 0))
+        return kib * 1024
+
+
+def clone_partial(
+    auth_url: str, repo_path: str, branch: str = None, secret: str = None
+) -> Repo:
+    """Make a blobless, no-checkout clone and register it as a partial workspace."""
+    clone_args = ["clone", "--filter=blob:none", "--no-checkout", "--quiet"]
+    if branch:
+        clone_args += ["--branch", branch]
+    _git([*clone_args, auth_url, repo_path], cwd=None, secret=secret)
+    with _workspaces_lock:
+        _workspaces[os.path.realpath(repo_path)] = PartialWorkspace(
+            repo_path, secret=secret
+        )
+    return Repo(repo_path)
+
+
+def get_workspace(path: str = None) -> PartialWorkspace:
+    """Return the partial workspace containing ``path`` (default: cwd), if any."""
+    path = os.path.realpath(path or os.getcwd())
+    with _workspaces_lock:
+        for root, workspace in _workspaces.items():
+            if path == root or path.startswith(root + os.sep):
+                return workspace
+    return None
+
+
+def release_workspace(repo_path: str) -> None:
+    """Forget a partial workspace and report how much it downloaded."""
+    if not repo_path:
+        return
+    with _workspaces_lock:
+        workspace = _workspaces.pop(os.path.realpath(repo_path), None)
+    if workspace is None:
+        return
+    try:
+        transferred = workspace.bytes_transferred()
+        log_key_value(
+            "Bytes transferred", f"{transferred} ({transferred / 1024**2:.1f} MiB)"
+        )
+    except Exception as e:
+        log_error(e, "Failed to measure partial clone size")
+
@@ -2,16 +2,34 @@
 
 import os
 import contextlib
+from concurrent.futures import ThreadPoolExecutor
 from github import Github
 from prometheus_swarm.workflows.base import Workflow
 from prometheus_swarm.utils.logging import log_key_value, log_error
 from src.workflows.repoClassifier import phases
 from prometheus_swarm.workflows.utils import (
     check_required_env_vars,
-    cleanup_repository,
     validate_github_auth,
-    setup_repository
 )
+from src.utils.repo_cache import setup_repository, cleanup_repository
+from src.tools.repo_classification import register_classification_tools
+from src.tools.workspace_operations import register_workspace_tools
+from src.utils.tracing import bind, traced
+
+# Classify type, language and test framework in one phase before the per-field phases
+COMBINED_CLASSIFICATION = os.getenv("REPO_CLASSIFY_COMBINED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+MAX_RETRIES = 3
+
+# Field of the repository metadata -> phase that classifies only that field
+CLASSIFICATION_PHASES = {
+    "repo_type": phases.RepoClassificationPhase,
+    "language": phases.LanguageClassificationPhase,
+    "test_framework": phases.TestFrameworkClassificationPhase,
+}
 
 
 class Task:
@@ -58,6 +76,8 @@ class RepoClassifierWorkflow(Workflow):
             repo_owner=repo_owner,
             repo_name=repo_name,
         )
+        register_workspace_tools(client)
+        register_classification_tools(client)
         self._cleanup_required = False
 
     @contextlib.contextmanager
@@ -74,6 +94,7 @@ class RepoClassifierWorkflow(Workflow):
             if self._cleanup_required:
                 self.cleanup()
 
+    @traced("workflow.setup")
     def setup(self):
         try:
             """Set up repository and workspace."""
@@ -98,7 +119,7 @@ class RepoClassifierWorkflow(Workflow):
                 
 
             # Set up repository directory
-            setup_result = setup_repository(self.context["repo_url"], github_token=os.getenv("GITHUB_TOKEN"), github_username=os.getenv("GITHUB_USERNAME"))
+            setup_result = setup_repository(self.context["repo_url"], github_token=os.getenv("GITHUB_TOKEN"), github_username=os.getenv("GITHUB_USERNAME"), read_only=True)
             if not setup_result["success"]:
                 raise Exception(f"Failed to set up repository: {setup_result['message']}")
             self.context["github_token"] = os.getenv("GITHUB_TOKEN")
@@ -107,9 +128,6 @@ class RepoClassifierWorkflow(Workflow):
             self.context["fork_url"] = setup_result["data"]["fork_url"]
             self.context["fork_owner"] = setup_result["data"]["fork_owner"]
             self.context["fork_name"] = setup_result["data"]["fork_name"]
-
-            # Enter repo directory
-            os.chdir(self.context["repo_path"])
         except Exception as e:
             log_error(e, "Error during setup")
             raise
@@ -121,10 +139,6 @@ class RepoClassifierWorkflow(Workflow):
     def cleanup(self):
         """Cleanup workspace."""
         try:
-            # Make sure we're not in the repo directory before cleaning up
-            if os.getcwd() == self.context.get("repo_path", ""):
-                os.chdir(self.original_dir)
-            
             log_key_value("Cleaning up repository", self.context.get("repo_path", ""))
             
             # Clean up the repository directory
@@ -149,60 +163,81 @@ class RepoClassifierWorkflow(Workflow):
 
     def run(self):
         with self.managed_workflow():
-            repoMetadata = {}
-            max_retries = 3
-            
-            # Helper function to extract pure string from classification result
-            def extract_value(result, key):
-                if result.get("success") and result.get("data", {}).get(key):
-                    return result["data"][key]
-                return None
-            
-            # Helper function to retry classification
-            def retry_classification(phase_class, retries=max_retries):
-                for attempt in range(retries):
-                    try:
-                        result = phase_class(self).execute()
-                        if result.get("success"):
-                            return result
-                        if attempt < retries - 1:
-                            log_error(f"Attempt {attempt + 1} failed, retrying...")
-                    except Exception as e:
-                        log_error(e, f"Error during classification attempt {attempt + 1}")
-                        if attempt == retries - 1:
-                            raise
-                return result
-            
             try:
-                # Get repository type with retry
-                repo_type_result = retry_classification(phases.RepoClassificationPhase)
-                repoMetadata["repo_type"] = extract_value(repo_type_result, "repo_type")
-                
-                # Get language with retry
-                language_result = retry_classification(phases.LanguageClassificationPhase)
-                repoMetadata["language"] = extract_value(language_result, "language")
-                
-                # Get test framework with retry
-                test_framework_result = retry_classification(phases.TestFrameworkClassificationPhase)
-                repoMetadata["test_framework"] = extract_value(test_framework_result, "test_framework")
-                
+                repoMetadata = dict.fromkeys(CLASSIFICATION_PHASES)
+                if COMBINED_CLASSIFICATION:
+                    # One attempt: the per-field phases below are its retry
+                    try:
+                        combined_result = self._classify(
+                            phases.CombinedClassificationPhase, retries=1
+                        )
+                    except Exception:
+                        combined_result = None
+                    for field in repoMetadata:
+                        repoMetadata[field] = self._extract_value(combined_result, field)
+
+                missing = [field for field, value in repoMetadata.items() if not value]
+                if missing:
+                    repoMetadata.update(self._classify_fields(missing))
+
                 # Check if all classifications were successful
-                success = all([
-                    repoMetadata["repo_type"],
-                    repoMetadata["language"],
-                    repoMetadata["test_framework"]
-                ])
-                
+                success = all(repoMetadata.values())
+
                 log_key_value("Repository metadata", repoMetadata)
-                
+
                 return {
                     "success": success,
                     "message": "Repository classification complete" if success else "Repository classification failed",
                     "data": repoMetadata,
                 }
-                
+
             except Exception as e:
                 log_error(e, "Error during repository classification")
                 raise
-    
-    
\ No newline at end of file
+
+    @staticmethod
+    def _extract_value(result, key):
+        """Pure string of one field of a classification result, or None."""
+        if result and result.get("success"):
+            return (result.get("data") or {}).get(key) or None
+        return None
+
+    def _classify(self, phase_class, retries=MAX_RETRIES):
+        """Run a classification phase until it succeeds or ``retries`` attempts are used."""
+        result = None
+        for attempt in range(retries):
+            try:
+                result = phase_class(self).execute()
+                if result and result.get("success"):
+                    return result
+                if attempt < retries - 1:
+                    log_key_value(phase_class.__name__, f"Attempt {attempt + 1} failed, retrying...")
+            except Exception as e:
+                log_error(e, f"Error during classification attempt {attempt + 1}")
+                if attempt == retries - 1:
+                    raise
+        return result
+
+    def _classify_fields(self, fields):
+        """Classify each field with its own phase, all at the same time.
+
+        The phases only read the workflow, so they share it; each runs its own
+        conversation with the client.
+        """
+        log_key_value("Classifying separately", fields)
+        if len(fields) == 1:
+            results = [self._classify(CLASSIFICATION_PHASES[fields[0]])]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=len(fields), thread_name_prefix="repo-classify"
+            ) as pool:
+                # bind per phase: each thread gets its own copy of the trace context
+                futures = [
+                    pool.submit(bind(self._classify), CLASSIFICATION_PHASES[field])
+                    for field in fields
+                ]
+                results = [future.result() for future in futures]
+        return {
+            field: self._extract_value(result, field)
+            for field, result in zip(fields, results)
+        }
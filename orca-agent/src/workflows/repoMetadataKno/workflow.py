@@ -9,14 +9,14 @@ from prometheus_swarm.utils.logging import log_key_value, log_error
 # from src.workflows.repoClassifier import phases
 from prometheus_swarm.workflows.utils import (
     check_required_env_vars,
-    cleanup_repository,
     validate_github_auth,
-    setup_repository
 )
+from src.utils.repo_cache import setup_repository, cleanup_repository
 from .linguist import Linguist
 from kno_sdk import index_repo, load_index, agent_query
 from dotenv import load_dotenv
 from pathlib import Path
+from src.utils.tracing import span, traced
 
 load_dotenv()
 
@@ -81,6 +81,7 @@ class RepoMetadataKnoWorkflow(Workflow):
                 exit(1)
                 # self.cleanup()
 
+    @traced("workflow.setup")
     def setup(self):
         try:
             """Set up repository and workspace."""
@@ -114,9 +115,6 @@ class RepoMetadataKnoWorkflow(Workflow):
             self.context["fork_url"] = setup_result["data"]["fork_url"]
             self.context["fork_owner"] = setup_result["data"]["fork_owner"]
             self.context["fork_name"] = setup_result["data"]["fork_name"]
-
-            # Enter repo directory
-            os.chdir(self.context["repo_path"])
         except Exception as e:
             log_error(e, "Error during setup")
             raise
@@ -128,10 +126,6 @@ class RepoMetadataKnoWorkflow(Workflow):
     def cleanup(self):
         """Cleanup workspace."""
         try:
-            # Make sure we're not in the repo directory before cleaning up
-            if os.getcwd() == self.context.get("repo_path", ""):
-                os.chdir(self.original_dir)
-            
             log_key_value("Cleaning up repository", self.context.get("repo_path", ""))
             
             # Clean up the repository directory
@@ -159,7 +153,8 @@ class RepoMetadataKnoWorkflow(Workflow):
             linguist = Linguist()
             languages = linguist.analyze_project(self.context["repo_path"])
          
-            index = index_repo(Path(self.context["repo_path"]))
+            with span("kno.index_repo"):
+                index = index_repo(Path(self.context["repo_path"]))
             system_prompt = """
             You are a senior code-analysis agent working on the repository below.
 
@@ -238,13 +233,14 @@ class RepoMetadataKnoWorkflow(Workflow):
 
             index = load_index(Path(self.context["repo_path"]))
             print("loaded index", index)
-            resp = agent_query(
-                repo_index=index,
-                llm_system_prompt=system_prompt,
-                prompt=prompt,
-                MODEL_API_KEY=os.environ.get("ANTHROPIC_API_KEY"),
-                output_format=format
-            )
+            with span("kno.agent_query"):
+                resp = agent_query(
+                    repo_index=index,
+                    llm_system_prompt=system_prompt,
+                    prompt=prompt,
+                    MODEL_API_KEY=os.environ.get("ANTHROPIC_API_KEY"),
+                    output_format=format
+                )
             print(resp)
             # Response contains ```json```, we need to extract the json from it
             resp = resp.split("```json")[1].split("```")[0]
@@ -12,6 +12,9 @@ from colorama import Fore, Style
 import uuid
 import os
 from src.server.logging_setup import setup_remote_logging
+from src.server.mongo_connection import ensure_indexes
+from src.utils import budget, metrics
+from src.utils.tracing import instrument, set_trace_attributes
 
 
 def create_app():
@@ -22,13 +25,11 @@ def create_app():
     @app.before_request
     def before_request():
         request.id = str(uuid.uuid4())
-        # Store request start time for duration calculation
-        request.start_time = request.environ.get("REQUEST_TIME", 0)
+        set_trace_attributes(request_id=request.id)
 
     @app.after_request
     def after_request(response):
-        # Calculate request duration
-        duration = (request.environ.get("REQUEST_TIME", 0) - request.start_time) * 1000
+        duration = metrics.request_duration_ms()
 
         # Get error message if this is an error response
         error_msg = ""
@@ -45,11 +46,14 @@ def create_app():
         color = Fore.GREEN if response.status_code < 400 else Fore.RED
         log_value(
             f"[{color}REQ{Style.RESET_ALL}] {request.method} {request.path} "
-            f"{color}{response.status_code}{Style.RESET_ALL} {error_msg} {duration}ms"
+            f"{color}{response.status_code}{Style.RESET_ALL} {error_msg} {duration:.0f}ms"
         )
 
         return response
 
+    # Request latency histograms and GET /metrics
+    metrics.init_app(app)
+
     # Configure logging within app context
     with app.app_context():
         # Set up logging (includes both console and database logging)
@@ -66,6 +70,14 @@ def create_app():
 
         # Initialize database
         initialize_database()
+        # Indexes the planner's Mongo queries rely on
+        if os.getenv("MONGODB_URI"):
+            ensure_indexes()
+        # Time workflow phases, git commands and HTTP calls
+        instrument()
+        metrics.instrument()
+        # Phase and LLM call budgets of runs started with budget_scope
+        budget.instrument()
         # Disable Flask's default logging
         app.logger.disabled = True
 
@@ -1,9 +1,9 @@
 """Remote logging setup for planner-agent."""
 
 import os
-import requests
 from typing import Any, Dict
 from prometheus_swarm.utils.logging import set_conversation_hook, swarm_bounty_id_var
+from src.utils.message_shipper import get_shipper
 import uuid
 
 def setup_remote_logging():
@@ -15,6 +15,9 @@ def setup_remote_logging():
         print("MIDDLE_SERVER_URL env not set, Skipping remote logging")
         return
 
+    shipper = get_shipper(remote_url)
+    github_username = os.getenv("GITHUB_USERNAME")
+
     def conversation_hook(
         conversation_id: str,
         role: str,
@@ -23,7 +26,7 @@ def setup_remote_logging():
         context: Dict[str, Any],
         todoUUID: str,
     ):
-        """Send conversation messages to remote server."""
+        """Queue conversation messages for the remote server."""
         # Only log assistant messages
         if role != "assistant":
             return
@@ -68,16 +71,12 @@ def setup_remote_logging():
                 if context.get("prUrl"):
                     data["prUrl"] = context["prUrl"]
 
-                response = requests.post(
-                    f"{remote_url}/api/builder/record-builder-message",
-                    json=data,
-                    timeout=5,  # 5 second timeout
-                )
-                response.raise_for_status()
+                # Delivered in batches by a background thread, off the LLM loop
+                shipper.put(data)
 
         except Exception as e:
             # Print but don't raise - we don't want to interrupt the main process
-            print(f"Failed to send conversation to remote server: {e}")
+            print(f"Failed to queue conversation for remote server: {e}")
 
     # Register the hook
     set_conversation_hook(conversation_hook)
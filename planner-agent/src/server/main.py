@@ -13,12 +13,20 @@ from .models import delete_a_spec_from_mongodb
 # from src.workflows.audit.workflow import AuditWorkflow
 # from src.workflows.audit.prompts import PROMPTS as AUDIT_PROMPTS
 from .slack import send_message_to_slack
+from src.utils import metrics, plan_cache
+from src.utils.budget import BudgetExceeded, budget_scope
+from src.utils.tracing import bind, trace_run
 # import requests
 
 load_dotenv()
 
 app = create_app()
-executor = ThreadPoolExecutor(max_workers=2)
+PLAN_POOL_SIZE = 2
+executor = ThreadPoolExecutor(max_workers=PLAN_POOL_SIZE)
+# Runs of one /create-plan request; each retry resumes from the last checkpoint
+PLAN_RUN_ATTEMPTS = int(os.getenv("PLAN_RUN_ATTEMPTS", "2"))
+# Backlog and busy workers are counted by the wrappers each job is submitted in
+metrics.track_executor("create-plan", PLAN_POOL_SIZE)
 
 
 def audit_issues_and_tasks(future):
@@ -65,16 +73,36 @@ def create_todos(source_url: str, fork_url: str, issue_spec: dict, bounty_id: st
         # Set the bounty ID in the worker thread's context
         swarm_bounty_id_var.set(bounty_id)
 
-        workflow = TodoCreatorWorkflow(
-            client=setup_client("anthropic"),
-            prompts=PROMPTS,
-            source_url=source_url,
-            fork_url=fork_url,
-            issue_spec=issue_spec,
-            bounty_id=bounty_id,
-            bounty_type=SwarmBountyType.BUILD_FEATURE,
-        )
-        result = workflow.run()
+        result = None
+        # One budget for all attempts: a retry does not get a fresh deadline or tokens
+        with budget_scope("todo_creator") as budget:
+            for attempt in range(1, PLAN_RUN_ATTEMPTS + 1):
+                workflow = TodoCreatorWorkflow(
+                    client=setup_client("anthropic"),
+                    prompts=PROMPTS,
+                    source_url=source_url,
+                    fork_url=fork_url,
+                    issue_spec=issue_spec,
+                    bounty_id=bounty_id,
+                    bounty_type=SwarmBountyType.BUILD_FEATURE,
+                )
+                budget_used = None
+                try:
+                    with trace_run("todo_creator", swarmBountyId=bounty_id):
+                        result = workflow.run()
+                except BudgetExceeded as e:
+                    budget_used = str(e)
+                    result = {"success": False, "error": budget_used}
+                except Exception as e:
+                    log_error(e, f"Planner run {attempt} of {PLAN_RUN_ATTEMPTS} failed")
+                    result = {"success": False, "error": str(e)}
+                if result and result.get("success"):
+                    break
+                budget_used = budget_used or budget.exceeded()
+                if budget_used:
+                    log_error(Exception(budget_used), "Planner run out of budget, not retrying")
+                    break
+                # The next run resumes from the checkpoint this one left behind
         if not result or not result.get("success"):
             # Simply add retry because it may cause the initifinite loop issue
             # delete_a_spec_from_mongodb(bounty_id)
@@ -117,8 +145,13 @@ def create_plan():
             return jsonify({"error": "Missing data"}), 401
 
         # Submit task to background executor
+        # bind keeps the request's trace attributes in the worker thread
         future = executor.submit(
-            create_todos,
+            bind(
+                metrics.count_queued(
+                    "create-plan", metrics.count_busy("create-plan", create_todos)
+                )
+            ),
             source_url=data["sourceUrl"],
             fork_url=data["forkUrl"],
             issue_spec=data["issueSpec"],
@@ -136,6 +169,20 @@ def create_plan():
         return jsonify({"error": str(e)}), 500
 
 
+@app.post("/plan-cache/invalidate")
+def invalidate_plan_cache():
+    """Drop cached plans of a repository (or of all of an owner's repositories)."""
+    try:
+        data = request.get_json() or {}
+        if not data.get("repoOwner"):
+            return jsonify({"error": "Missing data"}), 401
+        deleted = plan_cache.invalidate(data["repoOwner"], data.get("repoName"))
+        return jsonify({"success": True, "data": {"deleted": deleted}}), 200
+    except Exception as e:
+        logger.error(f"Plan cache invalidation failed: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8080))
     
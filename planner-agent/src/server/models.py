@@ -3,12 +3,10 @@ from typing import List, Optional, Dict
 import uuid
 from datetime import datetime
 from pymongo.errors import ConnectionFailure, PyMongoError
-from .mongo_connection import MongoConnection
+from .mongo_connection import collection
 from enum import Enum
 
-mongo_conn = MongoConnection()
-db = mongo_conn.get_database("builder247")
-sp_collection = db["specs"]
+sp_collection = collection("specs")
 
 
 
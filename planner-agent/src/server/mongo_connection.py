@@ -1,16 +1,200 @@
-from pymongo import MongoClient
-from dotenv import load_dotenv
+"""Process-wide MongoDB client.
+
+Every module shares one ``MongoClient``, created on first use rather than at
+import, so importing a workflow opens no sockets or monitor threads. The pool
+is sized and timed out through ``MONGODB_*`` environment variables.
+
+A ``MongoClient`` must not be used across ``fork()``: the child of a pre-fork
+server (gunicorn) gets a fresh client the first time it touches the database.
+
+Module-level collection handles are ``collection("name")`` proxies, which look
+up the current client on each use.
+
+``ensure_indexes`` creates the indexes in ``INDEXES`` at startup and checks
+that they exist. ``upsert_by_uuid`` is the write path for generated issues and todos: one
+unordered ``bulk_write`` per ``MONGODB_BULK_CHUNK_SIZE`` documents, keyed on
+``uuid`` so a retried plan never inserts a document twice.
+"""
+
 import os
+import threading
+from dotenv import load_dotenv
+from typing import Iterable
+from pymongo import ASCENDING, MongoClient, UpdateOne
+from pymongo.errors import ConnectionFailure, PyMongoError
+from prometheus_swarm.utils.logging import log_key_value, log_error
 
 load_dotenv()
 
+DATABASE_NAME = "builder247"
+BULK_CHUNK_SIZE = int(os.getenv("MONGODB_BULK_CHUNK_SIZE", "1000"))
+
+# collection -> (keys, options) of every index the planner's queries rely on
+INDEXES = {
+    "todos": [
+        ([("uuid", ASCENDING)], {"unique": True}),
+        ([("bountyId", ASCENDING), ("status", ASCENDING)], {}),
+        ([("issueUuid", ASCENDING)], {}),
+        # One query dispatches a whole wave of an issue
+        ([("issueUuid", ASCENDING), ("wave", ASCENDING), ("status", ASCENDING)], {}),
+    ],
+    "issues": [
+        ([("uuid", ASCENDING)], {"unique": True}),
+        ([("bountyId", ASCENDING)], {}),
+    ],
+    "specs": [([("swarmBountyId", ASCENDING)], {})],
+    "systemprompts": [([("bountyId", ASCENDING)], {})],
+    "prompttemplates": [
+        ([("templateId", ASCENDING), ("version", ASCENDING)], {"unique": True}),
+    ],
+    "plancheckpoints": [
+        ([("bountyId", ASCENDING)], {"unique": True}),
+        # Checkpoints of runs that were never resumed expire
+        (
+            [("updatedAt", ASCENDING)],
+            {"expireAfterSeconds": int(os.getenv("PLAN_CHECKPOINT_TTL_SECONDS", "604800"))},
+        ),
+    ],
+    "plancache": [
+        ([("key", ASCENDING)], {"unique": True}),
+        ([("repoOwner", ASCENDING), ("repoName", ASCENDING)], {}),
+        # Cached plans expire on their own
+        (
+            [("createdAt", ASCENDING)],
+            {"expireAfterSeconds": int(os.getenv("PLAN_CACHE_TTL_SECONDS", "86400"))},
+        ),
+    ],
+}
+
+_client = None
+_client_pid = None
+_lock = threading.Lock()
+
+
+def _client_options() -> dict:
+    return {
+        "maxPoolSize": int(os.getenv("MONGODB_MAX_POOL_SIZE", "20")),
+        "minPoolSize": int(os.getenv("MONGODB_MIN_POOL_SIZE", "0")),
+        "maxIdleTimeMS": int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "300000")),
+        "connectTimeoutMS": int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "5000")),
+        "serverSelectionTimeoutMS": int(
+            os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "10000")
+        ),
+        "socketTimeoutMS": int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "30000")),
+        # Only compressors the server also supports are used
+        "compressors": os.getenv("MONGODB_COMPRESSORS", "zlib"),
+    }
+
+
+def get_client() -> MongoClient:
+    """Return the shared client, creating it in this process on first use."""
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+    with _lock:
+        if _client is None or _client_pid != pid:
+            # An inherited client is dropped, not closed: its sockets belong to the parent
+            _client = MongoClient(os.getenv("MONGODB_URI"), **_client_options())
+            _client_pid = pid
+        return _client
+
+
+def close_client() -> None:
+    """Close the shared client; the next use opens a new one."""
+    global _client
+    with _lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+
+
+def _reset_after_fork() -> None:
+    global _client, _lock
+    _client = None
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_database(db_name: str = DATABASE_NAME):
+    return get_client()[db_name]
+
+
+class _LazyCollection:
+    """Collection handle that resolves against the shared client when used."""
+
+    def __init__(self, name: str, db_name: str):
+        self.name = name
+        self.db_name = db_name
+
+    def __getattr__(self, attr):
+        return getattr(get_client()[self.db_name][self.name], attr)
+
+    def __repr__(self):
+        return f"collection({self.name!r}, {self.db_name!r})"
+
+
+def collection(name: str, db_name: str = DATABASE_NAME) -> _LazyCollection:
+    """Module-level handle for a collection that opens no connection at import."""
+    return _LazyCollection(name, db_name)
+
+
+
+def ensure_indexes(db_name: str = DATABASE_NAME) -> bool:
+    """Create any missing ``INDEXES``; return True if all of them exist afterwards.
+
+    Creating an index that already exists is a no-op. Failures (an unreachable
+    server, duplicates blocking a unique index) are logged, not raised.
+    """
+    database = get_database(db_name)
+    complete = True
+    try:
+        for name, indexes in INDEXES.items():
+            for keys, options in indexes:
+                try:
+                    database[name].create_index(keys, **options)
+                except ConnectionFailure:
+                    raise
+                except PyMongoError as e:
+                    # One bad index (e.g. existing duplicates) must not block the rest
+                    log_error(e, f"Failed to create index {keys} on {name}", logToServer=False)
+            existing = {
+                tuple(info["key"]) for info in database[name].index_information().values()
+            }
+            missing = [keys for keys, _ in indexes if tuple(keys) not in existing]
+            if missing:
+                complete = False
+                log_key_value(f"Missing indexes on {name}", missing)
+    except PyMongoError as e:
+        log_error(e, "Failed to verify MongoDB indexes", logToServer=False)
+        return False
+    return complete
 
-class MongoConnection:
-    def __init__(self, mongo_uri: str = os.getenv("MONGODB_URI")):
-        self.client = MongoClient(mongo_uri)
 
-    def get_database(self, db_name: str):
-        return self.client[db_name]
+def upsert_by_uuid(
+    target,
+    documents: Iterable[dict],
+    session=None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> int:
+    """Insert documents whose ``uuid`` is not stored yet; return how many were new.
 
-    def close(self):
-        self.client.close()
+    Documents already stored are left untouched (``$setOnInsert``), so a retry
+    neither duplicates them nor resets fields changed since, such as ``status``.
+    Raises ``PyMongoError`` like the underlying ``bulk_write``.
+    """
+    inserted = 0
+    chunk = []
+    for document in documents:
+        chunk.append(
+            UpdateOne({"uuid": document["uuid"]}, {"$setOnInsert": document}, upsert=True)
+        )
+        if len(chunk) >= chunk_size:
+            inserted += target.bulk_write(chunk, ordered=False, session=session).upserted_count
+            chunk = []
+    if chunk:
+        inserted += target.bulk_write(chunk, ordered=False, session=session).upserted_count
+    return inserted
@@ -0,0 +1,13 @@
+"""Tools that operate on the workflow's own checkout instead of the working directory."""
+
+import os
+from src.tools.workspace_operations.implementations import read_file
+
+WORKSPACE_TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def register_workspace_tools(client) -> None:
+    """Override the client's built-in cwd-based tools with the workspace versions."""
+    if client.tools.get("read_file", {}).get("function") is read_file:
+        return
+    client.register_tools(WORKSPACE_TOOLS_DIR)
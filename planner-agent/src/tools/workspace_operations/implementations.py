@@ -0,0 +1,954 @@
+"""Tools that operate on the checkout of the workflow calling them.
+
+The prometheus_swarm file, git and command tools resolve every path against
+``os.getcwd()``, which forces workflows to ``os.chdir`` into their checkout and
+makes it impossible to run two workflows in one process. These versions take
+the checkout from the ``repo_path`` the workflow context passes to every tool
+call instead, and fall back to the working directory only when no context is
+available.
+
+They also understand partial checkouts: the read tools look up the partial
+workspace for the repository, and the write tools report the paths they touch
+to the checkout's file tree index.
+"""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Callable, Optional
+from git import Repo, GitCommandError
+from prometheus_swarm.tools.git_operations import implementations as git_operations
+from prometheus_swarm.utils.logging import log_key_value, log_error
+from src.utils.file_tree import refresh_paths, walk_files
+from src.utils.partial_clone import get_workspace
+from src.utils.tracing import span
+
+# Same limit as the prometheus_swarm execute_command tool
+COMMAND_TIMEOUT = 300
+
+
+def _root(kwargs: dict) -> Path:
+    """Return the checkout a tool call operates on."""
+    return Path(kwargs.get("repo_path") or os.getcwd())
+
+
+def _normalize_path(path: str) -> str:
+    return path.lstrip("/")
+
+
+def commit_and_push(repo_path: str, message: str, allow_empty: bool = False) -> dict:
+    """Commit all changes in ``repo_path`` and push the current branch.
+
+    Args:
+        repo_path: Checkout to commit in
+        message: Commit message
+        allow_empty: Whether to allow creating an empty commit
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the operation succeeded
+            - message: Success/error message
+            - data: Dictionary containing the commit hash and message
+    """
+    try:
+        repo = Repo(repo_path)
+        log_key_value("Committing changes", message)
+
+        if not allow_empty:
+            repo.git.add(A=True)
+            if not repo.index.diff("HEAD"):
+                return {
+                    "success": False,
+                    "message": "No changes to commit and allow_empty is False",
+                    "data": None,
+                }
+
+        commit = repo.index.commit(message)
+
+        # Pull and retry once if the remote moved on
+        try:
+            repo.git.push("origin", repo.active_branch.name)
+        except GitCommandError:
+            repo.git.pull("origin", repo.active_branch.name)
+            repo.git.push("origin", repo.active_branch.name)
+
+        return {
+            "success": True,
+            "message": f"Changes committed and pushed: {message}",
+            "data": {"commit_hash": commit.hexsha, "message": message},
+        }
+    except GitCommandError as e:
+        error_msg = f"Failed to commit and push: {str(e)}"
+        log_error(e, error_msg)
+        return {
+            "success": False,
+            "message": error_msg,
+            "data": None,
+        }
+
+
+def read_file(file_path: str, **kwargs) -> dict:
+    """Read the contents of a file, downloading it first in partial checkouts.
+
+    Args:
+        file_path: Path to the file to read
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the operation succeeded
+            - message: Success/error message
+            - data: Dictionary containing the file content
+    """
+    root = _root(kwargs)
+    try:
+        file_path = _normalize_path(file_path)
+        workspace = get_workspace(str(root))
+        if workspace:
+            workspace.materialize([file_path])
+        with open(root / file_path, "r") as f:
+            content = f.read()
+        return {
+            "success": True,
+            "message": f"Successfully read file {file_path}",
+            "data": {"content": content},
+        }
+    except FileNotFoundError:
+        return {
+            "success": False,
+            "message": f"File not found: {file_path}",
+            "data": None,
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error reading file: {str(e)}",
+            "data": None,
+        }
+
+
+def list_files(directory: str, **kwargs) -> dict:
+    """List all files in a directory and its subdirectories.
+
+    Respects .gitignore and skips .git and node_modules. In partial checkouts the
+    list comes from the git tree, so no file contents are downloaded.
+
+    Args:
+        directory: Directory to list files from
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the operation succeeded
+            - message: Success/error message
+            - data: Dictionary containing the list of files
+    """
+    root = _root(kwargs)
+    try:
+        workspace = get_workspace(str(root))
+        if workspace:
+            files = workspace.list_files(directory)
+            return {
+                "success": True,
+                "message": f"Found {len(files)} files in {directory}",
+                "data": {"files": files},
+            }
+
+        path = root / _normalize_path(directory)
+        if not path.is_dir():
+            return {
+                "success": False,
+                "message": f"Directory does not exist: {path}",
+                "data": None,
+            }
+
+        with span("git", command="ls-files"):
+            result = subprocess.run(
+                ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+                cwd=path,
+                capture_output=True,
+                text=True,
+            )
+        if result.returncode != 0:
+            # Not a git repository
+            files = walk_files(path)
+        else:
+            files = sorted(
+                {
+                    f
+                    for f in result.stdout.split("\0")
+                    if f
+                    and not f.startswith(".git/")
+                    and "node_modules" not in f.split("/")
+                }
+            )
+        return {
+            "success": True,
+            "message": f"Found {len(files)} files in {directory}",
+            "data": {"files": files},
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error listing files: {str(e)}",
+            "data": None,
+        }
+
+
+def list_directory_contents(directory: str, **kwargs) -> dict:
+    """List the files and directories directly inside a directory.
+
+    In partial checkouts line counts are only reported for files that have
+    already been read; listing a directory never downloads file contents.
+
+    Args:
+        directory: Directory to list contents from
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the operation succeeded
+            - message: Success/error message
+            - data: Dictionary containing lists of files and directories
+    """
+    root = _root(kwargs)
+    try:
+        directory = _normalize_path(directory)
+        workspace = get_workspace(str(root))
+        if workspace:
+            names, directories = workspace.list_directory(directory)
+            unread = {
+                name
+                for name in names
+                if not workspace.is_materialized(os.path.join(directory, name))
+            }
+        else:
+            path = root / directory
+            if not path.is_dir():
+                return {
+                    "success": False,
+                    "message": f"Directory does not exist: {path}",
+                    "data": None,
+                }
+            names, directories, unread = [], [], set()
+            for item in path.iterdir():
+                if item.is_file():
+                    names.append(item.name)
+                elif item.is_dir():
+                    directories.append(item.name)
+
+        files = []
+        for name in names:
+            lines = None
+            if name not in unread:
+                try:
+                    with open(root / directory / name, "r", encoding="utf-8") as f:
+                        lines = sum(1 for _ in f)
+                except Exception:
+                    pass
+            files.append({"name": name, "lines": lines})
+        return {
+            "success": True,
+            "message": (
+                f"Found {len(files)} files and {len(directories)} directories "
+                f"in {directory or '.'}"
+            ),
+            "data": {
+                "files": sorted(files, key=lambda x: x["name"]),
+                "directories": sorted(directories),
+            },
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error listing directory contents: {str(e)}",
+            "data": None,
+        }
+
+
+def write_file(
+    file_path: str, content: str, commit_message: str = None, **kwargs
+) -> dict:
+    """Write a file, creating its directory, and record it in the file tree index.
+
+    Args:
+        file_path: Path to the file to write
+        content: Content to write to the file
+        commit_message: Optional commit message; commits and pushes when given
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the operation succeeded
+            - message: Success/error message
+            - data: Dictionary containing the written path
+    """
+    root = _root(kwargs)
+    file_path = _normalize_path(file_path)
+    full_path = root / file_path
+    try:
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(full_path, "w") as f:
+            f.write(content)
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Failed to write file {file_path}: {str(e)}",
+            "data": None,
+        }
+    finally:
+        refresh_paths([file_path], cwd=str(root))
+
+    if commit_message:
+        commit_result = commit_and_push(str(root), commit_message)
+        if not commit_result["success"]:
+            return commit_result
+
+    return {
+        "success": True,
+        "message": f"Successfully wrote to file {file_path}",
+        "data": {"path": file_path},
+    }
+
+
+def delete_file(file_path: str, commit_message: str = None, **kwargs) -> dict:
+    """Delete a file and drop it from the file tree index.
+
+    Args:
+        file_path: Path to the file to delete
+        commit_message: Optional commit message; commits and pushes when given
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the operation succeeded
+            - message: Success/error message
+            - data: Dictionary containing the deleted path
+    """
+    root = _root(kwargs)
+    file_path = _normalize_path(file_path)
+    full_path = root / file_path
+    if not full_path.exists():
+        return {
+            "success": False,
+            "message": "File not found",
+            "data": None,
+        }
+    try:
+        os.remove(full_path)
+    except Exception as e:
+        return {
+            "success": False,
+            "message": str(e),
+            "data": None,
+        }
+    finally:
+        refresh_paths([file_path], cwd=str(root))
+
+    if commit_message:
+        commit_result = commit_and_push(str(root), commit_message)
+        if not commit_result["success"]:
+            return commit_result
+
+    return {
+        "success": True,
+        "message": f"Successfully deleted file: {file_path}",
+        "data": {"path": file_path},
+    }
+
+
+def create_readme_file_with_name(title: str, **kwargs) -> dict:
+    """Create a README file with the name given in the workflow context.
+
+    Args:
+        title: The title of the README file
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the operation succeeded
+            - message: Success/error message
+    """
+    readme_file = f"# {title}\n\n{kwargs.get('readme_content')}"
+    write_result = write_file(
+        kwargs.get("file_name"),
+        readme_file,
+        "Create Prometheus-generated README file",
+        repo_path=kwargs.get("repo_path"),
+    )
+    if not write_result["success"]:
+        return write_result
+    return {
+        "success": True,
+        "message": "README file created successfully",
+    }
+
+
+def resolve_conflict(file_path: str, resolution: str, **kwargs) -> dict:
+    """Write the resolved contents of a conflicted file and stage it.
+
+    Args:
+        file_path: Path to the conflicted file
+        resolution: Resolved file contents
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the operation succeeded
+            - message: Success/error message
+            - data: Dictionary containing the resolved file
+    """
+    root = _root(kwargs)
+    try:
+        repo = Repo(root)
+        log_key_value("Resolving conflict in", file_path)
+        (root / file_path).write_text(resolution)
+        repo.git.add(file_path)
+        return {
+            "success": True,
+            "message": f"Successfully resolved conflict in {file_path}",
+            "data": {"file": file_path},
+        }
+    except GitCommandError as e:
+        error_msg = f"Failed to resolve conflict: {str(e)}"
+        log_error(e, error_msg)
+        return {
+            "success": False,
+            "message": error_msg,
+            "data": None,
+        }
+    finally:
+        refresh_paths([file_path], cwd=str(root))
+
+
+def execute_command(command: str, **kwargs) -> dict:
+    """Execute a shell command in the checkout.
+
+    Args:
+        command: Shell command to run
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the command could be executed
+            - message: Command output
+            - data: Dictionary containing stdout, stderr and the return code
+    """
+    root = _root(kwargs)
+    try:
+        log_key_value("Executing command", f"{command} (in {root})")
+        with span("command", command=command[:200]):
+            result = subprocess.run(
+                command,
+                shell=True,
+                cwd=root,
+                capture_output=True,
+                text=True,
+                timeout=COMMAND_TIMEOUT,
+            )
+        message = result.stdout or result.stderr or "Command executed with no output"
+        return {
+            "success": True,
+            "message": message,
+            "data": {
+                "stdout": result.stdout,
+                "stderr": result.stderr,
+                "returncode": result.returncode,
+                "command_succeeded": result.returncode == 0,
+            },
+        }
+    except subprocess.TimeoutExpired as e:
+        return {
+            "success": False,
+            "message": f"Command timed out after {COMMAND_TIMEOUT} seconds: {str(e)}",
+            "data": {
+                "stdout": e.stdout or "",
+                "stderr": e.stderr or "",
+                "returncode": -1,
+                "timed_out": True,
+                "command_succeeded": False,
+            },
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Failed to execute command: {str(e)}",
+            "data": {"error": str(e), "command_succeeded": False},
+        }
+
+
+_INSTALL_COMMANDS = {
+    "npm": ("npm install --no-fund --no-audit", "--save-dev"),
+    "pip": ("pip install --no-cache-dir", None),
+    "yarn": ("yarn add --non-interactive", "--dev"),
+    "pnpm": ("pnpm add --no-fund", "--save-dev"),
+}
+
+_TEST_COMMANDS = {
+    "pytest": "python3 -m pytest {path} -v",
+    "jest": "npx jest {path} --ci",
+    "vitest": "npx vitest {path} --run",
+}
+
+_TEST_RUNNERS = {
+    "pytest": ("pip", "pytest"),
+    "jest": ("npm", "jest"),
+    "vitest": ("npm", "vitest"),
+}
+
+
+def install_dependency(
+    package_name: str,
+    package_manager: str,
+    is_dev_dependency: bool = False,
+    version: str = None,
+    **kwargs,
+) -> dict:
+    """Install a dependency in the checkout with the given package manager.
+
+    Args:
+        package_name: Name of the package to install
+        package_manager: Package manager to use (npm, pip, yarn, pnpm)
+        is_dev_dependency: Whether to install as a dev dependency (where applicable)
+        version: Specific version to install (optional)
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the install succeeded
+            - message: Success/error message
+            - data: Dictionary containing the command output
+    """
+    if package_manager not in _INSTALL_COMMANDS:
+        return {
+            "success": False,
+            "message": f"Unsupported package manager: {package_manager}",
+            "data": None,
+        }
+
+    package_spec = package_name
+    if version:
+        separator = "==" if package_manager == "pip" else "@"
+        package_spec = f"{package_name}{separator}{version}"
+
+    command, dev_flag = _INSTALL_COMMANDS[package_manager]
+    if is_dev_dependency and dev_flag:
+        command = f"{command} {dev_flag}"
+    result = execute_command(
+        f"{command} {package_spec}", repo_path=kwargs.get("repo_path")
+    )
+    if not result["success"]:
+        return result
+    if not result["data"]["command_succeeded"]:
+        return {
+            "success": False,
+            "message": f"Failed to install {package_spec}: {result['data']['stderr']}",
+            "data": result["data"],
+        }
+    return {
+        "success": True,
+        "message": f"Successfully installed {package_spec}",
+        "data": result["data"],
+    }
+
+
+def run_tests(path: str, framework: str, **kwargs) -> dict:
+    """Run tests in the checkout with the given framework.
+
+    Args:
+        path: Path of the tests to run
+        framework: Test framework (pytest, jest, vitest)
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the tests could be run
+            - message: Summary of the test results
+            - data: Dictionary containing the test output and return code
+    """
+    root = _root(kwargs)
+    if path and not (root / _normalize_path(path)).exists():
+        return {
+            "success": False,
+            "message": f"No tests found at path: {path}",
+            "data": None,
+        }
+    if framework not in _TEST_COMMANDS:
+        return {
+            "success": False,
+            "message": f"Unknown test framework: {framework}",
+            "data": None,
+        }
+
+    package_manager, package_name = _TEST_RUNNERS[framework]
+    install_result = install_dependency(
+        package_name,
+        package_manager,
+        is_dev_dependency=True,
+        repo_path=kwargs.get("repo_path"),
+    )
+    if not install_result["success"]:
+        return {
+            "success": False,
+            "message": f"Failed to install test runner: {install_result['message']}",
+            "data": install_result.get("data"),
+        }
+
+    result = execute_command(
+        _TEST_COMMANDS[framework].format(path=path or ""),
+        repo_path=kwargs.get("repo_path"),
+    )
+    if not result["success"]:
+        return {
+            "success": False,
+            "message": f"Failed to execute tests: {result['message']}",
+            "data": result.get("data", {}),
+        }
+
+    output = "\n".join(
+        part for part in (result["data"]["stdout"], result["data"]["stderr"]) if part
+    )
+    tests_passed = result["data"]["returncode"] == 0
+    return {
+        "success": True,
+        "message": (
+            "Tests completed successfully."
+            if tests_passed
+            else "Tests completed with failures."
+        )
+        + " See output for details.",
+        "data": {
+            "output": output or "No test output captured",
+            "returncode": result["data"]["returncode"],
+            "tests_passed": tests_passed,
+            "framework": framework,
+        },
+    }
+
+
+
+def create_directory(path: str, **kwargs) -> dict:
+    """Create a directory and any missing parents in the checkout.
+
+    Args:
+        path: Path to the directory to create
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the operation succeeded
+            - message: Success/error message
+            - data: Dictionary containing the created path
+    """
+    root = _root(kwargs)
+    try:
+        path = _normalize_path(path)
+        (root / path).mkdir(parents=True, exist_ok=True)
+        return {
+            "success": True,
+            "message": f"Created directory: {path}",
+            "data": {"path": path},
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Failed to create directory: {str(e)}",
+            "data": None,
+        }
+
+
+def _transfer_file(
+    operation: Callable[[str, str], object],
+    done: str,
+    source: str,
+    destination: str,
+    commit_message: Optional[str],
+    kwargs: dict,
+) -> dict:
+    """Apply ``operation(source, destination)`` within the checkout and record both paths."""
+    root = _root(kwargs)
+    source = _normalize_path(source)
+    destination = _normalize_path(destination)
+    source_path = root / source
+    if not source_path.exists():
+        return {
+            "success": False,
+            "message": f"Source file not found: {source}",
+            "data": None,
+        }
+    try:
+        destination_path = root / destination
+        destination_path.parent.mkdir(parents=True, exist_ok=True)
+        operation(str(source_path), str(destination_path))
+    except Exception as e:
+        return {
+            "success": False,
+            "message": str(e),
+            "data": None,
+        }
+    finally:
+        refresh_paths([source, destination], cwd=str(root))
+
+    if commit_message:
+        commit_result = commit_and_push(str(root), commit_message)
+        if not commit_result["success"]:
+            return commit_result
+
+    return {
+        "success": True,
+        "message": f"Successfully {done} file from {source} to {destination}",
+        "data": {"source": source, "destination": destination},
+    }
+
+
+def copy_file(source: str, destination: str, commit_message: str = None, **kwargs) -> dict:
+    """Copy a file within the checkout.
+
+    Args:
+        source: Path to the source file
+        destination: Path to the destination file
+        commit_message: Optional commit message; commits and pushes when given
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the operation succeeded
+            - message: Success/error message
+            - data: Dictionary containing the source and destination
+    """
+    return _transfer_file(shutil.copy2, "copied", source, destination, commit_message, kwargs)
+
+
+def move_file(source: str, destination: str, commit_message: str = None, **kwargs) -> dict:
+    """Move a file within the checkout.
+
+    Args:
+        source: Path to the source file
+        destination: Path to the destination file
+        commit_message: Optional commit message; commits and pushes when given
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the operation succeeded
+            - message: Success/error message
+            - data: Dictionary containing the source and destination
+    """
+    return _transfer_file(shutil.move, "moved", source, destination, commit_message, kwargs)
+
+
+def rename_file(source: str, destination: str, commit_message: str = None, **kwargs) -> dict:
+    """Rename a file within the checkout.
+
+    Args:
+        source: Current file path
+        destination: New file path
+        commit_message: Optional commit message; commits and pushes when given
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the operation succeeded
+            - message: Success/error message
+            - data: Dictionary containing the source and destination
+    """
+    return _transfer_file(os.rename, "renamed", source, destination, commit_message, kwargs)
+
+
+def _git_result(action: str, operation: Callable[[Repo], dict], kwargs: dict) -> dict:
+    """Run ``operation`` on the checkout's repository, reporting git errors."""
+    try:
+        return operation(Repo(_root(kwargs)))
+    except GitCommandError as e:
+        error_msg = f"Failed to {action}: {str(e)}"
+        log_error(e, error_msg)
+        return {
+            "success": False,
+            "message": error_msg,
+            "data": None,
+        }
+
+
+def _resolve_path(path: str, kwargs: dict) -> str:
+    """Resolve a relative tool path against the checkout rather than the cwd."""
+    return str(_root(kwargs) / path)
+
+
+def init_repository(path: str, user_name: str = None, user_email: str = None, **kwargs) -> dict:
+    """Initialize a git repository at ``path``, relative to the checkout."""
+    return git_operations.init_repository(
+        _resolve_path(path, kwargs), user_name=user_name, user_email=user_email
+    )
+
+
+def clone_repository(
+    url: str, path: str, user_name: str = None, user_email: str = None, **kwargs
+) -> dict:
+    """Clone ``url`` to ``path``, relative to the checkout."""
+    return git_operations.clone_repository(
+        url,
+        _resolve_path(path, kwargs),
+        user_name=user_name,
+        user_email=user_email,
+        github_token=kwargs.get("github_token"),
+        github_username=kwargs.get("github_username"),
+    )
+
+
+def checkout_branch(branch_name: str, **kwargs) -> dict:
+    """Check out an existing branch of the checkout."""
+
+    def checkout(repo: Repo) -> dict:
+        log_key_value("Checking out branch", branch_name)
+        repo.heads[branch_name].checkout()
+        return {
+            "success": True,
+            "message": f"Successfully checked out branch {branch_name}",
+            "data": {"branch": branch_name},
+        }
+
+    return _git_result("checkout branch", checkout, kwargs)
+
+
+def commit_changes(message: str, allow_empty: bool = False, **kwargs) -> dict:
+    """Commit all changes in the checkout and push (the ``commit_and_push`` tool)."""
+    return commit_and_push(str(_root(kwargs)), message, allow_empty)
+
+
+def get_current_branch(**kwargs) -> dict:
+    """Get the checkout's current branch."""
+
+    def current_branch(repo: Repo) -> dict:
+        branch = repo.active_branch.name
+        log_key_value("Current branch", branch)
+        return {
+            "success": True,
+            "message": f"Current branch is {branch}",
+            "data": {"branch": branch},
+        }
+
+    return _git_result("get current branch", current_branch, kwargs)
+
+
+def list_branches(**kwargs) -> dict:
+    """List the checkout's local branches."""
+
+    def branches(repo: Repo) -> dict:
+        names = [head.name for head in repo.heads]
+        log_key_value("Branches", ", ".join(names))
+        return {
+            "success": True,
+            "message": f"Found {len(names)} branches",
+            "data": {"branches": names},
+        }
+
+    return _git_result("list branches", branches, kwargs)
+
+
+def add_remote(name: str, url: str, **kwargs) -> dict:
+    """Add a remote to the checkout."""
+
+    def add(repo: Repo) -> dict:
+        log_key_value("Adding remote", f"{name} -> {url}")
+        repo.create_remote(name, url)
+        return {
+            "success": True,
+            "message": f"Successfully added remote {name}",
+            "data": {"name": name, "url": url},
+        }
+
+    return _git_result("add remote", add, kwargs)
+
+
+def pull_remote(remote_name: str = "origin", branch: str = None, **kwargs) -> dict:
+    """Pull a remote branch into the checkout, failing on merge conflicts."""
+
+    def pull(repo: Repo) -> dict:
+        pull_branch = branch or repo.active_branch.name
+        log_key_value("Pulling from remote", f"{remote_name}/{pull_branch}")
+        repo.git.pull(remote_name, pull_branch, "--allow-unrelated-histories")
+        if repo.index.unmerged_blobs():
+            return {
+                "success": False,
+                "message": "Merge conflict detected after pull",
+                "data": None,
+            }
+        return {
+            "success": True,
+            "message": f"Successfully pulled from {remote_name}/{pull_branch}",
+            "data": {"remote": remote_name, "branch": pull_branch},
+        }
+
+    return _git_result("pull changes", pull, kwargs)
+
+
+def can_access_repository(repo_url: str, **kwargs) -> dict:
+    """Check whether ``repo_url`` is one of the checkout's remotes."""
+
+    def check(repo: Repo) -> dict:
+        log_key_value("Checking access to", repo_url)
+        for remote in repo.remotes:
+            if any(repo_url in url for url in remote.urls):
+                return {
+                    "success": True,
+                    "message": f"Repository {repo_url} is accessible",
+                    "data": {"url": repo_url},
+                }
+        return {
+            "success": False,
+            "message": "Repository not found in remotes",
+            "data": None,
+        }
+
+    return _git_result("check repository access", check, kwargs)
+
+
+def check_for_conflicts(**kwargs) -> dict:
+    """List the checkout's files with unresolved merge conflicts."""
+
+    def conflicts(repo: Repo) -> dict:
+        conflicting_files = sorted(repo.index.unmerged_blobs())
+        if conflicting_files:
+            log_key_value("Found conflicts in", ", ".join(conflicting_files))
+        return {
+            "success": True,
+            "message": "Conflicts found" if conflicting_files else "No conflicts found",
+            "data": {
+                "has_conflicts": bool(conflicting_files),
+                "conflicting_files": conflicting_files,
+            },
+        }
+
+    return _git_result("check for conflicts", conflicts, kwargs)
+
+
+def get_conflict_info(**kwargs) -> dict:
+    """Return the ancestor, ours and theirs versions of each conflicted file."""
+    stages = {1: "ancestor", 2: "ours", 3: "theirs"}
+
+    def conflict_info(repo: Repo) -> dict:
+        conflicts = {}
+        for path, blobs in repo.index.unmerged_blobs().items():
+            log_key_value("Analyzing conflict in", path)
+            conflicts[path] = {
+                "content": {
+                    stages[stage]: blob.data_stream.read().decode()
+                    for stage, blob in blobs
+                    if stage in stages
+                }
+            }
+        return {
+            "success": True,
+            "message": "Successfully retrieved conflict information",
+            "data": {"conflicts": conflicts},
+        }
+
+    return _git_result("get conflict info", conflict_info, kwargs)
+
+
+def create_merge_commit(message: str, **kwargs) -> dict:
+    """Commit a merge in the checkout once every conflict is resolved."""
+
+    def merge_commit(repo: Repo) -> dict:
+        log_key_value("Creating merge commit", message)
+        if repo.index.unmerged_blobs():
+            return {
+                "success": False,
+                "message": "Cannot create merge commit with unresolved conflicts",
+                "data": None,
+            }
+        commit = repo.index.commit(message)
+        return {
+            "success": True,
+            "message": f"Successfully created merge commit: {message}",
+            "data": {"commit_id": commit.hexsha},
+        }
+
+    return _git_result("create merge commit", merge_commit, kwargs)
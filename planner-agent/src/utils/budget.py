@@ -0,0 +1,219 @@
+"""Time, token and iteration budgets for workflow runs.
+
+A run started with ``budget_scope`` gets a ``Budget``, which limits:
+
+- the tokens used by all of the run's LLM calls (``WORKFLOW_TOKEN_BUDGET``);
+- the run's wall-clock time (``WORKFLOW_DEADLINE_SECONDS``);
+- the wall-clock time of each phase (``PHASE_DEADLINE_SECONDS``);
+- how many times a workflow loop retries a phase (``PHASE_MAX_ITERATIONS``).
+
+A limit of 0 disables it. ``instrument`` checks the budget before every phase
+and every LLM call, so an exhausted run raises ``BudgetExceeded`` at its next
+call; the workflows already treat a failed phase as a missing result and
+keep what they have so far. Retry loops use ``iterations``, which stops
+early, without raising, when the budget runs out.
+
+Each phase logs what it used; the run logs a summary when it ends. The
+budget lives in a context variable, so it follows work submitted through
+``src.utils.tracing.bind``.
+"""
+
+import contextlib
+import contextvars
+import functools
+import os
+import threading
+import time
+from typing import Iterator, Optional
+from prometheus_swarm.utils.logging import log_key_value, log_section
+from src.utils import metrics
+
+_current_budget = contextvars.ContextVar("budget", default=None)
+_current_phase = contextvars.ContextVar("budget_phase", default=None)
+_instrumented = False
+
+
+class BudgetExceeded(Exception):
+    """The workflow run has used up its budget."""
+
+
+class _PhaseUsage:
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.monotonic()
+        self.tokens = 0
+
+
+class Budget:
+    """Limits of one workflow run and what it has used so far."""
+
+    def __init__(
+        self,
+        name: str,
+        max_tokens: int = 0,
+        deadline: float = 0,
+        phase_deadline: float = 0,
+        max_iterations: int = 0,
+    ):
+        self.name = name
+        self.max_tokens = max_tokens
+        self.deadline = deadline
+        self.phase_deadline = phase_deadline
+        self.max_iterations = max_iterations
+        self.started = time.monotonic()
+        self.tokens = 0
+        self.phases = {}  # phase name -> [runs, tokens, seconds]
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, name: str) -> "Budget":
+        return cls(
+            name,
+            max_tokens=int(os.getenv("WORKFLOW_TOKEN_BUDGET", "0")),
+            deadline=float(os.getenv("WORKFLOW_DEADLINE_SECONDS", "5400")),
+            phase_deadline=float(os.getenv("PHASE_DEADLINE_SECONDS", "1800")),
+            max_iterations=int(os.getenv("PHASE_MAX_ITERATIONS", "3")),
+        )
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def exceeded(self) -> Optional[str]:
+        """Why the run cannot start more work, or None while it has budget left."""
+        if self.max_tokens and self.tokens >= self.max_tokens:
+            return f"token budget used ({self.tokens}/{self.max_tokens})"
+        if self.deadline and self.elapsed() >= self.deadline:
+            return f"workflow deadline reached ({self.deadline:g}s)"
+        phase = _current_phase.get()
+        if phase and self.phase_deadline:
+            if time.monotonic() - phase.started >= self.phase_deadline:
+                return f"phase {phase.name} deadline reached ({self.phase_deadline:g}s)"
+        return None
+
+    def check(self) -> None:
+        """Raise ``BudgetExceeded`` if the run is out of budget."""
+        reason = self.exceeded()
+        if reason:
+            raise BudgetExceeded(f"{self.name}: {reason}")
+
+    def add_tokens(self, count: int) -> None:
+        phase = _current_phase.get()
+        with self._lock:
+            self.tokens += count
+            if phase:
+                phase.tokens += count
+
+    def iterations(self, phase_name: str, limit: int = None) -> Iterator[int]:
+        """Attempt numbers for a retry loop, while attempts and budget remain."""
+        limit = self.max_iterations if limit is None else limit
+        attempt = 0
+        while True:
+            if limit and attempt >= limit:
+                log_key_value(f"Budget: {phase_name}", f"stopped after {attempt} iteration(s)")
+                return
+            reason = self.exceeded()
+            if reason:
+                log_key_value(f"Budget: {phase_name}", f"stopped, {reason}")
+                return
+            attempt += 1
+            yield attempt
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Account the enclosed phase's time and tokens, and log them."""
+        usage = _PhaseUsage(name)
+        token = _current_phase.set(usage)
+        try:
+            yield usage
+        finally:
+            _current_phase.reset(token)
+            seconds = time.monotonic() - usage.started
+            with self._lock:
+                total = self.phases.setdefault(name, [0, 0, 0.0])
+                total[0] += 1
+                total[1] += usage.tokens
+                total[2] += seconds
+            log_key_value(
+                f"Budget: {name}",
+                f"{seconds:.1f}s, {usage.tokens} tokens "
+                f"(run: {self.elapsed():.0f}s, {self.tokens} tokens)",
+            )
+
+    def log_summary(self) -> None:
+        log_section(f"BUDGET SUMMARY: {self.name}")
+        limit = f"/{self.max_tokens}" if self.max_tokens else ""
+        log_key_value("Total", f"{self.elapsed():.1f}s, {self.tokens}{limit} tokens")
+        for name, (runs, tokens, seconds) in sorted(
+            self.phases.items(), key=lambda item: item[1][2], reverse=True
+        ):
+            log_key_value(name, f"{seconds:.1f}s, {tokens} tokens in {runs} run(s)")
+
+
+@contextlib.contextmanager
+def budget_scope(name: str):
+    """Give the enclosed workflow run a budget from the environment."""
+    budget = Budget.from_env(name)
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+        budget.log_summary()
+
+
+def current_budget() -> Budget:
+    """The running workflow's budget; outside a run, a fresh one from the environment."""
+    return _current_budget.get() or Budget.from_env("unscoped")
+
+
+def instrument() -> None:
+    """Check and account the budget around phases and LLM calls; safe to call twice."""
+    global _instrumented
+    if _instrumented:
+        return
+    _instrumented = True
+
+    from prometheus_swarm.workflows.base import WorkflowPhase
+
+    execute = WorkflowPhase.execute
+
+    @functools.wraps(execute)
+    def budgeted_execute(self, *args, **kwargs):
+        budget = _current_budget.get()
+        if budget is None:
+            return execute(self, *args, **kwargs)
+        budget.check()
+        with budget.phase(type(self).__name__):
+            return execute(self, *args, **kwargs)
+
+    WorkflowPhase.execute = budgeted_execute
+
+    import importlib
+
+    for module_name, class_name in (
+        ("anthropic_client", "AnthropicClient"),
+        ("openai_client", "OpenAIClient"),
+    ):
+        try:
+            module = importlib.import_module(f"prometheus_swarm.clients.{module_name}")
+            client_class = getattr(module, class_name)
+        except (ImportError, AttributeError):
+            continue
+        _wrap_api_call(client_class)
+
+
+def _wrap_api_call(client_class) -> None:
+    api_call = client_class._make_api_call
+
+    @functools.wraps(api_call)
+    def budgeted_api_call(self, *args, **kwargs):
+        budget = _current_budget.get()
+        if budget is None:
+            return api_call(self, *args, **kwargs)
+        # Stops a phase's tool loop too, not just the next phase
+        budget.check()
+        response = api_call(self, *args, **kwargs)
+        budget.add_tokens(sum(metrics.token_usage(response).values()))
+        return response
+
+    client_class._make_api_call = budgeted_api_call
@@ -0,0 +1,197 @@
+"""Background delivery of builder conversation messages to the middle server.
+
+The conversation hook runs inside the LLM loop, so it only puts a message on
+a bounded in-memory queue and returns. A sender thread drains the queue:
+
+- Messages are sent in batches of up to ``REMOTE_LOG_BATCH_SIZE`` as one
+  gzip-compressed POST to ``/api/builder/record-builder-messages``
+  (``{"messages": [...]}``), over one keep-alive session with timeouts.
+- A batch that fails is retried with exponential backoff and jitter, up to
+  ``REMOTE_LOG_MAX_ATTEMPTS`` times, and is then dropped.
+- When the queue is full, the oldest queued message is dropped to make room.
+- If the middle server does not have the batch endpoint yet, messages fall
+  back to one POST each to ``/api/builder/record-builder-message``, still
+  from the sender thread.
+
+Every outcome is counted in ``remote_log_messages_total`` and in
+``MessageShipper.counters``. Messages still queued at exit get
+``SHUTDOWN_TIMEOUT`` seconds to go out.
+"""
+
+import atexit
+import gzip
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+import requests
+from requests.adapters import HTTPAdapter
+from prometheus_client import Counter
+from prometheus_swarm.utils.logging import log_key_value, log_error
+
+BATCH_PATH = "/api/builder/record-builder-messages"
+SINGLE_PATH = "/api/builder/record-builder-message"
+QUEUE_SIZE = int(os.getenv("REMOTE_LOG_QUEUE_SIZE", "5000"))
+BATCH_SIZE = int(os.getenv("REMOTE_LOG_BATCH_SIZE", "50"))
+FLUSH_INTERVAL = float(os.getenv("REMOTE_LOG_FLUSH_INTERVAL_MS", "1000")) / 1000
+MAX_ATTEMPTS = int(os.getenv("REMOTE_LOG_MAX_ATTEMPTS", "5"))
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+TIMEOUT = (3.05, 10)
+SHUTDOWN_TIMEOUT = 5.0
+
+MESSAGES = Counter(
+    "remote_log_messages_total",
+    "Builder messages handled by the middle-server shipper",
+    ["outcome"],
+)
+
+
+class MessageShipper:
+    """Bounded queue of messages shipped to the middle server in batches."""
+
+    def __init__(
+        self,
+        base_url: str,
+        queue_size: int = QUEUE_SIZE,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+        max_attempts: int = MAX_ATTEMPTS,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.session = requests.Session()
+        # Retries are ours (with backoff), not urllib3's
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._queue = deque(maxlen=queue_size)
+        self._condition = threading.Condition()
+        self._sender = None
+        self._closed = False
+        self._batch_supported = True
+        self.counters = {"sent": 0, "dropped_overflow": 0, "dropped_failed": 0}
+
+    def put(self, message: dict) -> None:
+        """Queue a message without blocking; the oldest is dropped when full."""
+        with self._condition:
+            if self._closed:
+                return
+            if len(self._queue) == self._queue.maxlen:
+                self._count("dropped_overflow")
+            self._queue.append(message)
+            if len(self._queue) >= self.batch_size:
+                self._condition.notify()
+        self._start()
+
+    def close(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Stop accepting messages and give the queued ones ``timeout`` seconds."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._sender and self._sender.is_alive():
+            self._sender.join(timeout)
+        else:
+            self._send_loop()
+
+    def _count(self, outcome: str, count: int = 1) -> None:
+        self.counters[outcome] += count
+        MESSAGES.labels(outcome).inc(count)
+
+    def _start(self) -> None:
+        if self._sender and self._sender.is_alive():
+            return
+        with self._condition:
+            if self._closed or (self._sender and self._sender.is_alive()):
+                return
+            self._sender = threading.Thread(
+                target=self._send_loop, name="remote-log-shipper", daemon=True
+            )
+            self._sender.start()
+
+    def _take(self) -> list[dict]:
+        with self._condition:
+            count = min(self.batch_size, len(self._queue))
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _send_loop(self) -> None:
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._queue) < self.batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                closed = self._closed
+            while True:
+                batch = self._take()
+                if batch:
+                    self._ship(batch, retry=not closed)
+                if not batch or not closed:
+                    break
+            if closed:
+                return
+
+    def _ship(self, batch: list[dict], retry: bool = True) -> None:
+        attempts = self.max_attempts if retry else 1
+        for attempt in range(1, attempts + 1):
+            try:
+                self._post(batch)
+                self._count("sent", len(batch))
+                return
+            except requests.RequestException as e:
+                if attempt == attempts:
+                    self._count("dropped_failed", len(batch))
+                    log_error(
+                        e,
+                        f"Dropped {len(batch)} builder message(s) after {attempt} attempt(s)",
+                        logToServer=False,
+                    )
+                    return
+                time.sleep(self._backoff(attempt))
+
+    def _post(self, batch: list[dict]) -> None:
+        if self._batch_supported:
+            body = gzip.compress(json.dumps({"messages": batch}).encode())
+            response = self.session.post(
+                f"{self.base_url}{BATCH_PATH}",
+                data=body,
+                headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+                timeout=TIMEOUT,
+            )
+            if response.status_code not in (404, 405, 415):
+                response.raise_for_status()
+                return
+            log_key_value("Batch endpoint unavailable", "sending builder messages one at a time")
+            self._batch_supported = False
+        # Messages that already went out are not resent when a later one fails
+        while batch:
+            response = self.session.post(
+                f"{self.base_url}{SINGLE_PATH}", json=batch[0], timeout=TIMEOUT
+            )
+            response.raise_for_status()
+            batch.pop(0)
+            self._count("sent")
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+
+_shippers = {}
+_shippers_lock = threading.Lock()
+
+
+def get_shipper(base_url: str) -> MessageShipper:
+    """Return the process-wide shipper for ``base_url``, creating it once."""
+    with _shippers_lock:
+        shipper = _shippers.get(base_url)
+        if shipper is None:
+            shipper = _shippers[base_url] = MessageShipper(base_url)
+            atexit.register(shipper.close)
+        return shipper
@@ -0,0 +1,185 @@
+"""Cache of finished plans, so a resubmitted spec skips the LLM pipeline.
+
+``/create-plan`` is often retried with the same spec against an unchanged
+repository. A plan is stored under ``plan_key``: the repository and its HEAD
+commit, the normalized spec, the bounty type and ``prompt_version`` of the
+prompts that produced it. Any change to one of them is a miss, so nothing
+needs to be invalidated when code or prompts change.
+
+A hit is re-materialized under the new bounty: every issue and todo gets a
+fresh uuid, and ``issueUuid``, ``predecessorUuid`` and ``dependencyTasks``
+are remapped to match. Entries expire after ``PLAN_CACHE_TTL_SECONDS`` (a TTL
+index, see ``src.server.mongo_connection.INDEXES``), and ``invalidate`` drops
+a repository's entries on demand.
+
+Lookups are counted in ``plan_cache_lookups_total{result}``; the hit rate is
+``hit / (hit + miss)``.
+"""
+
+import hashlib
+import json
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from prometheus_client import Counter
+from pymongo.errors import PyMongoError
+from prometheus_swarm.utils.logging import log_error, log_key_value
+from src.server.mongo_connection import collection
+
+PLAN_CACHE_ENABLED = os.getenv("PLAN_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+LOOKUPS = Counter(
+    "plan_cache_lookups_total", "Plan cache lookups", ["result"]
+)  # result: hit, miss, error
+INVALIDATED = Counter("plan_cache_invalidated_total", "Plan cache entries dropped")
+
+plan_cache_collection = collection("plancache")
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def _digest(value: Any) -> str:
+    encoded = json.dumps(_normalize(value), sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def spec_digest(issue_spec: Any) -> str:
+    """Hash of an issue spec that ignores differences in whitespace."""
+    return _digest(issue_spec)
+
+
+def prompt_version(*prompt_sets: Dict[str, Any]) -> str:
+    """Short hash of the prompt templates a plan is generated with."""
+    return _digest(list(prompt_sets))[:16]
+
+
+def plan_key(
+    repo_owner: str,
+    repo_name: str,
+    head_sha: str,
+    issue_spec: Any,
+    bounty_type: str,
+    prompts_version: str,
+) -> str:
+    """Cache key of a plan; whitespace differences in the spec do not matter."""
+    return _digest(
+        {
+            "repo": f"{repo_owner}/{repo_name}".lower(),
+            "head": head_sha,
+            "spec": spec_digest(issue_spec),
+            "bountyType": str(getattr(bounty_type, "value", bounty_type)),
+            "prompts": prompts_version,
+        }
+    )
+
+
+def lookup(key: str) -> Optional[Dict[str, Any]]:
+    """The cached plan stored under ``key``, or None on a miss or error."""
+    if not PLAN_CACHE_ENABLED:
+        return None
+    try:
+        entry = plan_cache_collection.find_one({"key": key}, {"_id": 0})
+    except PyMongoError as e:
+        LOOKUPS.labels("error").inc()
+        log_error(e, "Plan cache lookup failed", logToServer=False)
+        return None
+    LOOKUPS.labels("hit" if entry else "miss").inc()
+    return entry
+
+
+def store(
+    key: str,
+    repo_owner: str,
+    repo_name: str,
+    head_sha: str,
+    issues: List[Dict[str, Any]],
+    todos: List[Dict[str, Any]],
+    system_prompt: Optional[str],
+) -> bool:
+    """Cache a finished plan's issue and todo documents under ``key``."""
+    if not PLAN_CACHE_ENABLED:
+        return False
+    try:
+        plan_cache_collection.replace_one(
+            {"key": key},
+            {
+                "key": key,
+                "repoOwner": repo_owner,
+                "repoName": repo_name,
+                "headSha": head_sha,
+                "issues": issues,
+                "todos": todos,
+                "systemPrompt": system_prompt,
+                "createdAt": datetime.now(timezone.utc),
+            },
+            upsert=True,
+        )
+        return True
+    except PyMongoError as e:
+        log_error(e, "Failed to cache plan", logToServer=False)
+        return False
+
+
+def invalidate(repo_owner: str, repo_name: Optional[str] = None) -> int:
+    """Drop the cached plans of a repository, or of every repository of an owner."""
+    query = {"repoOwner": repo_owner}
+    if repo_name is not None:
+        query["repoName"] = repo_name
+    deleted = plan_cache_collection.delete_many(query).deleted_count
+    INVALIDATED.inc(deleted)
+    log_key_value("Plan cache entries invalidated", deleted)
+    return deleted
+
+
+def materialize(
+    entry: Dict[str, Any], bounty_id: str
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Copies of a cached plan's issues and todos for ``bounty_id``.
+
+    The copies' uuids are derived from the bounty and the cached uuids, so
+    materializing the same plan for the same bounty again yields the same
+    documents and the uuid-keyed upserts leave the stored plan untouched.
+    """
+    now = datetime.now(timezone.utc)
+    new_uuids = {
+        document["uuid"]: str(uuid.uuid5(uuid.NAMESPACE_URL, f"{bounty_id}/{document['uuid']}"))
+        for document in entry["issues"] + entry["todos"]
+    }
+    fresh = {"bountyId": bounty_id, "createdAt": now, "updatedAt": now}
+
+    issues = []
+    for issue in entry["issues"]:
+        predecessor = issue.get("predecessorUuid")
+        issues.append(
+            {
+                **issue,
+                **fresh,
+                "uuid": new_uuids[issue["uuid"]],
+                "predecessorUuid": new_uuids.get(predecessor, predecessor),
+            }
+        )
+    todos = []
+    for todo in entry["todos"]:
+        todos.append(
+            {
+                **todo,
+                **fresh,
+                "uuid": new_uuids[todo["uuid"]],
+                "issueUuid": new_uuids.get(todo.get("issueUuid"), todo.get("issueUuid")),
+                # Dependencies outside the cached plan are kept as they are
+                "dependencyTasks": [
+                    new_uuids.get(dependency, dependency)
+                    for dependency in todo.get("dependencyTasks") or []
+                ],
+            }
+        )
+    return issues, todos
@@ -0,0 +1,103 @@
+"""Per-bounty checkpoints of a planner run, so a failed run resumes where it stopped.
+
+A run records its progress in the ``plancheckpoints`` collection, one
+document per bounty::
+
+    {"bountyId", "specHash", "issues", "approved", "tasks": {issueUuid: [task, ...]},
+     "updatedAt"}
+
+``issues`` and ``approved`` are saved once issue generation succeeds, and each
+issue's tasks once they are decomposed and their dependencies validated. A
+later run for the same bounty and spec skips those phases and reuses the
+saved uuids, so writes it repeats are no-ops (see ``upsert_by_uuid``). A
+checkpoint for a different spec is ignored. The checkpoint is cleared when the
+run completes, and abandoned ones expire after ``PLAN_CHECKPOINT_TTL_SECONDS``.
+
+Checkpoint writes are best effort: a failure is logged and the run goes on.
+"""
+
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from pymongo.errors import PyMongoError
+from prometheus_swarm.utils.logging import log_error
+from src.server.mongo_connection import collection
+
+PLAN_CHECKPOINTS_ENABLED = os.getenv("PLAN_CHECKPOINTS_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+plan_checkpoints_collection = collection("plancheckpoints")
+
+
+def load(bounty_id: str, spec_hash: str) -> Optional[Dict[str, Any]]:
+    """The bounty's checkpoint if it was saved for the same spec."""
+    if not PLAN_CHECKPOINTS_ENABLED:
+        return None
+    try:
+        checkpoint = plan_checkpoints_collection.find_one(
+            {"bountyId": bounty_id, "specHash": spec_hash}, {"_id": 0}
+        )
+    except PyMongoError as e:
+        log_error(e, "Failed to load plan checkpoint", logToServer=False)
+        return None
+    if checkpoint is not None:
+        checkpoint.setdefault("tasks", {})
+    return checkpoint
+
+
+def save_issues(
+    bounty_id: str, spec_hash: str, issues: List[Dict[str, Any]], approved: bool
+) -> bool:
+    """Start the bounty's checkpoint from its generated issues."""
+    if not PLAN_CHECKPOINTS_ENABLED:
+        return False
+    try:
+        plan_checkpoints_collection.replace_one(
+            {"bountyId": bounty_id},
+            {
+                "bountyId": bounty_id,
+                "specHash": spec_hash,
+                "issues": issues,
+                "approved": approved,
+                "tasks": {},
+                "updatedAt": datetime.now(timezone.utc),
+            },
+            upsert=True,
+        )
+        return True
+    except PyMongoError as e:
+        log_error(e, "Failed to save plan checkpoint", logToServer=False)
+        return False
+
+
+def save_issue_tasks(bounty_id: str, issue_uuid: str, tasks: List[Dict[str, Any]]) -> bool:
+    """Add one issue's validated tasks to the bounty's checkpoint."""
+    if not PLAN_CHECKPOINTS_ENABLED:
+        return False
+    try:
+        plan_checkpoints_collection.update_one(
+            {"bountyId": bounty_id},
+            {
+                "$set": {
+                    f"tasks.{issue_uuid}": tasks,
+                    "updatedAt": datetime.now(timezone.utc),
+                }
+            },
+        )
+        return True
+    except PyMongoError as e:
+        log_error(e, "Failed to save plan checkpoint", logToServer=False)
+        return False
+
+
+def clear(bounty_id: str) -> None:
+    """Drop the bounty's checkpoint once its plan is complete."""
+    if not PLAN_CHECKPOINTS_ENABLED:
+        return
+    try:
+        plan_checkpoints_collection.delete_one({"bountyId": bounty_id})
+    except PyMongoError as e:
+        log_error(e, "Failed to clear plan checkpoint", logToServer=False)
@@ -0,0 +1,193 @@
+"""Versioned phase-prompt templates referenced by todos.
+
+A todo's ``phasesData`` used to hold every phase prompt rendered in full, so
+each todo carried several KB of text that is identical across the plan. With
+``PROMPT_TEMPLATE_REFS`` on, it holds a reference instead::
+
+    {"templateId": "feature-builder", "version": "3f2a...", "params": {...}}
+
+``params`` keeps only the fields the template's prompts use (``info``,
+``acceptance_criteria``, ...), already converted to the strings ``format``
+puts in their place. Prompts may only use plain ``{name}`` fields, so any
+reader can render a reference by substituting those strings and unescaping
+``{{``/``}}``; the middle server does this when it hands a todo to a worker.
+The templates themselves live once in the ``prompttemplates`` collection,
+one document per ``(templateId, version)``::
+
+    {"templateId", "version", "phases": [{"name", "prompt", "tools"}], "createdAt"}
+
+The version is a hash of the template's content, so editing a prompt adds a
+new version and todos already planned keep rendering the text they were
+planned with. Readers render a reference with ``render_phases_data``; parsed
+templates are kept in an LRU cache, so rendering is a join of literals and
+parameters.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from string import Formatter
+from typing import Any, Dict, List, Optional, Tuple
+from pymongo.errors import PyMongoError
+from prometheus_swarm.utils.logging import log_error
+from src.server.mongo_connection import collection
+
+PROMPT_TEMPLATE_REFS = os.getenv("PROMPT_TEMPLATE_REFS", "false").lower() in ("1", "true", "yes")
+
+prompt_templates_collection = collection("prompttemplates")
+
+_formatter = Formatter()
+_registered = set()
+_registered_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    template_id: str
+    version: str
+    # (name, prompt, tools) per phase, in execution order
+    phases: Tuple[Tuple[str, str, Tuple[str, ...]], ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "templateId": self.template_id,
+            "version": self.version,
+            "phases": [
+                {"name": name, "prompt": prompt, "tools": list(tools)}
+                for name, prompt, tools in self.phases
+            ],
+        }
+
+
+def define_template(
+    template_id: str, prompts: Dict[str, str], tools: Dict[str, List[str]]
+) -> PromptTemplate:
+    """Template with one phase per entry of ``tools``, versioned by its content.
+
+    Raises ``ValueError`` for a prompt field other than a plain ``{name}``,
+    which readers outside Python could not render.
+    """
+    phases = tuple((name, str(prompts[name]), tuple(tools[name])) for name in tools)
+    for name, prompt, _ in phases:
+        for _, field, format_spec, conversion in _compile(prompt):
+            if field is not None and (
+                not field.isidentifier() or format_spec or conversion
+            ):
+                raise ValueError(
+                    f"Prompt {name} of template {template_id} uses field {{{field}}}; "
+                    "only plain {name} fields are supported"
+                )
+    version = hashlib.sha256(
+        json.dumps([template_id, phases]).encode()
+    ).hexdigest()[:16]
+    return PromptTemplate(template_id, version, phases)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(prompt: str) -> Tuple[Tuple[str, Optional[str], str, Optional[str]], ...]:
+    """``prompt`` split into (literal, field, format_spec, conversion) parts."""
+    return tuple(_formatter.parse(prompt))
+
+
+def _fields(template: PromptTemplate) -> set:
+    return {
+        field
+        for _, prompt, _ in template.phases
+        for _, field, _, _ in _compile(prompt)
+        if field is not None
+    }
+
+
+def _render_prompt(prompt: str, params: Dict[str, Any]) -> str:
+    # Same result as prompt.format_map(params) for the simple fields prompts use
+    parts = []
+    for literal, field, format_spec, conversion in _compile(prompt):
+        parts.append(literal)
+        if field is not None:
+            value = _formatter.get_field(field, (), params)[0]
+            value = _formatter.convert_field(value, conversion)
+            parts.append(format(value, format_spec))
+    return "".join(parts)
+
+
+def render(template: PromptTemplate, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The template's phases with prompts rendered: ``[{"prompt", "tools"}]``."""
+    return [
+        {"prompt": _render_prompt(prompt, params), "tools": list(tools)}
+        for _, prompt, tools in template.phases
+    ]
+
+
+def register(template: PromptTemplate) -> bool:
+    """Store the template version once; later calls in this process are free."""
+    key = (template.template_id, template.version)
+    if key in _registered:
+        return True
+    with _registered_lock:
+        if key in _registered:
+            return True
+        try:
+            prompt_templates_collection.update_one(
+                {"templateId": template.template_id, "version": template.version},
+                {
+                    "$setOnInsert": {
+                        **template.to_dict(),
+                        "createdAt": datetime.now(timezone.utc),
+                    }
+                },
+                upsert=True,
+            )
+        except PyMongoError as e:
+            log_error(e, f"Failed to register prompt template {key}", logToServer=False)
+            return False
+        _registered.add(key)
+        return True
+
+
+def reference_params(template: PromptTemplate, params: Dict[str, Any]) -> Dict[str, str]:
+    """The params a reference stores: the used ones, as ``format`` renders them."""
+    used = _fields(template)
+    return {name: format(value, "") for name, value in params.items() if name in used}
+
+
+def reference(template: PromptTemplate, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """``phasesData`` that points at the template; None if it could not be stored."""
+    if not register(template):
+        return None
+    return {
+        "templateId": template.template_id,
+        "version": template.version,
+        "params": reference_params(template, params),
+    }
+
+
+@functools.lru_cache(maxsize=64)
+def _load(template_id: str, version: str) -> PromptTemplate:
+    document = prompt_templates_collection.find_one(
+        {"templateId": template_id, "version": version}, {"_id": 0}
+    )
+    if document is None:
+        raise KeyError(f"Unknown prompt template {template_id} version {version}")
+    return PromptTemplate(
+        template_id,
+        version,
+        tuple(
+            (phase["name"], phase["prompt"], tuple(phase["tools"]))
+            for phase in document["phases"]
+        ),
+    )
+
+
+def render_phases_data(phases_data: Any) -> Any:
+    """Rendered phases for a todo's ``phasesData``; inline lists pass through.
+
+    Raises ``KeyError`` for a template that is not registered.
+    """
+    if not isinstance(phases_data, dict) or "templateId" not in phases_data:
+        return phases_data
+    template = _load(phases_data["templateId"], phases_data["version"])
+    return render(template, phases_data.get("params") or {})
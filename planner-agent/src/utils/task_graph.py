@@ -0,0 +1,184 @@
+"""Dependency graph of a plan's tasks.
+
+The planners validate the dependencies an LLM proposes for each task: a
+dependency that would close a cycle is rejected, and mutual dependencies are
+removed. ``TaskGraph`` keeps the tasks indexed by uuid with one adjacency set
+per task, so:
+
+- looking up a task is O(1) instead of a scan of the task list;
+- ``add_dependency`` checks only whether the new edge closes a cycle, by
+  searching from the dependency back to the task, O(V + E) at worst and
+  usually far less, instead of rebuilding and re-walking the whole plan;
+- ``remove_mutual_dependencies`` is one pass over the edges.
+
+Once a plan is validated, ``schedule`` prepares it for dispatch. It removes
+redundant edges (transitive reduction), then gives every task its ``wave``,
+the topological level at which all of its dependencies are done, and a
+``critical_path`` flag for tasks with no slack on the longest chain.
+Dependencies on uuids outside the plan do not affect either.
+
+Adjacency sets are insertion-ordered dicts, so dependency lists keep the
+order in which they were proposed.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class TaskGraph:
+    """Tasks indexed by uuid with the uuids each one depends on."""
+
+    def __init__(self, tasks: Iterable[Dict[str, Any]] = (), key: str = "dependency_tasks"):
+        self.key = key
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._dependencies: Dict[str, Dict[str, None]] = {}
+        for task in tasks:
+            self.add_task(task)
+
+    def __contains__(self, task_uuid: str) -> bool:
+        return task_uuid in self._tasks
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def add_task(self, task: Dict[str, Any]) -> None:
+        """Index ``task`` with the dependencies it already lists, unchecked."""
+        self._tasks[task["uuid"]] = task
+        self._dependencies[task["uuid"]] = dict.fromkeys(task.get(self.key) or [])
+
+    def task(self, task_uuid: str) -> Optional[Dict[str, Any]]:
+        return self._tasks.get(task_uuid)
+
+    def dependencies(self, task_uuid: str) -> List[str]:
+        return list(self._dependencies.get(task_uuid, ()))
+
+    def creates_cycle(self, task_uuid: str, dependency: str) -> bool:
+        """Would making ``task_uuid`` depend on ``dependency`` close a cycle?"""
+        if dependency == task_uuid:
+            return True
+        stack = [dependency]
+        seen = {dependency}
+        while stack:
+            for next_uuid in self._dependencies.get(stack.pop(), ()):
+                if next_uuid == task_uuid:
+                    return True
+                if next_uuid not in seen:
+                    seen.add(next_uuid)
+                    stack.append(next_uuid)
+        return False
+
+    def add_dependency(self, task_uuid: str, dependency: str) -> bool:
+        """Add the edge unless it closes a cycle; return whether it was added.
+
+        Dependencies on uuids outside the plan are kept, as before.
+        """
+        if self.creates_cycle(task_uuid, dependency):
+            return False
+        self._dependencies.setdefault(task_uuid, {})[dependency] = None
+        return True
+
+    def set_dependencies(
+        self, task_uuid: str, proposed: Iterable[str]
+    ) -> Tuple[List[str], List[str]]:
+        """Replace the task's dependencies with the acyclic subset of ``proposed``.
+
+        Dependencies are tried in order. Returns ``(accepted, rejected)``; the
+        accepted list is also written back to the task.
+        """
+        self._dependencies[task_uuid] = {}
+        rejected = [dep for dep in proposed if not self.add_dependency(task_uuid, dep)]
+        accepted = self.dependencies(task_uuid)
+        if task_uuid in self._tasks:
+            self._tasks[task_uuid][self.key] = accepted
+        return accepted, rejected
+
+    def remove_mutual_dependencies(self) -> List[Tuple[str, str]]:
+        """Drop one edge of every pair of tasks that depend on each other.
+
+        Tasks are visited in insertion order and the earlier task loses its
+        edge. Returns the removed ``(task, dependency)`` pairs.
+        """
+        removed = []
+        for task_uuid, dependencies in self._dependencies.items():
+            mutual = [dep for dep in dependencies if task_uuid in self._dependencies.get(dep, ())]
+            for dep in mutual:
+                del dependencies[dep]
+                removed.append((task_uuid, dep))
+            if mutual and task_uuid in self._tasks:
+                self._tasks[task_uuid][self.key] = list(dependencies)
+        return removed
+
+    def _topological_order(self) -> List[str]:
+        """Tasks with their in-plan dependencies first; the graph must be acyclic."""
+        order = []
+        state = {}  # uuid -> False while on the stack, True when done
+        for root in self._tasks:
+            if root in state:
+                continue
+            stack = [(root, iter(self._dependencies[root]))]
+            state[root] = False
+            while stack:
+                node, dependencies = stack[-1]
+                for dep in dependencies:
+                    if dep in self._tasks and dep not in state:
+                        state[dep] = False
+                        stack.append((dep, iter(self._dependencies[dep])))
+                        break
+                else:
+                    stack.pop()
+                    state[node] = True
+                    order.append(node)
+        return order
+
+    def transitive_reduction(self) -> List[Tuple[str, str]]:
+        """Drop edges implied by longer paths; return the removed pairs.
+
+        If A depends on B and C, and B already depends on C, the A -> C edge
+        adds no ordering and is removed. Descendant sets are int bitsets, so
+        this is O(V * E / word size).
+        """
+        order = self._topological_order()
+        bit = {task_uuid: 1 << index for index, task_uuid in enumerate(order)}
+        descendants = {}
+        removed = []
+        for task_uuid in order:
+            dependencies = self._dependencies[task_uuid]
+            in_plan = [dep for dep in dependencies if dep in bit]
+            reachable = 0
+            for dep in in_plan:
+                reachable |= descendants[dep]
+            redundant = [dep for dep in in_plan if bit[dep] & reachable]
+            for dep in redundant:
+                del dependencies[dep]
+                removed.append((task_uuid, dep))
+            if redundant:
+                self._tasks[task_uuid][self.key] = list(dependencies)
+            for dep in in_plan:
+                reachable |= bit[dep]
+            descendants[task_uuid] = reachable
+        return removed
+
+    def schedule(self) -> int:
+        """Reduce the graph, then set ``wave`` and ``critical_path`` on every task.
+
+        Returns the number of waves.
+        """
+        self.transitive_reduction()
+        order = self._topological_order()
+        wave = {}
+        for task_uuid in order:
+            wave[task_uuid] = 1 + max(
+                (wave[dep] for dep in self._dependencies[task_uuid] if dep in wave),
+                default=-1,
+            )
+        waves = 1 + max(wave.values(), default=-1)
+        # Latest wave each task could run in without delaying the plan
+        latest = {task_uuid: waves - 1 for task_uuid in order}
+        for task_uuid in reversed(order):
+            for dep in self._dependencies[task_uuid]:
+                if dep in latest:
+                    latest[dep] = min(latest[dep], latest[task_uuid] - 1)
+        for task_uuid in order:
+            task = self._tasks[task_uuid]
+            task["wave"] = wave[task_uuid]
+            task["critical_path"] = wave[task_uuid] == latest[task_uuid]
+        return waves
@@ -0,0 +1,85 @@
+"""Repository checkout shared by every phase of a workflow run."""
+
+from prometheus_swarm.utils.logging import log_key_value
+from src.utils.file_tree import get_current_files
+from src.utils.repo_cache import setup_repository, cleanup_repository
+
+
+class WorkspaceLease:
+    """A single repository checkout held for the lifetime of one workflow run.
+
+    The first ``acquire`` clones the repository and lists its files; later
+    calls reuse the existing checkout, so issue generation, validation,
+    per-issue decomposition and system prompt generation all share one clone
+    no matter how many issues a spec produces. ``release`` removes the
+    checkout; the lease can then be acquired again. With ``read_only`` the
+    checkout is a partial clone (see ``src.utils.partial_clone``).
+
+    The process working directory is never changed: callers pass
+    ``repo_path`` to the workspace tools, so leases of concurrent runs do not
+    interfere with each other.
+    """
+
+    def __init__(
+        self,
+        repo_url: str,
+        github_token: str = None,
+        github_username: str = None,
+        skip_fork: bool = False,
+        branch: str = None,
+        read_only: bool = False,
+    ):
+        self.repo_url = repo_url
+        self.github_token = github_token
+        self.github_username = github_username
+        self.skip_fork = skip_fork
+        self.branch = branch
+        self.read_only = read_only
+        self.repo_path = None
+        self.original_dir = None
+        self.current_files = None
+
+    @property
+    def active(self) -> bool:
+        """Whether the checkout currently exists."""
+        return self.repo_path is not None
+
+    def acquire(self) -> "WorkspaceLease":
+        """Clone the repository on first use."""
+        if self.active:
+            return self
+
+        setup_result = setup_repository(
+            self.repo_url,
+            github_token=self.github_token,
+            github_username=self.github_username,
+            skip_fork=self.skip_fork,
+            branch=self.branch,
+            read_only=self.read_only,
+        )
+        if not setup_result["success"]:
+            raise Exception(f"Failed to set up repository: {setup_result['message']}")
+
+        self.repo_path = setup_result["data"]["clone_path"]
+        self.original_dir = setup_result["data"]["original_dir"]
+        self.current_files = get_current_files(self.repo_path)
+        log_key_value("Workspace acquired", self.repo_path)
+        return self
+
+    def release(self) -> None:
+        """Remove the checkout."""
+        if not self.active:
+            return
+        try:
+            cleanup_repository(self.original_dir, self.repo_path)
+            log_key_value("Workspace released", self.repo_path)
+        finally:
+            self.repo_path = None
+            self.original_dir = None
+            self.current_files = None
+
+    def __enter__(self) -> "WorkspaceLease":
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
@@ -8,10 +8,11 @@ from src.workflows.audit import phases
 from prometheus_swarm.workflows.utils import (
     check_required_env_vars,
     validate_github_auth,
-    setup_repository,
-    get_current_files,
 )
-from prometheus_swarm.workflows.utils import cleanup_repository
+from src.utils.repo_cache import setup_repository, cleanup_repository
+from src.utils.file_tree import get_current_files
+from src.tools.workspace_operations import register_workspace_tools
+from src.utils.tracing import traced
 
 # from src.workflows.todocreator.utils import TaskModel, IssueModel, insert_issue_to_mongodb
 
@@ -65,7 +66,9 @@ class AuditWorkflow(Workflow):
             tasks=tasks,
             issueSpec=issueSpec,
         )
+        register_workspace_tools(client)
 
+    @traced("workflow.setup")
     def setup(self):
         """Set up repository and workspace."""
         # Set context values first
@@ -90,6 +93,7 @@ class AuditWorkflow(Workflow):
             self.context["repo_url"],
             github_token=os.getenv("GITHUB_TOKEN"),
             github_username=os.getenv("GITHUB_USERNAME"),
+            read_only=True,
         )
         if not setup_result["success"]:
             raise Exception(f"Failed to set up repository: {setup_result['message']}")
@@ -100,18 +104,11 @@ class AuditWorkflow(Workflow):
         self.context["fork_owner"] = setup_result["data"]["fork_owner"]
         self.context["fork_name"] = setup_result["data"]["fork_name"]
 
-        # Enter repo directory
-        os.chdir(self.context["repo_path"])
-
         # Get current files for context
-        self.context["current_files"] = get_current_files()
+        self.context["current_files"] = get_current_files(self.context["repo_path"])
 
     def cleanup(self):
         """Cleanup workspace."""
-        # Make sure we're not in the repo directory before cleaning up
-        if os.getcwd() == self.context.get("repo_path", ""):
-            os.chdir(self.original_dir)
-
         # Clean up the repository directory
         cleanup_repository(self.original_dir, self.context.get("repo_path", ""))
         # Clean up the MongoDB
@@ -3,14 +3,12 @@ from typing import List, Optional
 import uuid
 from datetime import datetime
 from pymongo.errors import ConnectionFailure, PyMongoError
-from .mongo_connection import MongoConnection
+from src.server.mongo_connection import collection
 from enum import Enum
 
-mongo_conn = MongoConnection()
-db = mongo_conn.get_database("builder247")
-todos_collection = db["todos"]
-issues_collection = db["issues"]
-system_prompts_collection = db["systemprompts"]
+todos_collection = collection("todos")
+issues_collection = collection("issues")
+system_prompts_collection = collection("systemprompts")
 
 
 class TodoStatus(str, Enum):
@@ -67,6 +65,12 @@ class TaskModel(BaseModel):
     dependencyTasks: List[str] = Field(
         default=[], description="List of dependency tasks"
     )
+    wave: int = Field(
+        default=0, description="Topological level; a wave runs once earlier waves are done"
+    )
+    criticalPath: bool = Field(
+        default=False, description="Whether the task is on the issue's critical path"
+    )
     status: TodoStatus | DocumentationStatus = Field(
         default=TodoStatus.INITIALIZED, description="Task status"
     )
@@ -128,6 +132,10 @@ class IssueModel(BaseModel):
     predecessorUuid: Optional[str] = Field(
         None, description="UUID of the immediately previous issue in the chain"
     )
+    planningComplete: bool = Field(
+        default=True,
+        description="False while the planner is still writing this issue's todos",
+    )
     createdAt: datetime = Field(
         default_factory=datetime.utcnow, description="Creation timestamp"
     )
@@ -159,10 +167,12 @@ def insert_task_to_mongodb(task: TaskModel) -> bool:
         return False
 
 
-def get_all_tasks_title_uuid_from_mongodb() -> List[dict]:
+def get_all_tasks_title_uuid_from_mongodb(bounty_id: str) -> List[dict]:
     try:
-        # Get all tasks from MongoDB
-        tasks = todos_collection.find({}, {"_id": 0, "title": 1, "uuid": 1})
+        # Get the bounty's tasks from MongoDB, served by the bountyId index
+        tasks = todos_collection.find(
+            {"bountyId": bounty_id}, {"_id": 0, "title": 1, "uuid": 1}, batch_size=1000
+        )
 
         # Convert cursor to list of dictionaries with only 'uuid' and 'title'
         return [{"uuid": task["uuid"], "title": task["title"]} for task in tasks]
@@ -8,12 +8,14 @@ from prometheus_swarm.utils.logging import log_key_value, log_error
 from src.workflows.docstodocreator import phases
 from prometheus_swarm.workflows.utils import (
     check_required_env_vars,
-    cleanup_repository,
     validate_github_auth,
-    setup_repository,
-    get_current_files,
 )
-from src.workflows.todocreator.utils import IssueModel, SwarmBountyType, SystemPromptModel, insert_issue_to_mongodb, insert_system_prompt_to_mongodb, insert_task_to_mongodb, TaskModel
+from src.utils.repo_cache import setup_repository, cleanup_repository
+from src.utils.file_tree import get_current_files
+from src.tools.workspace_operations import register_workspace_tools
+from src.workflows.todocreator.utils import IssueModel, SwarmBountyType, SystemPromptModel, insert_issue_to_mongodb, insert_system_prompt_to_mongodb, insert_tasks_to_mongodb, TaskModel
+from src.utils.budget import current_budget
+from src.utils.tracing import traced
 
 
 class Task:
@@ -67,8 +69,9 @@ class TodoCreatorWorkflow(Workflow):
             fork_url=fork_url,
             bounty_id=bounty_id,
         )
+        register_workspace_tools(client)
 
-
+    @traced("workflow.setup")
     def setup(self):
         """Set up repository and workspace."""
         check_required_env_vars(["GITHUB_TOKEN", "GITHUB_USERNAME"])
@@ -91,6 +94,7 @@ class TodoCreatorWorkflow(Workflow):
             self.context["repo_url"],
             github_token=os.getenv("GITHUB_TOKEN"),
             github_username=os.getenv("GITHUB_USERNAME"),
+            read_only=True,
         )
         if not setup_result["success"]:
             raise Exception(f"Failed to set up repository: {setup_result['message']}")
@@ -98,11 +102,8 @@ class TodoCreatorWorkflow(Workflow):
         self.context["repo_path"] = setup_result["data"]["clone_path"]
         self.original_dir = setup_result["data"]["original_dir"]
 
-        # Enter repo directory
-        os.chdir(self.context["repo_path"])
-
         # Get current files for context
-        self.context["current_files"] = get_current_files()
+        self.context["current_files"] = get_current_files(self.context["repo_path"])
 
         # Add feature spec to context
 
@@ -112,7 +113,7 @@ class TodoCreatorWorkflow(Workflow):
         # Make sure we're not in the repo directory before cleaning up
         cleanup_repository(self.original_dir, self.context.get("repo_path", ""))
     def generate_sections(self):
-        for _ in range(3):
+        for _ in current_budget().iterations("section_generation"):
             generate_sections_phase = phases.RepoSectionGenerationPhase(workflow=self)
             generate_sections_result = generate_sections_phase.execute()
             self.context["sections"] = generate_sections_result["data"]["sections"]
@@ -135,9 +136,9 @@ class TodoCreatorWorkflow(Workflow):
             }
         return {
             "success": False,
-            "message": "Section generation workflow failed after 3 attempts",
+            "message": "Section generation workflow failed: out of attempts or budget",
             "data": {
-                "sections": self.context["sections"],
+                "sections": self.context.get("sections"),
             },
         }
     def run(self):
@@ -238,7 +239,8 @@ class TodoCreatorWorkflow(Workflow):
     def insert_sections_to_mongodb(self):
         """Insert sections to MongoDB."""
         # Insert into MongoDB
-        for section in self.context["sections"]:
+        task_models = []
+        for index, section in enumerate(self.context["sections"]):
             try:
                 task_model = TaskModel(
                     title="Documentation",
@@ -248,19 +250,27 @@ class TodoCreatorWorkflow(Workflow):
                     repoOwner=self.context["repo_owner"],
                     repoName=self.context["repo_name"],
                     dependencyTasks=[],
-                    uuid=str(uuid.uuid4()),
+                    # Stable across retries of the same bounty, so sections are not duplicated
+                    uuid=str(
+                        uuid.uuid5(
+                            uuid.NAMESPACE_URL,
+                            f"{self.context['bounty_id']}/{index}/{section}",
+                        )
+                    ),
                     issueUuid=str(uuid.uuid4()),
                     bountyId=self.context["bounty_id"],
                 )
 
                 log_key_value("task_model", task_model)
-                insert_task_to_mongodb(task_model)
+                task_models.append(task_model)
             except Exception as e:
                 log_error(
                     e,
                     f"Failed to process task {section}",
                 )
                 continue
+        if not insert_tasks_to_mongodb(task_models):
+            log_error(Exception("Failed to insert tasks"), "Database insertion failed")
 
         # Return the final result
         return {
@@ -123,6 +123,14 @@ PROMPTS = {
         "with a list of uuids for any tasks it depends on.\n"
         "IMPORTANT: do not create circular dependencies.\n"
     ),
+    "dependency_tasks_batch": (
+        "Review the following tasks and determine, for every task, which other tasks it depends on.\n"
+        "Tasks:\n{subtasks}\n\n"
+        "Dependencies should always be one way, marking which tasks a task depends on.\n"
+        "Return one entry for every task: its uuid with a list of uuids of the tasks it depends on, "
+        "or an empty list if it has none.\n"
+        "IMPORTANT: do not create circular dependencies.\n"
+    ),
     "generate_system_prompts": (
         "Your task is to create a comprehensive system prompt that will guide an AI agent in implementing "
         "the entire feature and all its tasks:\n\n"
@@ -264,6 +272,15 @@ PROMPTS = {
         "with a list of uuids for any sections it depends on.\n"
         "IMPORTANT: do not create circular dependencies.\n"
     ),
+    "docs_dependency_tasks_batch": (
+        "Review the following documentation sections and determine, for every section, "
+        "which other sections it depends on.\n"
+        "Sections:\n{subtasks}\n\n"
+        "Dependencies should always be one way, marking which sections a section depends on.\n"
+        "Return one entry for every section: its uuid with a list of uuids of the sections it depends on, "
+        "or an empty list if it has none.\n"
+        "IMPORTANT: do not create circular dependencies.\n"
+    ),
     "docs_generate_system_prompts": (
         "Your task is to create a comprehensive system prompt that will guide an AI agent in creating "
         "documentation for the entire feature and all its sections:\n\n"
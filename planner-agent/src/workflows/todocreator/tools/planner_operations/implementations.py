@@ -166,6 +166,50 @@ def create_task_dependency(
             "data": None,
         }
 
+def create_task_dependencies(dependencies: List[Dict[str, Any]], **kwargs) -> dict:
+    """Create the task dependencies for every task of an issue in one call.
+
+    Args:
+        dependencies: List of entries, each containing:
+            - task_uuid: UUID of the task
+            - dependency_tasks: List of UUIDs of the tasks it depends on
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the operation succeeded
+            - message: Success/error message
+            - data: Dictionary containing:
+                - dependencies: Task UUID -> list of dependency UUIDs
+                - malformed: UUIDs of tasks whose entry could not be read
+    """
+    try:
+        edges = {}
+        malformed = []
+        for entry in dependencies or []:
+            if not isinstance(entry, dict) or not isinstance(entry.get("task_uuid"), str):
+                # Not attributable to a task; that task falls back to a per-task call
+                continue
+            dependency_tasks = entry.get("dependency_tasks")
+            if not isinstance(dependency_tasks, list) or not all(
+                isinstance(dep, str) for dep in dependency_tasks
+            ):
+                malformed.append(entry["task_uuid"])
+                continue
+            edges[entry["task_uuid"]] = dependency_tasks
+        return {
+            "success": True,
+            "message": f"Successfully created dependencies for {len(edges)} tasks",
+            "data": {"dependencies": edges, "malformed": malformed},
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Failed to create task dependencies: {str(e)}",
+            "data": None,
+        }
+
+
 
 def generate_issues(
     issues: List[Dict[str, Any]] = None,
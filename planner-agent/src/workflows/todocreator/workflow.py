@@ -7,18 +7,20 @@ from prometheus_swarm.utils.logging import log_key_value, log_error
 from src.workflows.todocreator import phases
 from prometheus_swarm.workflows.utils import (
     check_required_env_vars,
-    cleanup_repository,
     validate_github_auth,
-    setup_repository,
-    get_current_files,
 )
+from src.utils.workspace import WorkspaceLease
+from src.tools.workspace_operations import register_workspace_tools
 from src.workflows.todocreator.utils import (
     TaskModel,
-    insert_task_to_mongodb,
+    insert_tasks_to_mongodb,
     SystemPromptModel,
     insert_system_prompt_to_mongodb,
     SwarmBountyType,
 )
+from src.utils.budget import current_budget
+from src.utils.task_graph import TaskGraph
+from src.utils.tracing import traced
 
 
 class Task:
@@ -79,57 +81,69 @@ class TodoCreatorWorkflow(Workflow):
 
         self.bounty_type = bounty_type
         self.issue_spec = issue_spec
-
-    def setup(self):
-        """Set up repository and workspace."""
-        check_required_env_vars(["GITHUB_TOKEN", "GITHUB_USERNAME"])
-        validate_github_auth(os.getenv("GITHUB_TOKEN"), os.getenv("GITHUB_USERNAME"))
-
-        # Get the default branch from GitHub
-        try:
-            gh = Github(os.getenv("GITHUB_TOKEN"))
-            repo = gh.get_repo(
-                f"{self.context['repo_owner']}/{self.context['repo_name']}"
-            )
-            self.context["base_branch"] = repo.default_branch
-            log_key_value("Default branch", self.context["base_branch"])
-        except Exception as e:
-            log_error(e, "Failed to get default branch, using 'main'")
-            self.context["base_branch"] = "main"
-
-        # Set up repository directory
-        setup_result = setup_repository(
-            self.context["repo_url"],
+        self.original_dir = None
+        self.workspace = WorkspaceLease(
+            source_url,
             github_token=os.getenv("GITHUB_TOKEN"),
             github_username=os.getenv("GITHUB_USERNAME"),
+            read_only=True,
         )
-        if not setup_result["success"]:
-            raise Exception(f"Failed to set up repository: {setup_result['message']}")
+        register_workspace_tools(client)
 
-        self.context["repo_path"] = setup_result["data"]["clone_path"]
-        self.original_dir = setup_result["data"]["original_dir"]
+    @traced("workflow.setup")
+    def setup(self):
+        """Set up repository and workspace.
+
+        The checkout is leased once per run; calling this again reuses it.
+        """
+        if not self.workspace.active:
+            check_required_env_vars(["GITHUB_TOKEN", "GITHUB_USERNAME"])
+            validate_github_auth(
+                os.getenv("GITHUB_TOKEN"), os.getenv("GITHUB_USERNAME")
+            )
 
-        # Enter repo directory
-        os.chdir(self.context["repo_path"])
+            # Get the default branch from GitHub
+            try:
+                gh = Github(os.getenv("GITHUB_TOKEN"))
+                repo = gh.get_repo(
+                    f"{self.context['repo_owner']}/{self.context['repo_name']}"
+                )
+                self.context["base_branch"] = repo.default_branch
+                log_key_value("Default branch", self.context["base_branch"])
+            except Exception as e:
+                log_error(e, "Failed to get default branch, using 'main'")
+                self.context["base_branch"] = "main"
 
-        # Get current files for context
-        self.context["current_files"] = get_current_files()
+        # Clone on the first call only
+        self.workspace.acquire()
+        self.context["repo_path"] = self.workspace.repo_path
+        self.original_dir = self.workspace.original_dir
+        self.context["current_files"] = self.workspace.current_files
 
         # Add feature spec to context
         self.context["issue_spec"] = self.issue_spec
 
     def cleanup(self):
         """Cleanup workspace."""
-        # Make sure we're not in the repo directory before cleaning up
-        cleanup_repository(self.original_dir, self.context.get("repo_path", ""))
+        self.workspace.release()
 
     def run(self):
+        """Run the workflow, releasing the shared workspace once at the end."""
+        try:
+            return self._run()
+        finally:
+            self.cleanup()
+
+    def _run(self):
         generate_issues_result = self.generate_issues()
         self.context["issues"] = generate_issues_result["data"]["issues"]
         approved_issues = False
-        while not approved_issues:
+        # Out of validation attempts or budget, go on with the issues generated
+        for _ in current_budget().iterations("issue_validation"):
             validate_issues_result = self.validate_issues()
             approved_issues = validate_issues_result["data"]["approved"]
+            if approved_issues:
+                break
         tasks = []
         self.context["issues"] = generate_issues_result["data"]["issues"]
 
@@ -302,78 +316,56 @@ class TodoCreatorWorkflow(Workflow):
             # save the regenerated tasks in the context, prepare for the dependency phase
             self.context["subtasks"] = tasks_data
             # ==================== Dependency Phase ====================
-            # # TODO: Refine the Dependency Phase
+            # One batched call; only missing or malformed entries fall back to a call per task
+            graph = TaskGraph(tasks_data)
+            proposals = self.infer_all_dependencies()
             for task in tasks_data:
-                self.context["target_task"] = task
-                dependency_phase = phases.TaskDependencyPhase(workflow=self, bounty_type=self.bounty_type)
-                dependency_result = dependency_phase.execute()
-                if dependency_result is None or not dependency_result.get("success"):
+                proposed_dependencies = proposals.get(task["uuid"])
+                if proposed_dependencies is None:
+                    proposed_dependencies = self.infer_task_dependencies(task)
+                if proposed_dependencies is None:
+                    graph.set_dependencies(task["uuid"], [])
+                    continue
+                # Dependencies that would create a cycle are skipped; the rest are kept
+                _, rejected = graph.set_dependencies(task["uuid"], proposed_dependencies)
+                for dep in rejected:
                     log_error(
-                        Exception(
-                            dependency_result.get("error", "No result")
-                            if dependency_result
-                            else "No results returned from phase"
-                        ),
-                        "Task dependency failed, continuing with empty dependencies",
+                        Exception("Circular dependency detected"),
+                        f"Dependency {dep} for task {task['title']} would create a circular dependency, skipping it",
                     )
-                    task["dependency_tasks"] = []
-                    continue
-                # Check for circular dependencies
-                log_key_value("Proposed dependencies", dependency_result)
-                proposed_dependencies = dependency_result["data"].get(task["uuid"], [])
-                # Check each dependency individually to find which ones create circular dependencies
-                valid_dependencies = []
-                for dep in proposed_dependencies:
-                    # Temporarily add this dependency to check if it creates a cycle
-                    temp_deps = valid_dependencies + [dep]
-                    if not self.check_circular_dependency(
-                        task["uuid"], temp_deps, tasks_data
-                    ):
-                        valid_dependencies.append(dep)
-                    else:
-                        log_error(
-                            Exception("Circular dependency detected"),
-                            f"Dependency {dep} for task {task['title']} would create a circular dependency, skipping it",
-                        )
-                task["dependency_tasks"] = valid_dependencies
             # check if the dependency tasks are not mutual dependency
-            for task in tasks_data:
-                if task["dependency_tasks"]:
-                    for dep in task["dependency_tasks"]:
-                        # Find the dependent task
-                        dep_task = next(
-                            (t for t in tasks_data if t["uuid"] == dep), None
-                        )
-                        if dep_task and task["uuid"] in dep_task.get(
-                            "dependency_tasks", []
-                        ):
-                            log_error(
-                                Exception("Mutual dependency detected"),
-                                f"Task {task['title']} and {dep_task['title']} have a mutual dependency, removing it",
-                            )
-                            task["dependency_tasks"].remove(dep)
+            for task_uuid, dep in graph.remove_mutual_dependencies():
+                log_error(
+                    Exception("Mutual dependency detected"),
+                    f"Task {graph.task(task_uuid)['title']} and {graph.task(dep)['title']} have a mutual dependency, removing it",
+                )
+            log_key_value("Execution waves", graph.schedule())
             log_key_value("Tasks after dependency phase", len(tasks_data))
             # ==================== MongoDB Insertion Phase ====================
             # Insert into MongoDB
+            task_models = []
             for task in tasks_data:
                 try:
                     # Check if task UUID exists in decisions and has a decision value
                     if task["uuid"] in decisions and decisions[task["uuid"]].get(
                         "decision", False
                     ):
-                        task_model = TaskModel(
-                            title=task["title"],
-                            description=task["description"],
-                            acceptanceCriteria=task["acceptance_criteria"],
-                            repoOwner=self.context["repo_owner"],
-                            repoName=self.context["repo_name"],
-                            dependencyTasks=task["dependency_tasks"],
-                            uuid=task["uuid"],
-                            issueUuid=issue_uuid,
-                            bountyId=self.context["bounty_id"],
-                            bountyType=self.bounty_type,
+                        task_models.append(
+                            TaskModel(
+                                title=task["title"],
+                                description=task["description"],
+                                acceptanceCriteria=task["acceptance_criteria"],
+                                repoOwner=self.context["repo_owner"],
+                                repoName=self.context["repo_name"],
+                                dependencyTasks=task["dependency_tasks"],
+                                wave=task.get("wave", 0),
+                                criticalPath=task.get("critical_path", False),
+                                uuid=task["uuid"],
+                                issueUuid=issue_uuid,
+                                bountyId=self.context["bounty_id"],
+                                bountyType=self.bounty_type,
+                            )
                         )
-                        insert_task_to_mongodb(task_model)
                 except Exception as e:
                     log_error(
                         e,
@@ -381,6 +373,11 @@ class TodoCreatorWorkflow(Workflow):
                         f"with UUID {task.get('uuid', 'unknown')}",
                     )
                     continue
+            if not insert_tasks_to_mongodb(task_models):
+                log_error(
+                    Exception("Failed to insert tasks"),
+                    f"Database insertion failed for issue {issue_uuid}",
+                )
 
             # Return the final result
             return {
@@ -396,8 +393,46 @@ class TodoCreatorWorkflow(Workflow):
                 "message": f"Task decomposition workflow failed: {str(e)}",
                 "data": None,
             }
-        finally:
-            self.cleanup()
+
+    def infer_all_dependencies(self):
+        """Dependencies of every task in ``subtasks`` from one phase call.
+
+        Returns only well-formed entries; empty if the phase failed.
+        """
+        dependencies_phase = phases.TaskDependenciesPhase(workflow=self, bounty_type=self.bounty_type)
+        dependencies_result = dependencies_phase.execute()
+        if dependencies_result is None or not dependencies_result.get("success"):
+            log_error(
+                Exception(
+                    dependencies_result.get("error", "No result")
+                    if dependencies_result
+                    else "No results returned from phase"
+                ),
+                "Batched task dependency failed, falling back to one call per task",
+            )
+            return {}
+        log_key_value("Proposed dependencies", dependencies_result)
+        if dependencies_result["data"]["malformed"]:
+            log_key_value("Malformed dependency entries", dependencies_result["data"]["malformed"])
+        return dependencies_result["data"]["dependencies"]
+
+    def infer_task_dependencies(self, task):
+        """Dependencies of one task from its own phase call; None if it failed."""
+        self.context["target_task"] = task
+        dependency_phase = phases.TaskDependencyPhase(workflow=self, bounty_type=self.bounty_type)
+        dependency_result = dependency_phase.execute()
+        if dependency_result is None or not dependency_result.get("success"):
+            log_error(
+                Exception(
+                    dependency_result.get("error", "No result")
+                    if dependency_result
+                    else "No results returned from phase"
+                ),
+                "Task dependency failed, continuing with empty dependencies",
+            )
+            return None
+        log_key_value("Proposed dependencies", dependency_result)
+        return dependency_result["data"].get(task["uuid"], [])
 
     def generate_system_prompts(self, issues, tasks):
         """Execute the system prompt generation workflow."""
@@ -440,50 +475,3 @@ class TodoCreatorWorkflow(Workflow):
                 "message": f"System prompt generation workflow failed: {str(e)}",
                 "data": {"prompt": None},
             }
-
-    def check_circular_dependency(
-        self, task_uuid: str, dependency_tasks: list[str], all_tasks: list[dict]
-    ) -> bool:
-        """Check if adding a dependency would create a circular dependency.
-
-        Args:
-            task_uuid: The UUID of the current task
-            dependency_tasks: List of task UUIDs that are dependencies
-            all_tasks: List of all tasks with their dependencies
-
-        Returns:
-            bool: True if adding the dependency would create a circular dependency
-        """
-        visited = set()
-        path = set()
-
-        def has_cycle(current_uuid: str) -> bool:
-            if current_uuid in path:
-                return True
-            if current_uuid in visited:
-                return False
-
-            visited.add(current_uuid)
-            path.add(current_uuid)
-
-            # Find the task in all_tasks
-            current_task = next(
-                (t for t in all_tasks if t["uuid"] == current_uuid), None
-            )
-            if current_task:
-                for dep_uuid in current_task.get("dependency_tasks", []):
-                    if has_cycle(dep_uuid):
-                        return True
-
-            path.remove(current_uuid)
-            return False
-
-        # Add the new dependencies temporarily for checking
-        current_task = next((t for t in all_tasks if t["uuid"] == task_uuid), None)
-        if current_task:
-            original_deps = current_task.get("dependency_tasks", [])
-            current_task["dependency_tasks"] = dependency_tasks
-            has_circular = has_cycle(task_uuid)
-            current_task["dependency_tasks"] = original_deps
-            return has_circular
-        return False
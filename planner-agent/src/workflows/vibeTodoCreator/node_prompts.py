@@ -1,5 +1,7 @@
 """Prompts for the task workflow."""
 
+from src.utils.prompt_templates import define_template
+
 FEATURE_BUILDER_PROMPTS = {
     "create_branch": (
         "Create a descriptive branch name for the following task: {info}. The branch name should:\n"
@@ -177,4 +179,11 @@ RECOMMENDED_TOOLS_FOR_DOCUMENT_SUMMARIZER = {
     "create_branch": ["create_branch"],
     "consolidated_phase": ['write_file', 'read_file', 'list_directory_contents', 'create_pull_request_legacy'],
     "create_pr": ["read_file", "search_code", "list_directory_contents", "create_pull_request_legacy"]
-}
\ No newline at end of file
+}
+
+FEATURE_BUILDER_TEMPLATE = define_template(
+    "feature-builder", FEATURE_BUILDER_PROMPTS, RECOMMENDED_TOOLS_FOR_FEATURE_BUILDER
+)
+DOCUMENT_SUMMARIZER_TEMPLATE = define_template(
+    "document-summarizer", DOCUMENT_SUMMARIZER_PROMPTS, RECOMMENDED_TOOLS_FOR_DOCUMENT_SUMMARIZER
+)
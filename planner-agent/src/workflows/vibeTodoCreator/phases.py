@@ -103,6 +103,21 @@ class TaskDependencyPhase(WorkflowPhase):
         )
 
 
+class TaskDependenciesPhase(WorkflowPhase):
+    def __init__(self, workflow: Workflow, conversation_id: str = None, bounty_type: SwarmBountyType = None):
+        prompt_name = "docs_dependency_tasks_batch" if bounty_type == SwarmBountyType.DOCUMENT_SUMMARIZER else "dependency_tasks_batch"
+        super().__init__(
+            workflow=workflow,
+            prompt_name=prompt_name,
+            available_tools=[
+                "read_file",
+                "create_task_dependencies",
+            ],
+            conversation_id=conversation_id,
+            name="Task Dependencies",
+        )
+
+
 class SystemPromptGenerationPhase(WorkflowPhase):
     def __init__(self, workflow: Workflow, conversation_id: str = None, bounty_type: SwarmBountyType = None):
         prompt_name = "docs_generate_system_prompts" if bounty_type == SwarmBountyType.DOCUMENT_SUMMARIZER else "generate_system_prompts"
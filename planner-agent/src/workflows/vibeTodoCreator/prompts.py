@@ -78,6 +78,14 @@ PROMPTS = {
         "with a list of uuids for any tasks it depends on.\n"
         "IMPORTANT: do not create circular dependencies.\n"
     ),
+    "dependency_tasks_batch": (
+        "Review the following tasks and determine, for every task, which other tasks it depends on.\n"
+        "Tasks:\n{subtasks}\n\n"
+        "Dependencies should always be one way, marking which tasks a task depends on.\n"
+        "Return one entry for every task: its uuid with a list of uuids of the tasks it depends on, "
+        "or an empty list if it has none.\n"
+        "IMPORTANT: do not create circular dependencies.\n"
+    ),
 
 
     ###################################DOCS PROMPTS##########################################
@@ -147,6 +155,15 @@ PROMPTS = {
         "Link target section UUID with dependent section UUIDs.\n"
         "Avoid circular dependencies."
     ),
+    "docs_dependency_tasks_batch": (
+        "Review the following documentation sections and determine, for every section, "
+        "which other sections it depends on.\n"
+        "Sections:\n{subtasks}\n\n"
+        "Dependencies should always be one way, marking which sections a section depends on.\n"
+        "Return one entry for every section: its uuid with a list of uuids of the sections it depends on, "
+        "or an empty list if it has none.\n"
+        "IMPORTANT: do not create circular dependencies.\n"
+    ),
     "docs_generate_system_prompts": (
         "Create a system prompt for documentation generation:\n\n"
         "Sections: {issues}\n"
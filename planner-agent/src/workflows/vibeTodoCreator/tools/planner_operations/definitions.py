@@ -3,6 +3,7 @@ from src.workflows.vibeTodoCreator.tools.planner_operations.implementations impo
     validate_tasks,
     regenerate_tasks,
     create_task_dependency,
+    create_task_dependencies,
     generate_issues,
     audit_tasks,
     generate_system_prompt,
@@ -196,6 +197,38 @@ DEFINITIONS = {
         "final_tool": True,
         "function": create_task_dependency,
     },
+    "create_task_dependencies": {
+        "name": "create_task_dependencies",
+        "description": "Create the task dependencies for all tasks in one call.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "dependencies": {
+                    "type": "array",
+                    "description": "One entry for every task, including tasks with no dependencies",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "task_uuid": {
+                                "type": "string",
+                                "description": "UUID of the task",
+                            },
+                            "dependency_tasks": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "UUIDs of the tasks it depends on",
+                            },
+                        },
+                        "required": ["task_uuid", "dependency_tasks"],
+                    },
+                },
+            },
+            "required": ["dependencies"],
+            "additionalProperties": False,
+        },
+        "final_tool": True,
+        "function": create_task_dependencies,
+    },
     "generate_issues": {
         "name": "generate_issues",
         "description": "Generate a JSON file containing issues from a feature breakdown.",
@@ -3,14 +3,12 @@ from typing import List, Optional, Dict
 import uuid
 from datetime import datetime
 from pymongo.errors import ConnectionFailure, PyMongoError
-from src.server.mongo_connection import MongoConnection
+from src.server.mongo_connection import collection, get_client, upsert_by_uuid
 from enum import Enum
 
-mongo_conn = MongoConnection()
-db = mongo_conn.get_database("builder247")
-todos_collection = db["todos"]
-issues_collection = db["issues"]
-system_prompts_collection = db["systemprompts"]
+todos_collection = collection("todos")
+issues_collection = collection("issues")
+system_prompts_collection = collection("systemprompts")
 
 
 class TodoStatus(str, Enum):
@@ -54,6 +52,12 @@ class PhaseData(BaseModel):
     tools: List[str] = Field(..., description="List of tools for this phase")
 
 
+class PhasesTemplateRef(BaseModel):
+    templateId: str = Field(..., description="Prompt template ID")
+    version: str = Field(..., description="Prompt template version")
+    params: Dict = Field(default={}, description="Values the template's prompts are rendered with")
+
+
 class NewTaskModel(BaseModel):
     title: str = Field(..., description="Task title")
     description: str = Field(..., description="Task description")
@@ -64,7 +68,9 @@ class NewTaskModel(BaseModel):
     acceptanceCriteria: List[str] = Field(..., description="Acceptance criteria")
     repoOwner: str = Field(..., description="Repository owner")
     repoName: str = Field(..., description="Repository name")
-    phasesData: List[PhaseData] = Field(..., description="Phases data with prompts and tools")
+    phasesData: List[PhaseData] | PhasesTemplateRef = Field(
+        ..., description="Phases data with prompts and tools, or a prompt template reference"
+    )
     issueUuid: str = Field(..., description="Issue UUID")
     assignedTo: List[TaskAssignedInfo] = Field(
         default=[], description="List of assigned agents"
@@ -73,6 +79,12 @@ class NewTaskModel(BaseModel):
     dependencyTasks: List[str] = Field(
         default=[], description="List of dependency tasks"
     )
+    wave: int = Field(
+        default=0, description="Topological level; a wave runs once earlier waves are done"
+    )
+    criticalPath: bool = Field(
+        default=False, description="Whether the task is on the issue's critical path"
+    )
     status: TodoStatus | DocumentationStatus = Field(
         default=TodoStatus.INITIALIZED, description="Task status"
     )
@@ -134,6 +146,10 @@ class IssueModel(BaseModel):
     predecessorUuid: Optional[str] = Field(
         None, description="UUID of the immediately previous issue in the chain"
     )
+    planningComplete: bool = Field(
+        default=True,
+        description="False while the planner is still writing this issue's todos",
+    )
     createdAt: datetime = Field(
         default_factory=datetime.utcnow, description="Creation timestamp"
     )
@@ -165,10 +181,12 @@ def insert_task_to_mongodb(task: NewTaskModel) -> bool:
         return False
 
 
-def get_all_tasks_title_uuid_from_mongodb() -> List[dict]:
+def get_all_tasks_title_uuid_from_mongodb(bounty_id: str) -> List[dict]:
     try:
-        # Get all tasks from MongoDB
-        tasks = todos_collection.find({}, {"_id": 0, "title": 1, "uuid": 1})
+        # Get the bounty's tasks from MongoDB, served by the bountyId index
+        tasks = todos_collection.find(
+            {"bountyId": bounty_id}, {"_id": 0, "title": 1, "uuid": 1}, batch_size=1000
+        )
 
         # Convert cursor to list of dictionaries with only 'uuid' and 'title'
         return [{"uuid": task["uuid"], "title": task["title"]} for task in tasks]
@@ -227,12 +245,15 @@ def bulk_insert_issues_and_todos(issues: List[IssueModel], todos: List[NewTaskMo
     """Bulk insert issues and todos into MongoDB."""
     try:
         # Start a session for the transaction
-        with mongo_conn.client.start_session() as session:
+        with get_client().start_session() as session:
             with session.start_transaction():
-                for issue in issues:
-                    issues_collection.insert_one(issue.to_dict(), session=session)
-                for todo in todos:
-                    todos_collection.insert_one(todo.to_dict(), session=session)
+                # Keyed on uuid, so retrying a plan never duplicates documents
+                upsert_by_uuid(
+                    issues_collection, (issue.to_dict() for issue in issues), session=session
+                )
+                upsert_by_uuid(
+                    todos_collection, (todo.to_dict() for todo in todos), session=session
+                )
 
         return True
     except ConnectionFailure:
@@ -242,6 +263,35 @@ def bulk_insert_issues_and_todos(issues: List[IssueModel], todos: List[NewTaskMo
         print(f"MongoDB error: {e}")
         return False
 
+def complete_issue_planning(
+    issue: IssueModel, todos: List[NewTaskModel], planned: bool = True
+) -> bool:
+    """Write one issue with its todos, then mark the issue's planning complete.
+
+    The issue is inserted with ``planningComplete`` False and flagged only after
+    every todo is stored, so a reader that sees the flag sees the whole plan.
+    An issue whose decomposition failed (``planned`` False) stays unflagged,
+    which keeps the middle server from assigning it or its successors.
+    """
+    try:
+        upsert_by_uuid(
+            issues_collection, [issue.model_copy(update={"planningComplete": False}).to_dict()]
+        )
+        upsert_by_uuid(todos_collection, (todo.to_dict() for todo in todos))
+        if planned:
+            issues_collection.update_one(
+                {"uuid": issue.uuid},
+                {"$set": {"planningComplete": True, "updatedAt": datetime.utcnow()}},
+            )
+        return True
+    except ConnectionFailure:
+        print("MongoDB connection failed")
+        return False
+    except PyMongoError as e:
+        print(f"MongoDB error: {e}")
+        return False
+
+
 if __name__ == "__main__":
     task = NewTaskModel(
         title="Test Task",
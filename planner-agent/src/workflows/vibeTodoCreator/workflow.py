@@ -1,36 +1,57 @@
 """Task decomposition workflow implementation."""
 
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from github import Github
 from prometheus_swarm.workflows.base import Workflow
 from prometheus_swarm.utils.logging import log_key_value, log_error
 from src.workflows.vibeTodoCreator import phases
 from prometheus_swarm.workflows.utils import (
     check_required_env_vars,
-    cleanup_repository,
     validate_github_auth,
-    setup_repository,
-    get_current_files,
 )
+from src.utils.workspace import WorkspaceLease
+from src.tools.workspace_operations import register_workspace_tools
 from src.workflows.vibeTodoCreator.utils import (
     IssueModel,
     NewTaskModel,
     bulk_insert_issues_and_todos,
+    complete_issue_planning,
     SystemPromptModel,
     insert_system_prompt_to_mongodb,
     SwarmBountyType,
 )
-from src.workflows.vibeTodoCreator.node_prompts import FEATURE_BUILDER_PROMPTS, DOCUMENT_SUMMARIZER_PROMPTS, RECOMMENDED_TOOLS_FOR_FEATURE_BUILDER, RECOMMENDED_TOOLS_FOR_DOCUMENT_SUMMARIZER
+from src.workflows.vibeTodoCreator.node_prompts import (
+    FEATURE_BUILDER_PROMPTS,
+    DOCUMENT_SUMMARIZER_PROMPTS,
+    RECOMMENDED_TOOLS_FOR_FEATURE_BUILDER,
+    RECOMMENDED_TOOLS_FOR_DOCUMENT_SUMMARIZER,
+    FEATURE_BUILDER_TEMPLATE,
+    DOCUMENT_SUMMARIZER_TEMPLATE,
+)
 
 from src.workflows.vibeTodoCreator.utils import (
     PhaseData,
+    PhasesTemplateRef,
     # RECOMMENDED_TOOLS_FOR_FEATURE_BUILDER,
     # RECOMMENDED_TOOLS_FOR_DOCUMENT_SUMMARIZER,
     # FEATURE_BUILDER_PROMPTS,
     # DOCUMENT_SUMMARIZER_PROMPTS,
 )
+from src.utils import plan_cache, plan_checkpoint, prompt_templates
+from src.utils.budget import current_budget
+from src.utils.prompt_templates import PROMPT_TEMPLATE_REFS
+from src.utils.task_graph import TaskGraph
+from src.utils.tracing import bind, traced
+
+# Issues decomposed at once; 1 decomposes them one after another
+ISSUE_CONCURRENCY = int(os.getenv("PLAN_ISSUE_CONCURRENCY", "4"))
+# One attempt plus three retries, unless the run's budget runs out first
+ISSUE_GENERATION_ATTEMPTS = 4
+# Write each issue's todos as soon as it is planned instead of all at the end
+PLAN_STREAMING = os.getenv("PLAN_STREAMING", "false").lower() in ("1", "true", "yes")
 
 class Task:
     """Represents a single task with info, tools and acceptance criteria."""
@@ -93,6 +114,19 @@ class Task:
 #             uuid=data["uuid"],
 #             dependency_tasks=data.get("dependency_tasks", []),
 
+@dataclass
+class IssueScope:
+    """What a phase needs from the workflow, with a context private to one issue.
+
+    Issues are decomposed concurrently, so each gets its own copy of the
+    context instead of sharing ``current_issue``/``subtasks``/``target_task``.
+    """
+
+    client: Any
+    prompts: Dict[str, Any]
+    context: Dict[str, Any]
+
+
 class TodoCreatorWorkflow(Workflow):
     """Main workflow for creating and managing tasks."""
 
@@ -132,49 +166,58 @@ class TodoCreatorWorkflow(Workflow):
         self.repo_path = None
         self.original_dir = None
         self.base_branch = "main"
+        self.head_sha = None
+        self.spec_hash = plan_cache.spec_digest(issue_spec)
+        # issue uuid -> validated tasks restored from this bounty's checkpoint
+        self.checkpoint_tasks = {}
+        self.workspace = WorkspaceLease(
+            source_url,
+            github_token=os.getenv("GITHUB_TOKEN"),
+            github_username=os.getenv("GITHUB_USERNAME"),
+            read_only=True,
+        )
+        register_workspace_tools(client)
 
+    @traced("workflow.setup")
     def setup(self) -> None:
-        """Set up repository and workspace."""
-        check_required_env_vars(["GITHUB_TOKEN", "GITHUB_USERNAME"])
-        validate_github_auth(os.getenv("GITHUB_TOKEN"), os.getenv("GITHUB_USERNAME"))
+        """Set up repository and workspace.
+
+        The checkout is leased once per run; calling this again reuses it.
+        """
+        if not self.workspace.active:
+            check_required_env_vars(["GITHUB_TOKEN", "GITHUB_USERNAME"])
+            validate_github_auth(os.getenv("GITHUB_TOKEN"), os.getenv("GITHUB_USERNAME"))
+            if self.head_sha is None:
+                self._get_default_branch()
 
-        self._get_default_branch()
         self._setup_repository()
-        self._get_current_files()
+        self.context["current_files"] = self.workspace.current_files
         self.context["issue_spec"] = self.issue_spec
 
     def cleanup(self) -> None:
         """Cleanup workspace."""
-        if self.original_dir and self.repo_path:
-            cleanup_repository(self.original_dir, self.repo_path)
+        self.workspace.release()
+        self.repo_path = None
+        self.original_dir = None
 
     def _get_default_branch(self) -> None:
-        """Get the default branch from GitHub."""
+        """Get the default branch and its HEAD commit from GitHub."""
         try:
             gh = Github(os.getenv("GITHUB_TOKEN"))
             repo = gh.get_repo(f"{self.repo_owner}/{self.repo_name}")
             self.base_branch = repo.default_branch
             log_key_value("Default branch", self.base_branch)
+            self.head_sha = repo.get_branch(self.base_branch).commit.sha
+            log_key_value("HEAD", self.head_sha)
         except Exception as e:
             log_error(e, "Failed to get default branch, using 'main'")
 
     def _setup_repository(self) -> None:
-        """Set up repository directory."""
-        setup_result = setup_repository(
-            self.repo_url,
-            github_token=os.getenv("GITHUB_TOKEN"),
-            github_username=os.getenv("GITHUB_USERNAME"),
-        )
-        if not setup_result["success"]:
-            raise Exception(f"Failed to set up repository: {setup_result['message']}")
-
-        self.repo_path = setup_result["data"]["clone_path"]
-        self.original_dir = setup_result["data"]["original_dir"]
-        os.chdir(self.repo_path)
-
-    def _get_current_files(self) -> None:
-        """Get current files for context."""
-        return get_current_files()
+        """Acquire the workspace lease."""
+        self.workspace.acquire()
+        self.repo_path = self.workspace.repo_path
+        self.context["repo_path"] = self.repo_path
+        self.original_dir = self.workspace.original_dir
 
     def save_task_to_mongodb(self, task:Task, issue_uuid: str) -> None:
         """Save task to MongoDB."""
@@ -196,140 +239,100 @@ class TodoCreatorWorkflow(Workflow):
                 f"Failed to process task {task.title} with UUID {task.uuid}",
             )
 
-    def check_circular_dependency(
-        self, task_uuid: str, dependency_tasks: List[str], all_tasks: List[Task]
-    ) -> bool:
-        """Check if adding a dependency would create a circular dependency."""
-        visited = set()
-        path = set()
-
-        def has_cycle(current_uuid: str) -> bool:
-            if current_uuid in path:
-                return True
-            if current_uuid in visited:
-                return False
-
-            visited.add(current_uuid)
-            path.add(current_uuid)
+    def run(self) -> Dict[str, Any]:
+        """Execute the main workflow, releasing the shared workspace once at the end."""
+        try:
+            return self._run()
+        finally:
+            self.cleanup()
 
-            current_task = next(
-                (t for t in all_tasks if t.uuid == current_uuid), None
+    def _run(self) -> Dict[str, Any]:
+        cache_key = self._plan_cache_key()
+        if cache_key:
+            cached_plan = plan_cache.lookup(cache_key)
+            if cached_plan:
+                result = self._materialize_cached_plan(cached_plan)
+                if result:
+                    return result
+
+        checkpoint = plan_checkpoint.load(self.context["bounty_id"], self.spec_hash)
+        if checkpoint:
+            self.checkpoint_tasks = checkpoint["tasks"]
+            log_key_value(
+                "Resuming from checkpoint",
+                f"{len(checkpoint['issues'])} issues, {len(self.checkpoint_tasks)} decomposed",
             )
-            if current_task:
-                for dep_uuid in current_task.dependency_tasks or []:
-                    if has_cycle(dep_uuid):
-                        return True
-
-            path.remove(current_uuid)
-            return False
-
-        current_task = next((t for t in all_tasks if t.uuid == task_uuid), None)
-        if current_task:
-            original_deps = current_task.dependency_tasks or []
-            current_task.dependency_tasks = dependency_tasks
-            has_circular = has_cycle(task_uuid)
-            current_task.dependency_tasks = original_deps
-            return has_circular
-        return False
-
-    def run(self) -> Dict[str, Any]:
-        """Execute the main workflow."""
-        generate_issues_result = self.generate_issues()
-        if not generate_issues_result or not generate_issues_result.get("success"):
-            retry = 0
-            while retry < 3:
+            generate_issues_result = {
+                "success": True,
+                "message": "Issues restored from checkpoint",
+                "data": {"issues": checkpoint["issues"], "approved": checkpoint["approved"]},
+            }
+        else:
+            generate_issues_result = None
+            for _ in current_budget().iterations("issue_generation", limit=ISSUE_GENERATION_ATTEMPTS):
                 generate_issues_result = self.generate_issues()
                 if generate_issues_result and generate_issues_result.get("success"):
                     break
-                retry += 1
-            if retry >= 3:
+            if not generate_issues_result or not generate_issues_result.get("success"):
                 return {
                     "success": False,
                     "message": "Failed to generate issues",
                     "data": None,
                 }
-
-        self.context["issues"] = generate_issues_result["data"]["issues"]
-        
-        # Create list of issue models
-        issue_models = []
-        for issue in generate_issues_result["data"]["issues"]:
-            issue_model = IssueModel(
-                title=issue["title"],
-                description=issue["description"],
-                repoOwner=self.context["repo_owner"],
-                repoName=self.context["repo_name"],
-                uuid=issue["uuid"],
-                bountyId=self.context["bounty_id"],
-                forkOwner=self.context["fork_owner"],
-                forkUrl=self.context["fork_url"],
-                bountyType=SwarmBountyType.BUILD_FEATURE,
+            plan_checkpoint.save_issues(
+                self.context["bounty_id"],
+                self.spec_hash,
+                generate_issues_result["data"]["issues"],
+                generate_issues_result["data"].get("approved", False),
             )
-            issue_models.append(issue_model)
 
-        tasks = []
-        task_models = []
-        for issue in generate_issues_result["data"]["issues"]:
-            self.context["current_issue"] = issue
-            task_result = self.generate_tasks(issue["uuid"])
-            if task_result:
-                tasks.append(task_result["data"]["tasks"])
-                # Process tasks for bulk insert
-                for task_data in task_result["data"]["tasks"]:
-                    try:
-                        task_data["phases_data"] = self._get_phase_data(
-                            task_data["info"], 
-                            task_data["tools"], 
-                            task_data["acceptance_criteria"]
-                        )
-
-                        if self.bounty_type == SwarmBountyType.BUILD_FEATURE:
-                            try:
-                                # Extract task info from the structured format
-                                task_info = task_data["info"]
-                                if isinstance(task_info, dict):
-                                    task_title = task_info.get("Todo", "").strip()
-                                    task_description = task_info.get("Description", "").strip()
-                                    task_data["info"] = f"{task_title}\n{task_description}"
-                            except Exception as e:
-                                log_error(e, f"Failed to process task info format for task {task_data.get('uuid', 'unknown')}")
-                                # Fallback to using info as is if processing fails
-                                pass
-
-                            task_model = NewTaskModel(
-                                title=task_title or "No Title Task",
-                                description=task_description or "No Description Task", 
-                                acceptanceCriteria=task_data["acceptance_criteria"],
-                                repoOwner=self.context["repo_owner"],
-                                repoName=self.context["repo_name"],
-                                phasesData=task_data["phases_data"],
-                                dependencyTasks=task_data.get("dependency_tasks", []),
-                                uuid=task_data.get("uuid"),
-                                bountyId=self.context["bounty_id"],
-                                bountyType=self.bounty_type,
-                                issueUuid=issue["uuid"],
-                            )
-                            task_models.append(task_model)
-                    except Exception as e:
-                        log_error(
-                            e,
-                            f"Failed to process task {task_data.get('info', 'unknown')} "
-                            f"with UUID {task_data.get('uuid', 'unknown')}"
-                        )
-
-        # Single bulk insert for all issues and tasks
-        if not bulk_insert_issues_and_todos(issue_models, task_models):
-            log_error(Exception("Failed to bulk insert issues and tasks"), "Database insertion failed")
+        self.context["issues"] = generate_issues_result["data"]["issues"]
+        issues = generate_issues_result["data"]["issues"]
+        issue_models = self._issue_models(issues)
+
+        if PLAN_STREAMING:
+            plan = self._plan_streaming(issues, issue_models)
+        else:
+            plan = self._plan_bulk(issues, issue_models)
+        if plan is None:
             return {
                 "success": False,
                 "message": "Failed to insert issues and tasks into database",
                 "data": None,
             }
+        tasks, task_models = plan
 
         system_prompt_result = self.generate_system_prompts(
             generate_issues_result["data"]["issues"], tasks
         )
 
+        # A failed issue leaves the plan partial: keep it out of the cache and keep
+        # the checkpoint, so the next run decomposes only the missing issues
+        plan_complete = len(tasks) == len(issues)
+        if not plan_complete:
+            log_key_value(
+                "Partial plan",
+                f"{len(issues) - len(tasks)} of {len(issues)} issues have no tasks",
+            )
+
+        if (
+            plan_complete
+            and cache_key
+            and system_prompt_result
+            and system_prompt_result.get("success")
+        ):
+            plan_cache.store(
+                cache_key,
+                self.repo_owner,
+                self.repo_name,
+                self.head_sha,
+                [issue_model.to_dict() for issue_model in issue_models],
+                [task_model.to_dict() for task_model in task_models],
+                system_prompt_result["data"]["prompt"],
+            )
+        if plan_complete:
+            plan_checkpoint.clear(self.context["bounty_id"])
+
         return {
             "success": True,
             "message": "Issue generation workflow completed",
@@ -347,6 +350,203 @@ class TodoCreatorWorkflow(Workflow):
             },
         }
 
+    def _plan_bulk(
+        self, issues: List[Dict[str, Any]], issue_models: List[IssueModel]
+    ) -> Optional[Tuple[List[List[Dict[str, Any]]], List[NewTaskModel]]]:
+        """Decompose every issue, then write the whole plan in one transaction."""
+        tasks = []
+        task_models = []
+        # Results come back in issue order whatever order the issues finish in
+        for issue, task_result in zip(issues, self._decompose_issues(issues)):
+            if task_result and task_result.get("success"):
+                tasks.append(task_result["data"]["tasks"])
+                task_models.extend(self._task_models(issue, task_result["data"]["tasks"]))
+
+        # Single bulk insert for all issues and tasks
+        if not bulk_insert_issues_and_todos(issue_models, task_models):
+            log_error(Exception("Failed to bulk insert issues and tasks"), "Database insertion failed")
+            return None
+        return tasks, task_models
+
+    def _plan_streaming(
+        self, issues: List[Dict[str, Any]], issue_models: List[IssueModel]
+    ) -> Optional[Tuple[List[List[Dict[str, Any]]], List[NewTaskModel]]]:
+        """Write each issue with its todos as soon as that issue is decomposed.
+
+        Issues are written in plan order, so an issue's ``predecessorUuid``
+        always names an issue already stored; one that finishes ahead of an
+        earlier issue waits for it. Each issue is flagged ``planningComplete``
+        once its todos are stored, so the middle server can dispatch the first
+        issues while later ones are still being planned. An issue whose
+        decomposition failed is written unflagged and blocks its successors
+        until a resumed run plans it.
+        """
+        position = {issue["uuid"]: index for index, issue in enumerate(issues)}
+        finished: Dict[int, Optional[Dict[str, Any]]] = {}
+        next_index = 0
+        all_task_models = []
+        failed = False
+
+        def write(index: int, task_result: Optional[Dict[str, Any]]) -> bool:
+            issue = issues[index]
+            planned = bool(task_result and task_result.get("success"))
+            task_models = self._task_models(issue, task_result["data"]["tasks"]) if planned else []
+            if not complete_issue_planning(issue_models[index], task_models, planned):
+                log_error(
+                    Exception("Failed to write issue todos"),
+                    f"Database insertion failed for issue {issue['uuid']}",
+                )
+                return False
+            all_task_models.extend(task_models)
+            log_key_value("Issue planned", f"{issue['uuid']} ({len(task_models)} todos)")
+            return True
+
+        def commit(issue: Dict[str, Any], task_result: Optional[Dict[str, Any]]) -> None:
+            nonlocal next_index, failed
+            finished[position[issue["uuid"]]] = task_result
+            while not failed and next_index in finished:
+                failed = not write(next_index, finished.pop(next_index))
+                next_index += 1
+
+        tasks = [
+            task_result["data"]["tasks"]
+            for task_result in self._decompose_issues(issues, on_result=commit)
+            if task_result and task_result.get("success")
+        ]
+        if failed:
+            return None
+        return tasks, all_task_models
+
+    def _plan_cache_key(self) -> Optional[str]:
+        """Key of this run's plan in the plan cache; None if it cannot be cached."""
+        if not plan_cache.PLAN_CACHE_ENABLED:
+            return None
+        if self.head_sha is None:
+            self._get_default_branch()
+        if self.head_sha is None:
+            return None
+        return plan_cache.plan_key(
+            self.repo_owner,
+            self.repo_name,
+            self.head_sha,
+            self.issue_spec,
+            self.bounty_type,
+            plan_cache.prompt_version(
+                self.prompts,
+                FEATURE_BUILDER_PROMPTS,
+                DOCUMENT_SUMMARIZER_PROMPTS,
+                RECOMMENDED_TOOLS_FOR_FEATURE_BUILDER,
+                RECOMMENDED_TOOLS_FOR_DOCUMENT_SUMMARIZER,
+            ),
+        )
+
+    def _materialize_cached_plan(self, cached_plan: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Store a copy of a cached plan for this bounty; None if it could not be written."""
+        issues, todos = plan_cache.materialize(cached_plan, self.context["bounty_id"])
+        fork = {"forkOwner": self.context["fork_owner"], "forkUrl": self.context["fork_url"]}
+        try:
+            issue_models = [IssueModel(**{**issue, **fork}) for issue in issues]
+            task_models = [NewTaskModel(**todo) for todo in todos]
+        except Exception as e:
+            log_error(e, "Cached plan no longer matches the models, planning from scratch")
+            return None
+        if not bulk_insert_issues_and_todos(issue_models, task_models):
+            log_error(Exception("Failed to insert cached plan"), "Database insertion failed")
+            return None
+        if cached_plan.get("systemPrompt"):
+            self._save_system_prompt_to_mongodb(cached_plan["systemPrompt"])
+        log_key_value("Plan cache hit", f"{len(issues)} issues, {len(todos)} todos")
+
+        tasks = [
+            [todo for todo in todos if todo["issueUuid"] == issue["uuid"]] for issue in issues
+        ]
+        return {
+            "success": True,
+            "message": "Issue generation workflow completed from the plan cache",
+            "data": {
+                "issues": [
+                    {key: issue[key] for key in ("uuid", "title", "description")}
+                    for issue in issues
+                ],
+                "tasks": tasks,
+                "system_prompt": cached_plan.get("systemPrompt"),
+                "issue_spec": self.issue_spec,
+                "repo_owner": self.context["repo_owner"],
+                "repo_name": self.context["repo_name"],
+            },
+        }
+
+    def _issue_models(self, issues: List[Dict[str, Any]]) -> List[IssueModel]:
+        """Issue documents in plan order, each chained to the one before it."""
+        issue_models = []
+        previous_issue_uuid = None
+        for issue in issues:
+            issue_model = IssueModel(
+                title=issue["title"],
+                description=issue["description"],
+                repoOwner=self.context["repo_owner"],
+                repoName=self.context["repo_name"],
+                uuid=issue["uuid"],
+                bountyId=self.context["bounty_id"],
+                forkOwner=self.context["fork_owner"],
+                forkUrl=self.context["fork_url"],
+                predecessorUuid=previous_issue_uuid,
+                bountyType=SwarmBountyType.BUILD_FEATURE,
+            )
+            issue_models.append(issue_model)
+            previous_issue_uuid = issue["uuid"]
+        return issue_models
+
+    def _task_models(
+        self, issue: Dict[str, Any], tasks_data: List[Dict[str, Any]]
+    ) -> List[NewTaskModel]:
+        """Todo documents for one decomposed issue."""
+        task_models = []
+        for task_data in tasks_data:
+            try:
+                task_data["phases_data"] = self._get_phase_data(
+                    task_data["info"], 
+                    task_data["tools"], 
+                    task_data["acceptance_criteria"]
+                )
+
+                if self.bounty_type == SwarmBountyType.BUILD_FEATURE:
+                    try:
+                        # Extract task info from the structured format
+                        task_info = task_data["info"]
+                        if isinstance(task_info, dict):
+                            task_title = task_info.get("Todo", "").strip()
+                            task_description = task_info.get("Description", "").strip()
+                            task_data["info"] = f"{task_title}\n{task_description}"
+                    except Exception as e:
+                        log_error(e, f"Failed to process task info format for task {task_data.get('uuid', 'unknown')}")
+                        # Fallback to using info as is if processing fails
+                        pass
+
+                    task_model = NewTaskModel(
+                        title=task_title or "No Title Task",
+                        description=task_description or "No Description Task", 
+                        acceptanceCriteria=task_data["acceptance_criteria"],
+                        repoOwner=self.context["repo_owner"],
+                        repoName=self.context["repo_name"],
+                        phasesData=task_data["phases_data"],
+                        dependencyTasks=task_data.get("dependency_tasks", []),
+                        wave=task_data.get("wave", 0),
+                        criticalPath=task_data.get("critical_path", False),
+                        uuid=task_data.get("uuid"),
+                        bountyId=self.context["bounty_id"],
+                        bountyType=self.bounty_type,
+                        issueUuid=issue["uuid"],
+                    )
+                    task_models.append(task_model)
+            except Exception as e:
+                log_error(
+                    e,
+                    f"Failed to process task {task_data.get('info', 'unknown')} "
+                    f"with UUID {task_data.get('uuid', 'unknown')}"
+                )
+        return task_models
+
     def generate_issues(self) -> Optional[Dict[str, Any]]:
         """Execute the issue generation workflow."""
         try:
@@ -372,12 +572,59 @@ class TodoCreatorWorkflow(Workflow):
                 "data": {"issues": []},
             }
 
-    def generate_tasks(self, issue_uuid: str) -> Optional[Dict[str, Any]]:
-        """Execute the task decomposition workflow."""
+    def _decompose_issues(
+        self,
+        issues: List[Dict[str, Any]],
+        on_result: Optional[Callable[[Dict[str, Any], Optional[Dict[str, Any]]], None]] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Run ``generate_tasks`` for every issue, ``ISSUE_CONCURRENCY`` at a time.
+
+        All issues read the same checkout, which is set up once here. Results
+        are returned in issue order; ``on_result(issue, result)`` is called on
+        this thread as each issue finishes.
+        """
+        self.setup()
+        if ISSUE_CONCURRENCY <= 1 or len(issues) <= 1:
+            results = []
+            for issue in issues:
+                results.append(self.generate_tasks(issue))
+                if on_result:
+                    on_result(issue, results[-1])
+            return results
+        with ThreadPoolExecutor(
+            max_workers=min(ISSUE_CONCURRENCY, len(issues)),
+            thread_name_prefix="plan-issue",
+        ) as pool:
+            # bind per issue: each thread gets its own copy of the trace context
+            futures = {
+                pool.submit(bind(self.generate_tasks), issue): index
+                for index, issue in enumerate(issues)
+            }
+            results = [None] * len(issues)
+            for future in as_completed(futures):
+                index = futures[future]
+                results[index] = future.result()
+                if on_result:
+                    on_result(issues[index], results[index])
+            return results
+
+    def generate_tasks(self, issue: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Execute the task decomposition workflow for one issue."""
+        checkpointed_tasks = self.checkpoint_tasks.get(issue["uuid"])
+        if checkpointed_tasks is not None:
+            return {
+                "success": True,
+                "message": f"Restored {len(checkpointed_tasks)} tasks from checkpoint",
+                "data": {"tasks": checkpointed_tasks},
+            }
         try:
-            self.setup()
+            scope = IssueScope(
+                client=self.client,
+                prompts=self.prompts,
+                context={**self.context, "current_issue": issue},
+            )
             decompose_phase = phases.TaskDecompositionPhase(
-                workflow=self, bounty_type=self.bounty_type
+                workflow=scope, bounty_type=self.bounty_type
             )
             decomposition_result = decompose_phase.execute()
 
@@ -399,10 +646,11 @@ class TodoCreatorWorkflow(Workflow):
                 return None
 
             log_key_value("Tasks created Number", task_count)
-            self.context["subtasks"] = tasks_data
-            log_key_value("Subtasks Number", len(self.context["subtasks"]))
+            scope.context["subtasks"] = tasks_data
+            log_key_value("Subtasks Number", len(tasks_data))
 
-            self._process_dependencies(tasks_data)
+            self._process_dependencies(scope, tasks_data)
+            plan_checkpoint.save_issue_tasks(self.context["bounty_id"], issue["uuid"], tasks_data)
 
             return {
                 "success": True,
@@ -417,115 +665,122 @@ class TodoCreatorWorkflow(Workflow):
                 "message": f"Task decomposition workflow failed: {str(e)}",
                 "data": None,
             }
-        finally:
-            self.cleanup()
 
-    def _process_dependencies(self, tasks_data: List[Dict[str, Any]]) -> None:
-        """Process dependencies for all tasks."""
-        for task in tasks_data:
-            self.context["target_task"] = task
-            dependency_phase = phases.TaskDependencyPhase(
-                workflow=self, bounty_type=self.bounty_type
-            )
-            dependency_result = dependency_phase.execute()
+    def _process_dependencies(self, scope: IssueScope, tasks_data: List[Dict[str, Any]]) -> None:
+        """Process dependencies for all tasks.
 
-            if not dependency_result or not dependency_result.get("success"):
-                log_error(
-                    Exception(
-                        dependency_result.get("error", "No result")
-                        if dependency_result
-                        else "No results returned from phase"
-                    ),
-                    "Task dependency failed, continuing with empty dependencies",
-                )
-                task["dependency_tasks"] = []
+        All edges are inferred in one batched call; only tasks whose entry is
+        missing or malformed fall back to a per-task call.
+        """
+        graph = TaskGraph(tasks_data)
+        proposals = self._infer_all_dependencies(scope)
+        for task in tasks_data:
+            proposed_dependencies = proposals.get(task["uuid"])
+            if proposed_dependencies is None:
+                proposed_dependencies = self._infer_task_dependencies(scope, task)
+            if proposed_dependencies is None:
+                graph.set_dependencies(task["uuid"], [])
                 continue
+            self._validate_dependencies(graph, task["uuid"], proposed_dependencies)
+
+        self._remove_mutual_dependencies(graph)
+        log_key_value("Execution waves", graph.schedule())
+
+    def _infer_all_dependencies(self, scope: IssueScope) -> Dict[str, List[str]]:
+        """Dependencies of every task in ``subtasks`` from one phase call.
 
-            proposed_dependencies = dependency_result["data"].get(task["uuid"], [])
-            valid_dependencies = self._validate_dependencies(
-                task["uuid"], proposed_dependencies, tasks_data
+        Returns only well-formed entries; empty if the phase failed.
+        """
+        dependencies_phase = phases.TaskDependenciesPhase(
+            workflow=scope, bounty_type=self.bounty_type
+        )
+        dependencies_result = dependencies_phase.execute()
+        if not dependencies_result or not dependencies_result.get("success"):
+            log_error(
+                Exception(
+                    dependencies_result.get("error", "No result")
+                    if dependencies_result
+                    else "No results returned from phase"
+                ),
+                "Batched task dependency failed, falling back to one call per task",
             )
-            task["dependency_tasks"] = valid_dependencies
+            return {}
+        data = dependencies_result["data"]
+        if data["malformed"]:
+            log_key_value("Malformed dependency entries", data["malformed"])
+        return data["dependencies"]
+
+    def _infer_task_dependencies(
+        self, scope: IssueScope, task: Dict[str, Any]
+    ) -> Optional[List[str]]:
+        """Dependencies of one task from its own phase call; None if it failed."""
+        scope.context["target_task"] = task
+        dependency_phase = phases.TaskDependencyPhase(
+            workflow=scope, bounty_type=self.bounty_type
+        )
+        dependency_result = dependency_phase.execute()
 
-        self._remove_mutual_dependencies(tasks_data)
+        if not dependency_result or not dependency_result.get("success"):
+            log_error(
+                Exception(
+                    dependency_result.get("error", "No result")
+                    if dependency_result
+                    else "No results returned from phase"
+                ),
+                "Task dependency failed, continuing with empty dependencies",
+            )
+            return None
+        return dependency_result["data"].get(task["uuid"], [])
 
     def _validate_dependencies(
-        self, task_uuid: str, proposed_dependencies: List[str], tasks_data: List[Dict[str, Any]]
+        self, graph: TaskGraph, task_uuid: str, proposed_dependencies: List[str]
     ) -> List[str]:
-        """Validate dependencies and remove circular ones."""
-        valid_dependencies = []
-        for dep in proposed_dependencies:
-            temp_deps = valid_dependencies + [dep]
-            if not self.check_circular_dependency(
-                task_uuid, temp_deps, [Task.from_dict(t) for t in tasks_data]
-            ):
-                valid_dependencies.append(dep)
-            else:
-                log_error(
-                    Exception("Circular dependency detected"),
-                    f"Dependency {dep} would create a circular dependency, skipping it",
-                )
+        """Set the task's dependencies, skipping circular ones."""
+        valid_dependencies, rejected = graph.set_dependencies(task_uuid, proposed_dependencies)
+        for dep in rejected:
+            log_error(
+                Exception("Circular dependency detected"),
+                f"Dependency {dep} would create a circular dependency, skipping it",
+            )
         return valid_dependencies
 
-    def _remove_mutual_dependencies(self, tasks_data: List[Dict[str, Any]]) -> None:
+    def _remove_mutual_dependencies(self, graph: TaskGraph) -> None:
         """Remove mutual dependencies between tasks."""
-        for task in tasks_data:
-            if task.get("dependency_tasks"):
-                for dep in task["dependency_tasks"]:
-                    dep_task = next(
-                        (t for t in tasks_data if t.get("uuid") == dep), None
-                    )
-                    if dep_task and task.get("uuid") in dep_task.get(
-                        "dependency_tasks", []
-                    ):
-                        task["dependency_tasks"].remove(dep)
+        graph.remove_mutual_dependencies()
 
-    def _get_phase_data(self, info:str, tools:List[str], acceptance_criteria:List[str]) -> List[PhaseData]:
-        """Get the phase data for the task."""
+    def _get_phase_data(
+        self, info: str, tools: List[str], acceptance_criteria: List[str]
+    ) -> List[PhaseData] | PhasesTemplateRef | None:
+        """Get the phase data for the task.
 
-        phase_data = []
+        With ``PROMPT_TEMPLATE_REFS`` this is a reference to the bounty type's
+        prompt template plus the task's parameters, rendered when the todo is
+        read; otherwise the rendered phases themselves.
+        """
         if self.bounty_type == SwarmBountyType.BUILD_FEATURE:
-            for key in RECOMMENDED_TOOLS_FOR_FEATURE_BUILDER:
-                log_key_value("Key Value", key)
-                prompt = str(FEATURE_BUILDER_PROMPTS[key])  # Ensure prompt is a string
-                tools = RECOMMENDED_TOOLS_FOR_FEATURE_BUILDER[key]
-                
-                # Create a dictionary with all possible fields
-                format_dict = {
-                    'info': info,
-                    'acceptance_criteria': acceptance_criteria,
-                    'current_files': '{{current_files}}',
-                    # 'previous_issues': '{{previous_issues}}'
-                }
-                
-                # Use format_map which won't error on unused fields
-                prompt = prompt.format_map(format_dict)
-                phase_data.append(PhaseData(
-                    prompt=prompt,
-                    tools=tools,
-                ))
-            return phase_data
-        if self.bounty_type == SwarmBountyType.DOCUMENT_SUMMARIZER:
-            for key in RECOMMENDED_TOOLS_FOR_DOCUMENT_SUMMARIZER:
-                prompt = str(DOCUMENT_SUMMARIZER_PROMPTS[key])  # Ensure prompt is a string
-                tools = RECOMMENDED_TOOLS_FOR_DOCUMENT_SUMMARIZER[key]
-                
-                # Create a dictionary with all possible fields
-                format_dict = {
-                    'info': info,
-                    'acceptance_criteria': acceptance_criteria,
-                    'current_files': self.context.get('current_files', ''),
-                    'previous_issues': self.context.get('previous_issues', '')
-                }
-                
-                # Use format_map which won't error on unused fields
-                prompt = prompt.format_map(format_dict)
-                phase_data.append(PhaseData(
-                    prompt=prompt,
-                    tools=tools,
-                ))
-            return phase_data
-        return None
+            template = FEATURE_BUILDER_TEMPLATE
+            params = {
+                'info': info,
+                'acceptance_criteria': acceptance_criteria,
+                # Left for the worker to fill in
+                'current_files': '{{current_files}}',
+            }
+        elif self.bounty_type == SwarmBountyType.DOCUMENT_SUMMARIZER:
+            template = DOCUMENT_SUMMARIZER_TEMPLATE
+            params = {
+                'info': info,
+                'acceptance_criteria': acceptance_criteria,
+                'current_files': self.context.get('current_files', ''),
+                'previous_issues': self.context.get('previous_issues', ''),
+            }
+        else:
+            return None
+
+        if PROMPT_TEMPLATE_REFS:
+            template_ref = prompt_templates.reference(template, params)
+            if template_ref is not None:
+                return PhasesTemplateRef(**template_ref)
+        return [PhaseData(**phase) for phase in prompt_templates.render(template, params)]
     def generate_system_prompts(self, issues: List[Dict[str, Any]], tasks: List[List[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
         """Execute the system prompt generation workflow."""
         try:
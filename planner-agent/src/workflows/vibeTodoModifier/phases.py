@@ -23,4 +23,15 @@ class TaskRegenerationPhase(WorkflowPhase):
             ],
             conversation_id=conversation_id,
             name="Task Regeneration",
-        )
\ No newline at end of file
+        )
+
+
+class PhaseRepairPhase(WorkflowPhase):
+    def __init__(self, workflow: Workflow, conversation_id: str = None):
+        super().__init__(
+            workflow=workflow,
+            prompt_name="repair_phase",
+            available_tools=["regenerate_phase"],
+            conversation_id=conversation_id,
+            name="Phase Repair",
+        )
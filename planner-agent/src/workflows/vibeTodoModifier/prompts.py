@@ -22,5 +22,21 @@ PROMPTS = {
         "- Include any necessary setup or prerequisites\n"
         "- Consider edge cases and error handling\n\n"
         "IMPORTANT: The regenerated task should be more detailed and clearer than the original to avoid similar implementation issues."
-    )
+    ),
+    "repair_phase": (
+        "A task failed while an AI agent was working through its phases. Each phase is a prompt "
+        "the agent runs with a fixed set of tools.\n\n"
+        "Task: {task_spec}\n\n"
+        "Error Message: {error_message}\n\n"
+        "Phases of the task:\n{phases_summary}\n\n"
+        "Tools a phase can use: {tool_names}\n\n"
+        "1. Decide which single phase caused the error, using the error message and the phase prompts.\n"
+        "2. Rewrite only that phase: its prompt and, if a missing or wrong tool caused the error, its tools.\n\n"
+        "Guidelines for the rewritten phase:\n"
+        "- Address the specific error that caused the failure\n"
+        "- Keep every placeholder in double braces, such as {{{{current_files}}}}, as it is\n"
+        "- Keep the phase's purpose and its place in the sequence; do not move work to other phases\n\n"
+        "Use the regenerate_phase tool to return the phase index, the new prompt and tools, "
+        "and a short reason."
+    ),
 }
@@ -1,12 +1,15 @@
 from .implementations import (
-    generate_tasks,
-    validate_tasks,
-    regenerate_tasks,
     create_task_dependency,
     generate_issues,
     audit_tasks,
     generate_system_prompt,
     approve_issues,
+    regenerate_phase,
+)
+from src.workflows.vibeTodoCreator.tools.planner_operations.implementations import (
+    generate_tasks,
+    validate_tasks,
+    regenerate_tasks,
 )
 
 DEFINITIONS = {
@@ -258,6 +261,39 @@ DEFINITIONS = {
         "final_tool": True,
         "function": audit_tasks,
     },
+    "regenerate_phase": {
+        "name": "regenerate_phase",
+        "description": "Replace the phase of a task that caused its failure.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "phase_index": {
+                    "type": "integer",
+                    "description": "Zero-based index of the phase that caused the error",
+                    "minimum": 0,
+                },
+                "prompt": {
+                    "type": "string",
+                    "description": "New prompt for the phase",
+                    "minLength": 10,
+                },
+                "tools": {
+                    "type": "array",
+                    "description": "Tools the phase can use",
+                    "items": {"type": "string", "minLength": 1},
+                    "minItems": 1,
+                },
+                "reason": {
+                    "type": "string",
+                    "description": "Why this phase caused the error and what was changed",
+                },
+            },
+            "required": ["phase_index", "prompt", "tools", "reason"],
+            "additionalProperties": False,
+        },
+        "final_tool": True,
+        "function": regenerate_phase,
+    },
     "generate_system_prompt": {
         "name": "generate_system_prompt",
         "description": "Generate a system prompt for implementing the feature.",
@@ -51,6 +51,58 @@ def generate_task(
 
 
 
+def regenerate_phase(
+    phase_index: int,
+    prompt: str,
+    tools: List[str],
+    reason: str,
+    previous_phasesData: List[Dict[str, Any]] = None,
+    **kwargs,
+) -> dict:
+    """Replace the phase of a task that caused its failure.
+
+    Args:
+        phase_index: Zero-based index of the phase in the task's phasesData
+        prompt: New prompt for the phase
+        tools: Tools the phase can use
+        reason: Why the phase caused the error and what was changed
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the operation succeeded
+            - message: Success/error message
+            - data: Dictionary containing:
+                - phase_index: Index of the replaced phase
+                - phase: The new phase, with prompt and tools
+                - reason: Why the phase was replaced
+    """
+    # A negative index would silently replace a phase counted from the end
+    if phase_index < 0:
+        return {
+            "success": False,
+            "message": f"Phase index {phase_index} is negative, phases are numbered from 0",
+            "data": None,
+        }
+    if previous_phasesData is not None and phase_index >= len(previous_phasesData):
+        return {
+            "success": False,
+            "message": (
+                f"Phase index {phase_index} is out of range, "
+                f"the task has {len(previous_phasesData)} phases"
+            ),
+            "data": None,
+        }
+    return {
+        "success": True,
+        "message": f"Successfully regenerated phase {phase_index}",
+        "data": {
+            "phase_index": phase_index,
+            "phase": {"prompt": prompt, "tools": tools},
+            "reason": reason,
+        },
+    }
+
+
 def create_task_dependency(
     task_uuid: str, dependency_tasks: List[str], **kwargs
 ) -> dict:
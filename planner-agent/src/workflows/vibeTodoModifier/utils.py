@@ -3,14 +3,12 @@ from typing import List, Optional, Dict
 import uuid
 from datetime import datetime
 from pymongo.errors import ConnectionFailure, PyMongoError
-from src.server.mongo_connection import MongoConnection
+from src.server.mongo_connection import collection
 from enum import Enum
 
-mongo_conn = MongoConnection()
-db = mongo_conn.get_database("builder247")
-todos_collection = db["todos"]
-issues_collection = db["issues"]
-system_prompts_collection = db["systemprompts"]
+todos_collection = collection("todos")
+issues_collection = collection("issues")
+system_prompts_collection = collection("systemprompts")
 
 
 class TodoStatus(str, Enum):
@@ -54,6 +52,12 @@ class PhaseData(BaseModel):
     tools: List[str] = Field(..., description="List of tools for this phase")
 
 
+class PhasesTemplateRef(BaseModel):
+    templateId: str = Field(..., description="Prompt template ID")
+    version: str = Field(..., description="Prompt template version")
+    params: Dict = Field(default={}, description="Values the template's prompts are rendered with")
+
+
 class NewTaskModel(BaseModel):
     uuid: str = Field(
         default_factory=lambda: str(uuid.uuid4()), description="Unique identifier"
@@ -62,7 +66,9 @@ class NewTaskModel(BaseModel):
     acceptanceCriteria: List[str] = Field(..., description="Acceptance criteria")
     repoOwner: str = Field(..., description="Repository owner")
     repoName: str = Field(..., description="Repository name")
-    phasesData: List[PhaseData] = Field(..., description="Phases data with prompts and tools")
+    phasesData: List[PhaseData] | PhasesTemplateRef = Field(
+        ..., description="Phases data with prompts and tools, or a prompt template reference"
+    )
 
     assignedTo: List[TaskAssignedInfo] = Field(
         default=[], description="List of assigned agents"
@@ -71,6 +77,12 @@ class NewTaskModel(BaseModel):
     dependencyTasks: List[str] = Field(
         default=[], description="List of dependency tasks"
     )
+    wave: int = Field(
+        default=0, description="Topological level; a wave runs once earlier waves are done"
+    )
+    criticalPath: bool = Field(
+        default=False, description="Whether the task is on the issue's critical path"
+    )
     status: TodoStatus | DocumentationStatus = Field(
         default=TodoStatus.INITIALIZED, description="Task status"
     )
@@ -133,6 +145,10 @@ class IssueModel(BaseModel):
     predecessorUuid: Optional[str] = Field(
         None, description="UUID of the immediately previous issue in the chain"
     )
+    planningComplete: bool = Field(
+        default=True,
+        description="False while the planner is still writing this issue's todos",
+    )
     createdAt: datetime = Field(
         default_factory=datetime.utcnow, description="Creation timestamp"
     )
@@ -164,10 +180,12 @@ def insert_task_to_mongodb(task: NewTaskModel) -> bool:
         return False
 
 
-def get_all_tasks_title_uuid_from_mongodb() -> List[dict]:
+def get_all_tasks_title_uuid_from_mongodb(bounty_id: str) -> List[dict]:
     try:
-        # Get all tasks from MongoDB
-        tasks = todos_collection.find({}, {"_id": 0, "title": 1, "uuid": 1})
+        # Get the bounty's tasks from MongoDB, served by the bountyId index
+        tasks = todos_collection.find(
+            {"bountyId": bounty_id}, {"_id": 0, "title": 1, "uuid": 1}, batch_size=1000
+        )
 
         # Convert cursor to list of dictionaries with only 'uuid' and 'title'
         return [{"uuid": task["uuid"], "title": task["title"]} for task in tasks]
@@ -243,16 +261,41 @@ if __name__ == "__main__":
 
 
 def update_task_phaseData(task_uuid: str, phasesData: List[PhaseData]) -> bool:
+    """Replace the task's phasesData; returns False if no task was updated."""
     try:
         # Update the task
         result = todos_collection.update_one(
             {"uuid": task_uuid},
             {"$set": {"phasesData": phasesData}}
         )
-        return result.acknowledged
+        return result.matched_count == 1
+    except ConnectionFailure:
+        print("MongoDB connection failed")
+        return False
+    except PyMongoError as e:
+        print(f"MongoDB error: {e}")
+        return False
+
+def update_task_phase(task_uuid: str, phase_index: int, phase: Dict) -> bool:
+    """Replace one element of the task's phasesData in place.
+
+    Returns False if the task has no inline phasesData list (for example a
+    template reference), in which case the caller writes the whole list.
+    """
+    try:
+        result = todos_collection.update_one(
+            {"uuid": task_uuid, "phasesData": {"$type": "array"}},
+            {
+                "$set": {
+                    f"phasesData.{phase_index}": phase,
+                    "updatedAt": datetime.utcnow(),
+                }
+            },
+        )
+        return result.matched_count == 1
     except ConnectionFailure:
         print("MongoDB connection failed")
         return False
     except PyMongoError as e:
         print(f"MongoDB error: {e}")
-        return False
\ No newline at end of file
+        return False
@@ -9,17 +9,33 @@ from prometheus_swarm.utils.tools import get_tool_names, get_all_definitions
 from . import phases
 from prometheus_swarm.workflows.utils import (
     check_required_env_vars,
-    cleanup_repository,
     validate_github_auth,
-    setup_repository,
-    get_current_files,
 )
+from src.utils.repo_cache import setup_repository, cleanup_repository
+from src.utils.file_tree import get_current_files
+from src.tools.workspace_operations import register_workspace_tools
 from .utils import (
     PhaseData,
+    PhasesTemplateRef,
     SwarmBountyType,
+    update_task_phase,
     update_task_phaseData,
 )
-from src.workflows.vibeTodoCreator.node_prompts import FEATURE_BUILDER_PROMPTS, DOCUMENT_SUMMARIZER_PROMPTS, RECOMMENDED_TOOLS_FOR_FEATURE_BUILDER, RECOMMENDED_TOOLS_FOR_DOCUMENT_SUMMARIZER
+from src.workflows.vibeTodoCreator.node_prompts import (
+    FEATURE_BUILDER_PROMPTS,
+    DOCUMENT_SUMMARIZER_PROMPTS,
+    RECOMMENDED_TOOLS_FOR_FEATURE_BUILDER,
+    RECOMMENDED_TOOLS_FOR_DOCUMENT_SUMMARIZER,
+    FEATURE_BUILDER_TEMPLATE,
+    DOCUMENT_SUMMARIZER_TEMPLATE,
+)
+from src.utils import prompt_templates
+from src.utils.prompt_templates import PROMPT_TEMPLATE_REFS
+from src.utils.task_graph import TaskGraph
+from src.utils.tracing import traced
+
+# Regenerate only the phase that caused the error before regenerating the whole task
+PHASE_REPAIR_ENABLED = os.getenv("PHASE_REPAIR_ENABLED", "true").lower() in ("1", "true", "yes")
 
 class Task:
     """Represents a single task with info, tools and acceptance criteria."""
@@ -77,10 +93,14 @@ class TodoCreatorWorkflow(Workflow):
             fork_url=fork_url,
             bounty_id=bounty_id,
         )
+        register_workspace_tools(client)
 
         self.bounty_type = bounty_type
         self.task_spec = task_spec
-        self.previous_phasesData = previous_phasesData  
+        self.task_uuid = task_uuid
+        # A todo planned with a template reference is rendered here, when it is read
+        previous_phasesData = prompt_templates.render_phases_data(previous_phasesData)
+        self.previous_phasesData = previous_phasesData
         self.error_message = error_message
         self.context["previous_phasesData"] = previous_phasesData
         self.context["error_message"] = error_message
@@ -88,6 +108,7 @@ class TodoCreatorWorkflow(Workflow):
         self.context["toolsNames"] = get_all_definitions()
         
 
+    @traced("workflow.setup")
     def setup(self) -> None:
         """Set up repository and workspace."""
         check_required_env_vars(["GITHUB_TOKEN", "GITHUB_USERNAME"])
@@ -114,17 +135,17 @@ class TodoCreatorWorkflow(Workflow):
             self.context["repo_url"],
             github_token=os.getenv("GITHUB_TOKEN"),
             github_username=os.getenv("GITHUB_USERNAME"),
+            read_only=True,
         )
         if not setup_result["success"]:
             raise Exception(f"Failed to set up repository: {setup_result['message']}")
 
         self.context["repo_path"] = setup_result["data"]["clone_path"]
         self.original_dir = setup_result["data"]["original_dir"]
-        os.chdir(self.context["repo_path"])
 
     def _setup_context(self) -> None:
         """Set up workflow context with current files and issue spec."""
-        self.context["current_files"] = get_current_files()
+        self.context["current_files"] = get_current_files(self.context["repo_path"])
         self.context["task_spec"] = self.task_spec
 
     def cleanup(self) -> None:
@@ -137,17 +158,15 @@ class TodoCreatorWorkflow(Workflow):
             # Set task spec in context
             self.context["task_spec"] = self.task_spec
             
-            # Generate tasks
-            task_result = self.generate_tasks()
+            task_result = self.repair_phase() if PHASE_REPAIR_ENABLED else None
+            if not task_result:
+                # Regenerate the whole task
+                task_result = self.generate_tasks()
             if not task_result or not task_result.get("success"):
                 raise Exception("Failed to generate tasks")
 
-            tasks = task_result["data"]["tasks"]
-
-
-
-            # Log results
-            self._log_workflow_results( [tasks])
+            tasks = task_result["data"]["phaseData"]
+            log_key_value("Regenerated Phases", len(tasks))
 
             return {
                 "success": True,
@@ -186,6 +205,70 @@ class TodoCreatorWorkflow(Workflow):
                     if task.get('dependency_tasks'):
                         log_key_value(f"Task {idx} Dependencies", task['dependency_tasks'])
 
+    def repair_phase(self) -> Optional[Dict[str, Any]]:
+        """Regenerate only the phase that caused the error.
+
+        One LLM call picks the failing phase from the error message and
+        rewrites its prompt and tools; the other phases are kept as they are.
+        The phases already hold everything the call needs, so the repository
+        is not cloned. Returns None if the phase could not be repaired, and
+        the caller regenerates the whole task.
+        """
+        phases_data = self.previous_phasesData
+        if not isinstance(phases_data, list) or not phases_data:
+            return None
+        try:
+            self.context["phases_summary"] = "\n\n".join(
+                f"Phase {index} (tools: {', '.join(phase['tools'])}):\n{phase['prompt']}"
+                for index, phase in enumerate(phases_data)
+            )
+            self.context["tool_names"] = ", ".join(self._phase_tool_names())
+
+            repair_result = phases.PhaseRepairPhase(workflow=self).execute() or {}
+            if not repair_result.get("success"):
+                log_error(
+                    Exception(repair_result.get("error", "No result")),
+                    "Phase repair failed, regenerating the whole task",
+                )
+                return None
+
+            phase_index = repair_result["data"]["phase_index"]
+            phase = PhaseData(**repair_result["data"]["phase"]).model_dump()
+            log_key_value("Repaired Phase", phase_index)
+            log_key_value("Repair Reason", repair_result["data"].get("reason", ""))
+
+            phases_data = list(phases_data)
+            phases_data[phase_index] = phase
+            saved = update_task_phase(self.task_uuid, phase_index, phase)
+            if not saved:
+                # No inline list to patch (e.g. a template reference): write it whole
+                saved = self._update_task_in_mongodb(self.task_uuid, phases_data)
+            if not saved:
+                log_error(
+                    Exception(f"Task {self.task_uuid} was not updated"),
+                    "Phase repair not saved, regenerating the whole task",
+                )
+                return None
+
+            return {
+                "success": True,
+                "message": f"Regenerated phase {phase_index} of the task",
+                "data": {"phaseData": phases_data, "phase_index": phase_index},
+            }
+        except Exception as e:
+            log_error(e, "Phase repair failed, regenerating the whole task")
+            return None
+
+    def _phase_tool_names(self) -> List[str]:
+        """Tools a phase of this bounty type can be given."""
+        recommended = {
+            SwarmBountyType.BUILD_FEATURE: RECOMMENDED_TOOLS_FOR_FEATURE_BUILDER,
+            SwarmBountyType.DOCUMENT_SUMMARIZER: RECOMMENDED_TOOLS_FOR_DOCUMENT_SUMMARIZER,
+        }.get(self.bounty_type, {})
+        names = {tool for tools in recommended.values() for tool in tools}
+        names.update(tool for phase in self.previous_phasesData for tool in phase["tools"])
+        return sorted(names)
+
     def generate_tasks(self) -> Optional[Dict[str, Any]]:
         """Generate tasks for a specific issue."""
         try:
@@ -194,8 +277,13 @@ class TodoCreatorWorkflow(Workflow):
             if not phaseData:
                 return None
 
-            self._update_task_in_mongodb(self.task_uuid, phaseData)
-            
+            if not self._update_task_in_mongodb(self.task_uuid, phaseData):
+                return {
+                    "success": False,
+                    "message": f"Failed to update task {self.task_uuid}",
+                    "data": None,
+                }
+
             return {
                 "success": True,
                 "message": f"Created {len(phaseData)} tasks for the feature",
@@ -231,87 +319,65 @@ class TodoCreatorWorkflow(Workflow):
 
  
     def _validate_dependencies(
-        self, 
-        task_uuid: str, 
-        proposed_dependencies: List[str], 
-        all_tasks: List[Dict[str, Any]]
+        self,
+        graph: TaskGraph,
+        task_uuid: str,
+        proposed_dependencies: List[str],
     ) -> List[str]:
-        """Validate and filter dependencies to avoid circular dependencies."""
-        valid_dependencies = []
-        for dep in proposed_dependencies:
-            temp_deps = valid_dependencies + [dep]
-            if not self.check_circular_dependency(task_uuid, temp_deps, all_tasks):
-                valid_dependencies.append(dep)
-            else:
-                log_error(
-                    Exception("Circular dependency detected"),
-                    f"Dependency {dep} would create a circular dependency, skipping"
-                )
+        """Set the task's dependencies, skipping ones that would be circular."""
+        valid_dependencies, rejected = graph.set_dependencies(task_uuid, proposed_dependencies)
+        for dep in rejected:
+            log_error(
+                Exception("Circular dependency detected"),
+                f"Dependency {dep} would create a circular dependency, skipping"
+            )
         return valid_dependencies
 
-    def _remove_mutual_dependencies(self, tasks_data: List[Dict[str, Any]]) -> None:
+    def _remove_mutual_dependencies(self, graph: TaskGraph) -> None:
         """Remove mutual dependencies between tasks."""
-        for task in tasks_data:
-            if task["dependency_tasks"]:
-                for dep in task["dependency_tasks"][:]:
-                    dep_task = next((t for t in tasks_data if t["uuid"] == dep), None)
-                    if dep_task and task["uuid"] in dep_task.get("dependency_tasks", []):
-                        log_error(
-                            Exception("Mutual dependency detected"),
-                            f"Removing mutual dependency between {task['info']} and {dep_task['info']}"
-                        )
-                        task["dependency_tasks"].remove(dep)
-
-    def _update_task_in_mongodb(self, task_uuid: str, phasesData: List[PhaseData]) -> None:
-        """Update the task in MongoDB."""
-        update_task_phaseData(task_uuid, phasesData)
-
-    def _get_phase_data(self, info:str, tools:List[str], acceptance_criteria:List[str]) -> List[PhaseData]:
-        """Get the phase data for the task."""
-
-        phase_data = []
+        for task_uuid, dep in graph.remove_mutual_dependencies():
+            log_error(
+                Exception("Mutual dependency detected"),
+                f"Removing mutual dependency between {graph.task(task_uuid)['info']} and {graph.task(dep)['info']}"
+            )
+
+    def _update_task_in_mongodb(self, task_uuid: str, phasesData: List[PhaseData]) -> bool:
+        """Update the task in MongoDB; returns False if nothing was written."""
+        return update_task_phaseData(task_uuid, phasesData)
+
+    def _get_phase_data(
+        self, info: str, tools: List[str], acceptance_criteria: List[str]
+    ) -> List[PhaseData] | PhasesTemplateRef | None:
+        """Get the phase data for the task.
+
+        With ``PROMPT_TEMPLATE_REFS`` this is a reference to the bounty type's
+        prompt template plus the task's parameters, rendered when the todo is
+        read; otherwise the rendered phases themselves.
+        """
         if self.bounty_type == SwarmBountyType.BUILD_FEATURE:
-            for key in RECOMMENDED_TOOLS_FOR_FEATURE_BUILDER:
-                log_key_value("Key Value", key)
-                prompt = str(FEATURE_BUILDER_PROMPTS[key])  # Ensure prompt is a string
-                tools = RECOMMENDED_TOOLS_FOR_FEATURE_BUILDER[key]
-                
-                # Create a dictionary with all possible fields
-                format_dict = {
-                    'info': info,
-                    'acceptance_criteria': acceptance_criteria,
-                    'current_files': '{{current_files}}',
-                    # 'previous_issues': '{{previous_issues}}'
-                }
-                
-                # Use format_map which won't error on unused fields
-                prompt = prompt.format_map(format_dict)
-                phase_data.append(PhaseData(
-                    prompt=prompt,
-                    tools=tools,
-                ))
-            return phase_data
-        if self.bounty_type == SwarmBountyType.DOCUMENT_SUMMARIZER:
-            for key in RECOMMENDED_TOOLS_FOR_DOCUMENT_SUMMARIZER:
-                prompt = str(DOCUMENT_SUMMARIZER_PROMPTS[key])  # Ensure prompt is a string
-                tools = RECOMMENDED_TOOLS_FOR_DOCUMENT_SUMMARIZER[key]
-                
-                # Create a dictionary with all possible fields
-                format_dict = {
-                    'info': info,
-                    'acceptance_criteria': acceptance_criteria,
-                    'current_files': self.context.get('current_files', ''),
-                    'previous_issues': self.context.get('previous_issues', '')
-                }
-                
-                # Use format_map which won't error on unused fields
-                prompt = prompt.format_map(format_dict)
-                phase_data.append(PhaseData(
-                    prompt=prompt,
-                    tools=tools,
-                ))
-            return phase_data
-        return None
+            template = FEATURE_BUILDER_TEMPLATE
+            params = {
+                'info': info,
+                'acceptance_criteria': acceptance_criteria,
+                # Left for the worker to fill in
+                'current_files': '{{current_files}}',
+            }
+        elif self.bounty_type == SwarmBountyType.DOCUMENT_SUMMARIZER:
+            template = DOCUMENT_SUMMARIZER_TEMPLATE
+            params = {
+                'info': info,
+                'acceptance_criteria': acceptance_criteria,
+                'current_files': self.context.get('current_files', ''),
+                'previous_issues': self.context.get('previous_issues', ''),
+            }
+        else:
+            return None
+
+        if PROMPT_TEMPLATE_REFS:
+            template_ref = prompt_templates.reference(template, params)
+            if template_ref is not None:
+                return PhasesTemplateRef(**template_ref)
+        return [PhaseData(**phase) for phase in prompt_templates.render(template, params)]
 
     def node_prompts(self) -> Dict[str, Any]:
         """Get the prompts for the node based on bounty type."""
@@ -0,0 +1,91 @@
+"""Benchmark: writing a plan's todos one at a time vs. in bulk.
+
+Inserts the same synthetic todos into a scratch database on a local mongod,
+first with one ``insert_one`` per todo, then with ``upsert_by_uuid``. It then
+writes the bulk plan a second time, as a retry would, and checks that no
+todos were duplicated.
+
+Run from the planner-agent directory:
+
+    MONGODB_URI=mongodb://localhost:27017 python tests/benchmark_bulk_todos.py [--todos 10000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+
+from src.server.mongo_connection import close_client, get_client, upsert_by_uuid  # noqa: E402
+from src.workflows.todocreator.utils import SwarmBountyType, TaskModel  # noqa: E402
+
+DATABASE = "builder247_benchmark"
+
+
+def _todos(count: int) -> list[dict]:
+    issue_uuid = str(uuid.uuid4())
+    return [
+        TaskModel(
+            title=f"Todo {index}",
+            description="Synthetic todo " + "x" * 400,
+            acceptanceCriteria=["It works", "It has tests"],
+            repoOwner="owner",
+            repoName="repo",
+            dependencyTasks=[],
+            issueUuid=issue_uuid,
+            bountyId="benchmark",
+            bountyType=SwarmBountyType.BUILD_FEATURE,
+        ).to_dict()
+        for index in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--todos", type=int, default=10000)
+    args = parser.parse_args()
+
+    client = get_client()
+    client.drop_database(DATABASE)
+    todos = client[DATABASE]["todos"]
+    todos.create_index("uuid", unique=True)
+    try:
+        plan = _todos(args.todos)
+        started = time.perf_counter()
+        for todo in plan:
+            todos.insert_one(dict(todo))
+        one_by_one = time.perf_counter() - started
+        todos.delete_many({})
+
+        plan = _todos(args.todos)
+        started = time.perf_counter()
+        inserted = upsert_by_uuid(todos, plan)
+        bulk = time.perf_counter() - started
+
+        started = time.perf_counter()
+        reinserted = upsert_by_uuid(todos, plan)
+        retry = time.perf_counter() - started
+
+        stored = todos.count_documents({})
+        assert inserted == args.todos, f"bulk write inserted {inserted}"
+        assert reinserted == 0 and stored == args.todos, "retry duplicated todos"
+    finally:
+        client.drop_database(DATABASE)
+        close_client()
+
+    print(f"todos:              {args.todos}")
+    print(f"insert_one:         {one_by_one:.2f}s ({args.todos / one_by_one:,.0f}/s)")
+    print(
+        f"upsert_by_uuid:     {bulk:.2f}s ({args.todos / bulk:,.0f}/s), "
+        f"{one_by_one / bulk:.1f}x faster"
+    )
+    print(f"retried plan:       {retry:.2f}s, 0 duplicates ({stored} stored)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
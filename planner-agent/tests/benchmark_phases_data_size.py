@@ -0,0 +1,98 @@
+"""Benchmark: todo document size with rendered vs. template-referenced phasesData.
+
+Builds the same synthetic todos twice, once with every phase prompt rendered
+into ``phasesData`` and once with a ``prompttemplates`` reference, and
+compares their BSON sizes. Also checks that rendering a reference gives back
+the inline phases, and times rendering a parsed template.
+
+Run from the planner-agent directory:
+
+    python tests/benchmark_phases_data_size.py [--todos 1000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import bson
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.utils import prompt_templates  # noqa: E402
+from src.workflows.vibeTodoCreator.node_prompts import FEATURE_BUILDER_TEMPLATE  # noqa: E402
+from src.workflows.vibeTodoCreator.utils import (  # noqa: E402
+    NewTaskModel,
+    PhaseData,
+    PhasesTemplateRef,
+    SwarmBountyType,
+)
+
+WORDS = "add update endpoint handler cache test config route model schema validate".split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _todo(params: dict, phases_data) -> dict:
+    return NewTaskModel(
+        title=params["info"].splitlines()[0],
+        description=params["info"],
+        acceptanceCriteria=params["acceptance_criteria"],
+        repoOwner="owner",
+        repoName="repo",
+        phasesData=phases_data,
+        issueUuid="issue",
+        bountyId="benchmark",
+        bountyType=SwarmBountyType.BUILD_FEATURE,
+    ).to_dict()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--todos", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    template = FEATURE_BUILDER_TEMPLATE
+    inline_size = referenced_size = 0
+    references = []
+    for _ in range(args.todos):
+        params = {
+            "info": f"{_sentence(rng, 6)}\n{_sentence(rng, 40)}",
+            "acceptance_criteria": [_sentence(rng, 12) for _ in range(4)],
+            "current_files": "{{current_files}}",
+        }
+        phases = prompt_templates.render(template, params)
+        inline = _todo(params, [PhaseData(**phase) for phase in phases])
+        # What reference() stores, without registering the template in Mongo
+        reference = {
+            "templateId": template.template_id,
+            "version": template.version,
+            "params": prompt_templates.reference_params(template, params),
+        }
+        referenced = _todo(params, PhasesTemplateRef(**reference))
+        inline_size += len(bson.encode(inline))
+        referenced_size += len(bson.encode(referenced))
+        references.append((reference, phases))
+
+    started = time.perf_counter()
+    for reference, phases in references:
+        rendered = prompt_templates.render(template, reference["params"])
+        assert rendered == phases, "rendered reference differs from inline phases"
+    render_time = time.perf_counter() - started
+
+    print(f"todos:                {args.todos}")
+    print(f"inline phasesData:    {inline_size / args.todos:,.0f} bytes per todo")
+    print(f"template reference:   {referenced_size / args.todos:,.0f} bytes per todo")
+    print(
+        f"reduction:            {1 - referenced_size / inline_size:.0%} "
+        f"({(inline_size - referenced_size) / args.todos:,.0f} bytes per todo)"
+    )
+    print(f"render:               {render_time / args.todos * 1e6:.1f} us per todo")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
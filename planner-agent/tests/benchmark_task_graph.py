@@ -0,0 +1,120 @@
+"""Benchmark: dependency validation with list scans vs. ``TaskGraph``.
+
+Builds synthetic plans where every task is proposed a few dependencies on
+random other tasks (many of which would close a cycle), then validates them
+the way the todo creator does: task by task, dependency by dependency,
+followed by mutual-dependency removal. The list-scan version is the one the
+workflows used before ``TaskGraph``; it is roughly cubic, so it only runs on
+the smaller plans (``--baseline-max``). Where both run, their results are
+checked to be identical.
+
+Run from the planner-agent directory:
+
+    python tests/benchmark_task_graph.py [--sizes 250 500 1000 5000]
+"""
+
+import argparse
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.utils.task_graph import TaskGraph  # noqa: E402
+
+DEPENDENCIES_PER_TASK = 3
+
+
+def _plan(size: int, seed: int = 0):
+    rng = random.Random(seed)
+    tasks = [{"uuid": str(uuid.UUID(int=rng.getrandbits(128)))} for _ in range(size)]
+    # Distinct proposals: TaskGraph drops repeated ones, the list scans kept them
+    proposals = {
+        task["uuid"]: [dep["uuid"] for dep in rng.sample(tasks, DEPENDENCIES_PER_TASK)]
+        for task in tasks
+    }
+    return tasks, proposals
+
+
+def _check_circular_dependency(task_uuid, dependency_tasks, all_tasks) -> bool:
+    """The previous implementation, with a linear task lookup per DFS step."""
+    visited = set()
+    path = set()
+
+    def has_cycle(current_uuid):
+        if current_uuid in path:
+            return True
+        if current_uuid in visited:
+            return False
+        visited.add(current_uuid)
+        path.add(current_uuid)
+        current_task = next((t for t in all_tasks if t["uuid"] == current_uuid), None)
+        if current_task:
+            for dep_uuid in current_task.get("dependency_tasks", []):
+                if has_cycle(dep_uuid):
+                    return True
+        path.remove(current_uuid)
+        return False
+
+    current_task = next((t for t in all_tasks if t["uuid"] == task_uuid), None)
+    if current_task:
+        original_deps = current_task.get("dependency_tasks", [])
+        current_task["dependency_tasks"] = dependency_tasks
+        has_circular = has_cycle(task_uuid)
+        current_task["dependency_tasks"] = original_deps
+        return has_circular
+    return False
+
+
+def _validate_with_scans(tasks, proposals):
+    for task in tasks:
+        valid = []
+        for dep in proposals[task["uuid"]]:
+            if not _check_circular_dependency(task["uuid"], valid + [dep], tasks):
+                valid.append(dep)
+        task["dependency_tasks"] = valid
+    for task in tasks:
+        for dep in task["dependency_tasks"][:]:
+            dep_task = next((t for t in tasks if t["uuid"] == dep), None)
+            if dep_task and task["uuid"] in dep_task.get("dependency_tasks", []):
+                task["dependency_tasks"].remove(dep)
+
+
+def _validate_with_graph(tasks, proposals):
+    graph = TaskGraph(tasks)
+    for task in tasks:
+        graph.set_dependencies(task["uuid"], proposals[task["uuid"]])
+    graph.remove_mutual_dependencies()
+
+
+def _timed(validate, size):
+    tasks, proposals = _plan(size)
+    started = time.perf_counter()
+    validate(tasks, proposals)
+    return time.perf_counter() - started, [task["dependency_tasks"] for task in tasks]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 500, 1000, 5000])
+    parser.add_argument("--baseline-max", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>6} {'list scans':>12} {'TaskGraph':>12} {'speedup':>9}")
+    for size in args.sizes:
+        graph_time, graph_result = _timed(_validate_with_graph, size)
+        if size > args.baseline_max:
+            print(f"{size:>6} {'skipped':>12} {graph_time:>11.3f}s {'':>9}")
+            continue
+        scan_time, scan_result = _timed(_validate_with_scans, size)
+        assert scan_result == graph_result, f"results differ for {size} tasks"
+        print(
+            f"{size:>6} {scan_time:>11.3f}s {graph_time:>11.3f}s "
+            f"{scan_time / graph_time:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())